@@ -22,6 +22,7 @@ If not, see <https://www.gnu.org/licenses/>.
 import gc
 import sys
 import os
+import sqlite3
 import weakref
 import inspect
 import traceback
@@ -34,6 +35,11 @@ from qudi.core.logger import get_logger, set_log_level
 from qudi.util.paths import get_main_dir, get_default_log_dir
 from qudi.util.mutex import Mutex
 from qudi.util.colordefs import QudiMatplotlibStyle
+from qudi.util.datastorage import DataStorageBase
+from qudi.util.atomicfile import set_write_mode
+from qudi.core.statusstore import create_status_store, set_status_store, get_status_store
+from qudi.core.statusstore import YamlStatusStore
+from qudi.core.statusstore import StatusAutosaver
 from qudi.core.config import Configuration, ValidationError, YAMLError
 from qudi.core.watchdog import AppWatchdog
 from qudi.core.modulemanager import ModuleManager
@@ -170,6 +176,7 @@ class Qudi(QtCore.QObject):
         )
         self.watchdog = None
         self.gui = None
+        self._status_autosaver = None
 
         self._configured_extension_paths = list()
         self._is_running = False
@@ -242,6 +249,11 @@ class Qudi(QtCore.QObject):
             sys.path.insert(insert_index, ext_path)
         self._configured_extension_paths = extensions
 
+    def _stop_status_autosaver(self):
+        if self._status_autosaver is not None:
+            self._status_autosaver.stop()
+            self._status_autosaver = None
+
     @QtCore.Slot()
     def _configure_qudi(self):
         """
@@ -260,6 +272,34 @@ class Qudi(QtCore.QObject):
         self._remove_extensions_from_path()
         self._add_extensions_to_path()
 
+        # Configure crash-safe file writing mode
+        set_write_mode(self.configuration['file_write_mode'])
+
+        # Stop autosave before replacing (and thereby closing) the status variable store
+        self._stop_status_autosaver()
+
+        # Configure status variable storage backend
+        try:
+            set_status_store(
+                create_status_store(self.configuration['status_variable_backend'],
+                                    mmap_arrays=self.configuration['status_variable_mmap_arrays'])
+            )
+        except (ImportError, sqlite3.Error):
+            self.log.exception('Unable to use configured status variable backend. Falling back to '
+                               'YAML status files.')
+            set_status_store(
+                YamlStatusStore(mmap_arrays=self.configuration['status_variable_mmap_arrays'])
+            )
+
+        # Configure periodic autosave of changed status variables
+        autosave_interval = self.configuration['status_variable_autosave_interval']
+        if autosave_interval > 0:
+            self._status_autosaver = StatusAutosaver(
+                get_modules=lambda: self.module_manager.module_instances.values(),
+                interval=autosave_interval
+            )
+            self._status_autosaver.start()
+
         # Configure qudi modules
         for base in ['hardware', 'logic', 'gui']:
             # Create ManagedModule instance by adding each module to ModuleManager
@@ -273,6 +313,9 @@ class Qudi(QtCore.QObject):
                     self.log.exception(f'Unable to create ManagedModule instance for {base} '
                                        f'module "{module_name}"')
 
+        # Load status variables of all configured modules in the background
+        self.module_manager.prefetch_status_variables()
+
         print('> Qudi configuration complete!')
         self.log.info('Qudi configuration complete!')
 
@@ -284,6 +327,9 @@ class Qudi(QtCore.QObject):
             self.gui.activate_main_gui()
 
     def _start_startup_modules(self):
+        if self.configuration['startup_activation_workers'] > 1:
+            self._start_startup_modules_parallel()
+            return
         for module in self.configuration['startup_modules']:
             print(f'> Loading startup module: {module}')
             self.log.info(f'Loading startup module: {module}')
@@ -293,6 +339,33 @@ class Qudi(QtCore.QObject):
             except:
                 self.log.exception(f'Unable to activate autostart module "{module}":')
 
+    def _start_startup_modules_parallel(self):
+        startup_modules = list()
+        for module in self.configuration['startup_modules']:
+            if module in self.module_manager:
+                startup_modules.append(module)
+            else:
+                self.log.error(f'Unable to activate autostart module "{module}": No module with '
+                               f'this name configured.')
+        if not startup_modules:
+            return
+        print(f'> Loading startup modules: {", ".join(startup_modules)}')
+        self.log.info(f'Loading startup modules: {", ".join(startup_modules)}')
+        timeout = self.configuration['startup_activation_timeout']
+        try:
+            results = self.module_manager.activate_modules(
+                startup_modules,
+                max_workers=self.configuration['startup_activation_workers'],
+                timeout=timeout if timeout > 0 else None
+            )
+        except:
+            self.log.exception('Unable to activate autostart modules:')
+            return
+        # Report errors in dependency order independent of the order modules finished activation
+        for module, error in results.items():
+            if error is not None:
+                self.log.error(f'Unable to activate module "{module}":', exc_info=error)
+
     def run(self):
         """
         """
@@ -403,11 +476,23 @@ class Qudi(QtCore.QObject):
             except:
                 self.log.exception('Error during shutdown of local namespace server:')
             QtCore.QCoreApplication.instance().processEvents()
+            self._stop_status_autosaver()
             self.log.info('Deactivating modules...')
             print('> Deactivating modules...')
             self.module_manager.stop_all_modules()
             self.module_manager.clear()
             QtCore.QCoreApplication.instance().processEvents()
+            self.log.info('Waiting for pending data saves...')
+            print('> Waiting for pending data saves...')
+            try:
+                DataStorageBase.wait_for_async_saves()
+                DataStorageBase.wait_for_thumbnails()
+            except:
+                self.log.exception('Error while waiting for pending data saves:')
+            try:
+                get_status_store().close()
+            except:
+                self.log.exception('Error while closing status variable store:')
             if not self.no_gui:
                 self.log.info('Closing main GUI...')
                 print('> Closing main GUI...')
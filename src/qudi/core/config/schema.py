@@ -99,6 +99,33 @@ def config_schema() -> Dict[str, Any]:
                         'type': ['null', 'string'],
                         'default': None
                     },
+                    'file_write_mode': {
+                        'enum': ['fast', 'durable'],
+                        'default': 'fast'
+                    },
+                    'status_variable_backend': {
+                        'enum': ['yaml', 'binary', 'sqlite'],
+                        'default': 'yaml'
+                    },
+                    'status_variable_autosave_interval': {
+                        'type': 'number',
+                        'minimum': 0,
+                        'default': 0
+                    },
+                    'status_variable_mmap_arrays': {
+                        'type': 'boolean',
+                        'default': False
+                    },
+                    'startup_activation_workers': {
+                        'type': 'integer',
+                        'minimum': 1,
+                        'default': 1
+                    },
+                    'startup_activation_timeout': {
+                        'type': 'number',
+                        'minimum': 0,
+                        'default': 0
+                    },
                     'extension_paths': {
                         'type': 'array',
                         'uniqueItems': True,
@@ -24,16 +24,19 @@ import copy
 import uuid
 from abc import abstractmethod
 from uuid import uuid4
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from fysom import Fysom
 from PySide6 import QtCore, QtGui, QtWidgets
 from typing import Any, Mapping, Optional, Callable, Union, Dict
 
 from qudi.core.configoption import MissingOption
-from qudi.core.statusvariable import StatusVar
-from qudi.util.paths import get_module_app_data_path, get_daily_directory, get_default_data_dir
-from qudi.util.yaml import yaml_load, yaml_dump
+from qudi.core.statusvariable import StatusVar, clear_changed_status_variables
+from qudi.core.statusvariable import mark_status_variables_changed
+from qudi.core.statusstore import get_status_store
+from qudi.util.paths import get_daily_directory, get_default_data_dir
 from qudi.core.meta import ModuleMeta
 from qudi.core.logger import get_logger
+from qudi.util.mutex import Mutex
 
 
 class ModuleStateMachine(Fysom, QtCore.QObject):
@@ -114,6 +117,10 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
     """
     _threaded = False
 
+    # Requests a status variable snapshot in the thread of this module (see
+    # _autosave_status_variables)
+    _sigCollectStatusVariables = QtCore.Signal(object)  # concurrent.futures.Future
+
     def __init__(self, qudi_main_weakref: Any, name: str,
                  config: Optional[Mapping[str, Any]] = None,
                  callbacks: Optional[Mapping[str, Callable]] = None, **kwargs):
@@ -144,6 +151,15 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
         # Create logger instance for module
         self.__logger = get_logger(f'{self.__module__}.{self.__class__.__name__}')
 
+        # Serializes status variable dumps (e.g. autosave and deactivation). Snapshots are
+        # numbered so an autosave can not overwrite a newer dump with an older snapshot.
+        self.__status_variables_lock = Mutex()
+        self.__status_snapshot_count = 0
+        self.__status_snapshot_dumped = 0
+        # Status variables loaded in advance by the module manager (see
+        # _set_prefetched_status_variables)
+        self.__prefetched_status_variables = None
+
         # Create a copy of the _meta class dict and attach it to the created instance
         self._meta = copy.deepcopy(self._meta)
         # Add additional meta info to _meta dict
@@ -162,6 +178,8 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
                              'on_before_deactivate': self.__deactivation_callback}
         default_callbacks.update(callbacks)
         self.module_state = ModuleStateMachine(parent=self, callbacks=default_callbacks)
+        self._sigCollectStatusVariables.connect(self.__collect_autosave_snapshot,
+                                                QtCore.Qt.ConnectionType.QueuedConnection)
         return
 
     def __initialize_config_options(self, config: Optional[Mapping[str, Any]]) -> None:
@@ -318,15 +336,26 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
             self._dump_status_variables()
         return True
 
+    def _set_prefetched_status_variables(self, variables: Optional[Future]) -> None:
+        """Hands over status variables loaded in advance (e.g. by the module manager) as future
+        resolving to the status variables dict. The next _load_status_variables call will use
+        this result instead of loading from the status store. Pass None to discard a future handed
+        over before.
+        """
+        self.__prefetched_status_variables = variables
+
     def _load_status_variables(self) -> None:
-        """Load status variables from app data directory on disc.
+        """Load status variables from the configured status store (see qudi.core.statusstore).
+        Uses status variables prefetched by the module manager instead if available.
         """
-        # Load status variables from app data directory
-        file_path = get_module_app_data_path(self.__class__.__name__,
-                                             self.module_base,
-                                             self.module_name)
+        prefetched, self.__prefetched_status_variables = self.__prefetched_status_variables, None
         try:
-            variables = yaml_load(file_path, ignore_missing=True)
+            if prefetched is None:
+                variables = get_status_store().load(self.__class__.__name__,
+                                                    self.module_base,
+                                                    self.module_name)
+            else:
+                variables = prefetched.result()
         except:
             variables = dict()
             self.log.exception('Failed to load status variables:')
@@ -340,24 +369,127 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
                 setattr(self, attr_name, value)
         except:
             self.log.exception('Error while settings status variables:')
+        # Freshly loaded status variables do not need to be saved again
+        clear_changed_status_variables(self)
 
-    def _dump_status_variables(self) -> None:
-        """Dump status variables to app data directory on disc.
+    def _dump_status_variables(self, changed_only: Optional[bool] = False) -> bool:
+        """Dump status variables to the configured status store (see qudi.core.statusstore).
 
         This method can also be used to manually dump status variables independent of the automatic
         dump during module deactivation.
+
+        Parameters
+        ----------
+        changed_only : bool, optional
+            Only dump if any status variable has changed since the last dump (default: False).
+
+        Returns
+        -------
+        bool
+            Flag indicating if status variables have been dumped successfully.
         """
-        file_path = get_module_app_data_path(self.__class__.__name__,
-                                             self.module_base,
-                                             self.module_name)
-        # collect StatusVar values into dictionary
-        variables = self.module_status_variables
-        # Save to file if any StatusVars have been found
-        if variables:
+        snapshot = self.__take_status_snapshot(changed_only)
+        if snapshot is None:
+            return False
+        return self.__write_status_snapshot(*snapshot)
+
+    def _autosave_status_variables(self, timeout: Optional[float] = None) -> bool:
+        """Dump changed status variables of an active module from any thread (e.g. the status
+        variable autosave thread).
+
+        The status variables (including representer function calls) are collected in the thread
+        of this module, so they are consistent with respect to the module's own work and can not
+        race with deactivation. Only serialization and writing to the status store happen in the
+        calling thread.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time in seconds to wait for the module thread to collect the status variables.
+            Waits indefinitely if None (default).
+
+        Returns
+        -------
+        bool
+            Flag indicating if status variables have been dumped successfully.
+        """
+        if QtCore.QThread.currentThread() == self.thread():
+            snapshot = self.__collect_snapshot_if_active()
+        else:
+            future = Future()
+            self._sigCollectStatusVariables.emit(future)
             try:
-                yaml_dump(file_path, variables)
-            except:
-                self.log.exception('Failed to save status variables:')
+                snapshot = future.result(timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                return False
+        if snapshot is None:
+            return False
+        return self.__write_status_snapshot(*snapshot)
+
+    def __collect_autosave_snapshot(self, future: Future) -> None:
+        # Called in the thread of this module
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.__collect_snapshot_if_active())
+        except BaseException as err:
+            future.set_exception(err)
+
+    def __collect_snapshot_if_active(self):
+        if self.module_state() == 'deactivated':
+            return None
+        snapshot = self.__take_status_snapshot(changed_only=True)
+        if snapshot is None:
+            return None
+        # The values are serialized in another thread while this module keeps running
+        number, variables, changed = snapshot
+        return number, copy.deepcopy(variables), changed
+
+    def __take_status_snapshot(self, changed_only: bool):
+        """Collects the current status variable values. Returns a tuple of snapshot number,
+        status variables dict and names of changed status variables or None if nothing changed.
+        """
+        with self.__status_variables_lock:
+            changed = clear_changed_status_variables(self)
+            if changed_only and not changed:
+                return None
+            self.__status_snapshot_count += 1
+            # collect StatusVar values into dictionary
+            return self.__status_snapshot_count, self.module_status_variables, changed
+
+    def __write_status_snapshot(self, number: int, variables: Dict[str, Any],
+                                changed: frozenset) -> bool:
+        with self.__status_variables_lock:
+            # A newer snapshot has already been saved
+            if number < self.__status_snapshot_dumped:
+                return True
+            # Save to store if any StatusVars have been found
+            if variables:
+                try:
+                    get_status_store().dump(self.__class__.__name__,
+                                            self.module_base,
+                                            self.module_name,
+                                            variables)
+                except:
+                    # Keep changed flags so the next (auto)save attempt will try again
+                    mark_status_variables_changed(self, *changed)
+                    self.log.exception('Failed to save status variables:')
+                    return False
+            self.__status_snapshot_dumped = number
+            return True
+
+    def mark_status_variables_changed(self, *attr_names: str) -> None:
+        """Flags status variables as changed so they are saved by the next status variable autosave.
+        Assigning a value to a status variable flags it automatically. This method only needs to be
+        called after modifying a mutable status variable value in-place (e.g. a numpy array).
+
+        Parameters
+        ----------
+        *attr_names : str
+            Attribute names of the status variables to flag. Flags all status variables if omitted.
+        """
+        mark_status_variables_changed(self, *attr_names)
 
     def _send_balloon_message(self, title: str, message: str, time: Optional[float] = None,
                               icon: Optional[QtGui.QIcon] = None) -> None:
@@ -19,20 +19,23 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-import os
 import importlib
 import copy
+import time
 import weakref
 import fysom
 
-from typing import FrozenSet, Iterable
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Union
 from functools import partial
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from PySide6 import QtCore
 
 from qudi.util.mutex import RecursiveMutex   # provides access serialization between threads
 from qudi.core.logger import get_logger
 from qudi.core.servers import get_remote_module_instance
-from qudi.core.module import Base, get_module_app_data_path
+from qudi.core.module import Base
+from qudi.core.statusstore import get_status_store
+from qudi.util.paths import get_module_app_data_path
 
 logger = get_logger(__name__)
 
@@ -133,7 +136,9 @@ class ModuleManager(QtCore.QObject):
     def remove_module(self, module_name, ignore_missing=False, emit_change=True):
         with self._lock:
             module = self._modules.pop(module_name, None)
-            if module is None and not ignore_missing:
+            if module is None:
+                if ignore_missing:
+                    return
                 raise KeyError(f'No module with name "{module_name}" registered.')
             module.deactivate()
             module.sigStateChanged.disconnect(self.sigModuleStateChanged)
@@ -257,6 +262,207 @@ class ModuleManager(QtCore.QObject):
             for module in self._modules.values():
                 module.deactivate()
 
+    def activate_modules(self,
+                         module_names: Iterable[str],
+                         max_workers: Optional[int] = None,
+                         timeout: Union[None, float, Mapping[str, float]] = None
+                         ) -> Dict[str, Optional[Exception]]:
+        """Activates the given modules including all modules they require by following the
+        connector dependency graph. Each module is activated as soon as all its required modules
+        are active. Threaded local modules are activated concurrently in their module thread. All
+        other modules (non-threaded, GUI and remote modules) are activated one after another in the
+        main thread, so QObjects created in their on_activate without parent end up in the main
+        thread. Must be called from the main thread.
+
+        Parameters
+        ----------
+        module_names : iterable of str
+            Names of the modules to activate.
+        max_workers : int, optional
+            Maximum number of modules to activate concurrently (default: no limit).
+        timeout : float or dict, optional
+            Time in seconds to wait for the activation of each threaded module, either one value
+            for all modules or a dict mapping module names to timeouts (default: no timeout). A module exceeding its
+            timeout is reported as failed and modules requiring it are not activated. Its
+            activation keeps running in the background though.
+
+        Returns
+        -------
+        dict
+            Activation result of all modules involved in dependency order (ties in alphabetical
+            order). Maps module names to None if activation was successful and to the exception
+            raised otherwise.
+        """
+        if QtCore.QThread.currentThread() is not self.thread():
+            raise RuntimeError('ModuleManager.activate_modules must be called from the main '
+                               'thread.')
+        # Collect all modules to activate including required modules
+        with self._lock:
+            module_names = list(module_names)
+            for name in module_names:
+                if name not in self._modules:
+                    raise KeyError(f'No module named "{name}" found in managed qudi modules. '
+                                   f'Module activation aborted.')
+            modules = dict()
+            requires = dict()
+            while module_names:
+                name = module_names.pop()
+                if name in modules:
+                    continue
+                module = modules[name] = self._modules[name]
+                requires[name] = sorted(
+                    ref().name for ref in module.required_modules if ref() is not None
+                )
+                module_names.extend(requires[name])
+
+        # Sort modules topologically. Modules in dependency cycles can not be activated.
+        order = list()
+        remaining = sorted(modules)
+        while remaining:
+            ready = [name for name in remaining if all(req in order for req in requires[name])]
+            if not ready:
+                break
+            order.extend(ready)
+            remaining = [name for name in remaining if name not in ready]
+        results = {
+            name: RuntimeError(f'Module "{name}" is part of a connector dependency cycle.')
+            for name in remaining
+        }
+        order.extend(remaining)
+
+        if timeout is None or isinstance(timeout, (int, float)):
+            timeouts = dict.fromkeys(order, timeout)
+        else:
+            timeouts = {name: timeout.get(name, None) for name in order}
+        pending = [name for name in order if name not in results]
+        running = dict()
+        if max_workers is None:
+            max_workers = max(1, len(pending))
+        executor = ThreadPoolExecutor(max_workers=max_workers,
+                                      thread_name_prefix='module-activation')
+        try:
+            while pending or running:
+                # Start all modules with finished requirements in dependency order
+                for name in list(pending):
+                    failed = [req for req in requires[name] if
+                              req in results and results[req] is not None]
+                    if failed:
+                        pending.remove(name)
+                        results[name] = RuntimeError(
+                            f'Required module(s) {", ".join(failed)} of module "{name}" failed to '
+                            f'activate.'
+                        )
+                        continue
+                    if not all(req in results for req in requires[name]):
+                        continue
+                    module = modules[name]
+                    try:
+                        in_main_thread = self._activates_in_main_thread(module)
+                    except Exception as err:
+                        pending.remove(name)
+                        results[name] = err
+                        continue
+                    if in_main_thread:
+                        pending.remove(name)
+                        try:
+                            module.activate()
+                        except Exception as err:
+                            results[name] = err
+                        else:
+                            results[name] = None
+                        continue
+                    if len(running) >= max_workers:
+                        continue
+                    pending.remove(name)
+                    try:
+                        if not module._begin_activation():
+                            results[name] = None
+                            continue
+                    except Exception as err:
+                        results[name] = err
+                        continue
+                    deadline = None if timeouts[name] is None else time.monotonic() + timeouts[name]
+                    running[name] = (executor.submit(module._run_activation), deadline)
+                if not running:
+                    continue
+
+                # Wait for activations to finish while keeping the main thread responsive
+                now = time.monotonic()
+                wait_time = min([0.05] + [max(0., deadline - now) for _, deadline in
+                                          running.values() if deadline is not None])
+                wait([future for future, _ in running.values()],
+                     timeout=wait_time,
+                     return_when=FIRST_COMPLETED)
+                QtCore.QCoreApplication.processEvents()
+                now = time.monotonic()
+                for name in [name for name in order if name in running]:
+                    future, deadline = running[name]
+                    module = modules[name]
+                    if future.done():
+                        del running[name]
+                        error = future.exception()
+                        try:
+                            module._finish_activation()
+                        except Exception as err:
+                            error = err if error is None else error
+                        if error is None and not module.is_active:
+                            error = RuntimeError(
+                                f'Failed to activate {module.module_base} module "{name}"!'
+                            )
+                        results[name] = error
+                    elif deadline is not None and now >= deadline:
+                        del running[name]
+                        results[name] = TimeoutError(
+                            f'Activation of {module.module_base} module "{name}" did not finish '
+                            f'within {timeouts[name]} s.'
+                        )
+                        future.add_done_callback(
+                            partial(self._queue_late_activation_finish, module)
+                        )
+        finally:
+            executor.shutdown(wait=False)
+        return {name: results[name] for name in order}
+
+    def prefetch_status_variables(self, max_workers: Optional[int] = None) -> None:
+        """Loads the status variables of all inactive local modules concurrently in a pool of
+        worker threads. Subsequent activation of these modules will use the prefetched status
+        variables instead of loading them from the status store one module at a time.
+        Returns immediately without waiting for the workers to finish.
+        """
+        with self._lock:
+            modules = [module for module in self._modules.values() if
+                       not (module.is_remote or module.is_active)]
+            executor = ThreadPoolExecutor(max_workers=max_workers,
+                                          thread_name_prefix='status-prefetch')
+            try:
+                futures = get_status_store().prefetch(
+                    [(module.class_name, module.module_base, module.name) for module in modules],
+                    executor
+                )
+            finally:
+                executor.shutdown(wait=False)
+            for module, future in zip(modules, futures):
+                module.set_prefetched_status_variables(future)
+
+    @staticmethod
+    def _activates_in_main_thread(module) -> bool:
+        """Helper to determine if a module must be activated in the main thread by
+        activate_modules. Only threaded local modules are activated concurrently in their module
+        thread. Running on_activate of non-threaded modules in a temporary thread would leave
+        QObjects created without parent (e.g. QTimer) bound to that thread after it has finished.
+        """
+        if module.module_base == 'gui' or module.is_remote:
+            return True
+        if not module.is_loaded:
+            module._load()
+        return not module.instance.is_module_threaded
+
+    @staticmethod
+    def _queue_late_activation_finish(module, future=None):
+        QtCore.QMetaObject.invokeMethod(module,
+                                        '_finish_late_activation',
+                                        QtCore.Qt.ConnectionType.QueuedConnection)
+
     def _module_ref_dead_callback(self, dead_ref, module_name):
         self.remove_module(module_name, ignore_missing=True)
 
@@ -339,8 +545,12 @@ class ManagedModule(QtCore.QObject):
         self._required_modules = frozenset()
         self._dependent_modules = frozenset()
 
+        self._prefetched_status_variables = None
+
         self.__poll_timer = None
         self.__last_state = None
+        self.__activating = False
+        self.__activation_thread_name = None
 
     def __call__(self):
         return self.instance
@@ -499,13 +709,25 @@ class ManagedModule(QtCore.QObject):
     @property
     def has_app_data(self):
         with self._lock:
-            return os.path.exists(self.status_file_path)
+            return get_status_store().exists(self.class_name, self.module_base, self.name)
+
+    def set_prefetched_status_variables(self, variables: Future) -> None:
+        """Sets a future resolving to the status variables of this module loaded in advance (see
+        ModuleManager.prefetch_status_variables). The result is handed over to the module instance
+        upon the next activation.
+        """
+        with self._lock:
+            self._prefetched_status_variables = variables
 
     @QtCore.Slot()
     def clear_module_app_data(self):
         with self._lock:
+            # Prefetched status variables are outdated now
+            self._prefetched_status_variables = None
+            if self.is_loaded and not self.is_remote:
+                self._instance._set_prefetched_status_variables(None)
             try:
-                os.remove(self.status_file_path)
+                get_status_store().remove(self.class_name, self.module_base, self.name)
             except OSError:
                 pass
             finally:
@@ -521,6 +743,32 @@ class ManagedModule(QtCore.QObject):
             return
 
         with self._lock:
+            if not self._begin_activation():
+                return
+            try:
+                self._run_activation()
+            finally:
+                self._finish_activation()
+
+            # Raise exception if by some reason no exception propagated to here and the activation
+            # is still unsuccessful.
+            if not self.is_active:
+                raise RuntimeError(f'Failed to activate {self.module_base} module "{self.name}"!')
+
+    def _begin_activation(self) -> bool:
+        """First step of module activation. Must be called from the main thread.
+
+        Loads the module, activates all required modules and connects them. Threaded modules are
+        moved into their own thread.
+
+        Returns False if the module is already active and True if _run_activation and
+        _finish_activation need to follow.
+        """
+        with self._lock:
+            if self.__activating:
+                raise RuntimeError(f'{self.module_base} module "{self.name}" is already being '
+                                   f'activated.')
+
             if not self.is_loaded:
                 self._load()
 
@@ -541,7 +789,7 @@ class ManagedModule(QtCore.QObject):
                 # If it is a GUI module, show it again.
                 if self.module_base == 'gui':
                     self._instance.show()
-                return
+                return False
 
             if self.is_remote:
                 logger.info(f'Activating remote {self.module_base} module "{self.remote_url}"')
@@ -563,51 +811,84 @@ class ManagedModule(QtCore.QObject):
             # Establish module interconnections via Connector meta object in qudi module instance
             self._connect()
 
-            # Activate this module
-            if self._instance.is_module_threaded and not self.is_remote:
+            # Move threaded module into its thread to run the activation in
+            thread_name = None
+            if not self.is_remote and self._instance.is_module_threaded:
                 thread_name = self.module_thread_name
+            if thread_name is not None:
                 thread_manager = self._qudi_main_ref().thread_manager
                 thread = thread_manager.get_new_thread(thread_name)
+                if thread is None:
+                    self._disconnect()
+                    self._disable_state_updated()
+                    raise RuntimeError(f'Unable to create thread "{thread_name}" for activation of '
+                                       f'{self.module_base} module "{self.name}".')
                 self._instance.moveToThread(thread)
                 thread.start()
-                try:
-                    QtCore.QMetaObject.invokeMethod(self._instance.module_state,
-                                                    'activate',
-                                                    QtCore.Qt.ConnectionType.BlockingQueuedConnection)
-                finally:
-                    # Cleanup if activation was not successful
-                    if not self.is_active:
-                        QtCore.QMetaObject.invokeMethod(self._instance,
-                                                        'move_to_main_thread',
-                                                        QtCore.Qt.ConnectionType.BlockingQueuedConnection)
-                        thread_manager.quit_thread(thread_name)
-                        thread_manager.join_thread(thread_name)
-                        self._disconnect()
-                        self._disable_state_updated()
+            # Hand over status variables loaded in advance (see prefetch_status_variables) right
+            # before the state machine transition, so a failed activation of required modules
+            # does not leave a stale future in the instance.
+            if not self.is_remote and self._prefetched_status_variables is not None:
+                self._instance._set_prefetched_status_variables(self._prefetched_status_variables)
+                self._prefetched_status_variables = None
+            self.__activation_thread_name = thread_name
+            self.__activating = True
+            return True
+
+    def _run_activation(self) -> None:
+        """Second step of module activation running the module state machine transition (i.e.
+        on_activate). Can be called from any thread after _begin_activation has returned True.
+        Must not hold the ManagedModule lock, so module activations can run concurrently.
+        """
+        if self.__activation_thread_name is None:
+            try:
+                self._instance.module_state.activate()
+            except Exception as e:
+                raise RuntimeError(
+                    f'Failed to activate {self.module_base} module "{self.name}"!'
+                ) from e
+        else:
+            QtCore.QMetaObject.invokeMethod(self._instance.module_state,
+                                            'activate',
+                                            QtCore.Qt.ConnectionType.BlockingQueuedConnection)
 
-            else:
-                try:
-                    self._instance.module_state.activate()
-                except Exception as e:
-                    raise RuntimeError(f'Failed to activate {self.module_base} module "{self.name}"!') from e
-                finally:  # cleanup if activation was not successful
-                    if not self.is_active:
-                        self._disconnect()
-                        self._disable_state_updated()
+    def _finish_activation(self) -> None:
+        """Last step of module activation. Must be called from the main thread after
+        _run_activation has returned. Cleans up if the activation was not successful.
+        """
+        with self._lock:
+            thread_name = self.__activation_thread_name
+            self.__activation_thread_name = None
+            self.__activating = False
+            if thread_name is not None:
+                # Module threads are stopped if the activation was not successful
+                if not self.is_active:
+                    thread_manager = self._qudi_main_ref().thread_manager
+                    QtCore.QMetaObject.invokeMethod(self._instance,
+                                                    'move_to_main_thread',
+                                                    QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+                    thread_manager.quit_thread(thread_name)
+                    thread_manager.join_thread(thread_name)
+            # cleanup if activation was not successful
+            if not self.is_active:
+                self._disconnect()
+                self._disable_state_updated()
 
             self.__last_state = self.state
 
             self.sigAppDataChanged.emit(self._base, self._name, self.has_app_data)
 
-            # Raise exception if by some reason no exception propagated to here and the activation
-            # is still unsuccessful.
-            if not self.is_active:
-                try:
-                    self._disconnect()
-                    self._disable_state_updated()
-                except:
-                    pass
-                raise RuntimeError(f'Failed to activate {self.module_base} module "{self.name}"!')
+    @QtCore.Slot()
+    def _finish_late_activation(self) -> None:
+        """Finishes an activation that has been run in another thread but that has not been
+        waited for (see ModuleManager.activate_modules timeout).
+        """
+        self._finish_activation()
+        if self.is_active:
+            logger.info(f'{self.module_base} module "{self.name}" finished activation after '
+                        f'timeout.')
+        else:
+            logger.error(f'Failed to activate {self.module_base} module "{self.name}"!')
 
     @QtCore.Slot()
     def _poll_module_state(self):
@@ -642,6 +923,9 @@ class ManagedModule(QtCore.QObject):
             return
 
         with self._lock:
+            if self.__activating:
+                raise RuntimeError(f'Unable to deactivate {self.module_base} module "{self.name}" '
+                                   f'while it is being activated.')
             if self.is_remote:
                 if not self.is_loaded:
                     return
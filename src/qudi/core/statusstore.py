@@ -0,0 +1,742 @@
+# -*- coding: utf-8 -*-
+"""
+Pluggable storage backends for qudi module status variables (see qudi.core.statusvariable).
+
+The backend used by all qudi modules is selected by the global config option
+"status_variable_backend":
+    - "yaml" (default): One human-readable YAML file per module in the app data directory.
+    - "binary": One msgpack encoded binary file per module with numpy arrays stored as raw bytes.
+      Legacy YAML status files are read transparently. Requires the optional dependency "msgpack".
+    - "sqlite": A single SQLite database for all modules with one row per module and status
+      variable. Writes are transactional. Existing status files can be migrated with the command
+      line tool "qudi-migrate-status-variables" (see migrate_status_files).
+
+Large numpy arrays in YAML status files can be loaded memory-mapped (global config option
+"status_variable_mmap_arrays").
+
+Status variables are saved upon module deactivation. In addition, StatusAutosaver can periodically
+save all active modules with changed status variables in a background thread (global config option
+"status_variable_autosave_interval").
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ['StatusStoreBase', 'YamlStatusStore', 'BinaryStatusStore', 'SqliteStatusStore',
+           'StatusAutosaver', 'create_status_store', 'get_status_store', 'migrate_status_files',
+           'set_status_store', 'status_store_backends']
+
+import io
+import os
+import re
+import ast
+import sqlite3
+import argparse
+import threading
+import numpy as np
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import Executor, Future
+from datetime import datetime, date
+from enum import Enum, Flag
+from importlib import import_module
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from qudi.util.paths import get_module_app_data_path, get_appdata_dir
+from qudi.util.yaml import YAML, yaml_load, yaml_dump, yaml_remove
+from qudi.util.atomicfile import atomic_open, get_write_mode, AtomicWriteMode
+from qudi.core.logger import get_logger
+
+_log = get_logger(__name__)
+
+
+class StatusStoreBase(metaclass=ABCMeta):
+    """Abstract base class for status variable storage backends.
+    Status variables are stored as dict per qudi module, identified by the module class name, the
+    module base ("gui", "logic" or "hardware") and the configured module name.
+    Implementations must be thread-safe.
+    """
+
+    @abstractmethod
+    def load(self, cls_name: str, module_base: str, module_name: str) -> Dict[str, Any]:
+        """Load the status variables of a single module. Returns an empty dict if nothing has been
+        stored yet.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def dump(self, cls_name: str, module_base: str, module_name: str,
+             variables: Mapping[str, Any]) -> None:
+        """Store the status variables of a single module, replacing previously stored ones.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, cls_name: str, module_base: str, module_name: str) -> bool:
+        """Returns whether any status variables have been stored for a single module.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove(self, cls_name: str, module_base: str, module_name: str) -> None:
+        """Removes all stored status variables of a single module. Does nothing if nothing has been
+        stored yet.
+        """
+        raise NotImplementedError
+
+    def prefetch(self, modules: Iterable[Tuple[str, str, str]],
+                 executor: Executor) -> List[Future]:
+        """Loads the status variables of multiple modules, each given as tuple (cls_name,
+        module_base, module_name), in the background using the given executor.
+        Returns a list of futures resolving to the status variables dicts in the order of modules.
+        Backends can overwrite this method to load many modules at once more efficiently.
+        """
+        return [executor.submit(self.load, *module) for module in modules]
+
+    def close(self) -> None:
+        """Releases all resources (e.g. database connections) held by this store. The store must
+        not be used afterwards. Does nothing by default.
+        """
+        pass
+
+
+class YamlStatusStore(StatusStoreBase):
+    """Stores the status variables of each module in a YAML file in the app data directory (see
+    qudi.util.paths.get_module_app_data_path). Large numpy arrays are stored in separate .npy files
+    which are only rewritten if their content changed.
+    """
+
+    def __init__(self, mmap_arrays: Optional[bool] = False):
+        """
+        Parameters
+        ----------
+        mmap_arrays : bool, optional
+            Flag to load large numpy arrays memory-mapped in copy-on-write mode instead of reading
+            them into memory (default: False).
+        """
+        self.mmap_arrays = bool(mmap_arrays)
+
+    def load(self, cls_name: str, module_base: str, module_name: str) -> Dict[str, Any]:
+        file_path = get_module_app_data_path(cls_name, module_base, module_name)
+        return yaml_load(file_path, ignore_missing=True, mmap_arrays=self.mmap_arrays)
+
+    def dump(self, cls_name: str, module_base: str, module_name: str,
+             variables: Mapping[str, Any]) -> None:
+        file_path = get_module_app_data_path(cls_name, module_base, module_name)
+        yaml_dump(file_path, variables)
+
+    def exists(self, cls_name: str, module_base: str, module_name: str) -> bool:
+        return os.path.exists(get_module_app_data_path(cls_name, module_base, module_name))
+
+    def remove(self, cls_name: str, module_base: str, module_name: str) -> None:
+        yaml_remove(get_module_app_data_path(cls_name, module_base, module_name),
+                    ignore_missing=True)
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError as err:
+        raise ImportError('The binary status variable backend requires the optional dependency '
+                          '"msgpack". Install it via "pip install qudi-core[msgpack]".') from err
+    return msgpack
+
+
+# msgpack extension type codes used by the binary status store
+_EXT_NDARRAY = 1
+_EXT_OBJECT_NDARRAY = 2
+_EXT_TUPLE = 3
+_EXT_SET = 4
+_EXT_FROZENSET = 5
+_EXT_COMPLEX = 6
+_EXT_ENUM = 7
+_EXT_FLAG = 8
+_EXT_DATETIME = 9
+_EXT_DATE = 10
+_EXT_BIGINT = 11
+
+
+class _BinaryEncoder:
+    """Encodes status variables into a msgpack "skeleton" and a list of numpy arrays to be stored
+    as raw bytes after the skeleton. Arrays are represented in the skeleton by their dtype, shape
+    and byte offset in the payload.
+    Objects not natively supported by msgpack (including subclasses of supported types) are
+    converted into msgpack extension types. Supports the same types as qudi.util.yaml.
+    """
+    alignment = 64
+
+    def __init__(self):
+        self._msgpack = _import_msgpack()
+        self.arrays = list()
+        self.payload_size = 0
+
+    def pack(self, obj: Any) -> bytes:
+        return self._msgpack.packb(obj, default=self.default, use_bin_type=True, strict_types=True)
+
+    def default(self, obj: Any) -> Any:
+        ext_type = self._msgpack.ExtType
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.hasobject:
+                return ext_type(_EXT_OBJECT_NDARRAY,
+                                self.pack([list(obj.shape), obj.ravel().tolist()]))
+            array = np.ascontiguousarray(obj)
+            offset = -(-self.payload_size // self.alignment) * self.alignment
+            self.arrays.append((offset, array))
+            self.payload_size = offset + array.nbytes
+            descr = repr(np.lib.format.dtype_to_descr(array.dtype))
+            return ext_type(_EXT_NDARRAY, self.pack([descr, list(array.shape), offset]))
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, Flag):
+            cls = type(obj)
+            return ext_type(_EXT_FLAG, self.pack([cls.__module__, cls.__name__, int(obj.value)]))
+        if isinstance(obj, Enum):
+            cls = type(obj)
+            return ext_type(_EXT_ENUM, self.pack([cls.__module__, cls.__name__, obj.name]))
+        if isinstance(obj, tuple):
+            return ext_type(_EXT_TUPLE, self.pack(list(obj)))
+        if isinstance(obj, frozenset):
+            return ext_type(_EXT_FROZENSET, self.pack(list(obj)))
+        if isinstance(obj, set):
+            return ext_type(_EXT_SET, self.pack(list(obj)))
+        if isinstance(obj, complex):
+            return ext_type(_EXT_COMPLEX, self.pack([obj.real, obj.imag]))
+        if isinstance(obj, datetime):
+            return ext_type(_EXT_DATETIME, obj.isoformat().encode())
+        if isinstance(obj, date):
+            return ext_type(_EXT_DATE, obj.isoformat().encode())
+        if type(obj) is int:
+            # Integer out of 64bit range
+            return ext_type(_EXT_BIGINT, str(obj).encode())
+        # Subclasses of natively supported types, e.g. OrderedDict
+        for base in (bool, int, float, str, bytes, dict, list):
+            if isinstance(obj, base):
+                return base(obj)
+        raise TypeError(f'Object of type "{type(obj).__name__}" can not be stored in binary format.')
+
+
+class _BinaryDecoder:
+    """Decodes the msgpack skeleton written by _BinaryEncoder and reads the referenced numpy arrays
+    directly from the payload section of the open file into new arrays.
+    """
+
+    def __init__(self, file: BinaryIO, payload_offset: int):
+        self._msgpack = _import_msgpack()
+        self._file = file
+        self._payload_offset = payload_offset
+
+    def unpack(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data,
+                                     ext_hook=self.ext_hook,
+                                     raw=False,
+                                     strict_map_key=False)
+
+    def read_array(self, dtype: np.dtype, shape: Tuple[int, ...], offset: int) -> np.ndarray:
+        array = np.empty(shape, dtype=dtype)
+        self._file.seek(self._payload_offset + offset)
+        if self._file.readinto(array.reshape(-1).view(np.uint8)) != array.nbytes:
+            raise ValueError('Binary status file is truncated.')
+        return array
+
+    def ext_hook(self, code: int, data: bytes) -> Any:
+        if code == _EXT_NDARRAY:
+            descr, shape, offset = self.unpack(data)
+            dtype = np.lib.format.descr_to_dtype(ast.literal_eval(descr))
+            return self.read_array(dtype, tuple(shape), offset)
+        if code == _EXT_OBJECT_NDARRAY:
+            shape, items = self.unpack(data)
+            array = np.empty(len(items), dtype=object)
+            array[:] = items
+            return array.reshape(shape)
+        if code == _EXT_TUPLE:
+            return tuple(self.unpack(data))
+        if code == _EXT_SET:
+            return set(self.unpack(data))
+        if code == _EXT_FROZENSET:
+            return frozenset(self.unpack(data))
+        if code == _EXT_COMPLEX:
+            return complex(*self.unpack(data))
+        if code in (_EXT_ENUM, _EXT_FLAG):
+            module, cls_name, value = self.unpack(data)
+            cls = getattr(import_module(module), cls_name)
+            return cls[value] if code == _EXT_ENUM else cls(value)
+        if code == _EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == _EXT_DATE:
+            return date.fromisoformat(data.decode())
+        if code == _EXT_BIGINT:
+            return int(data.decode())
+        raise ValueError(f'Unknown msgpack extension type code {code:d} in binary status file.')
+
+
+def _aligned_offset(header_size: int) -> int:
+    return -(-header_size // _BinaryEncoder.alignment) * _BinaryEncoder.alignment
+
+
+def _pack_binary(value: Any) -> bytearray:
+    """Encodes a single value as self-contained binary blob consisting of the 8 bytes
+    little-endian skeleton length, the msgpack skeleton and the aligned raw array payload.
+    """
+    encoder = _BinaryEncoder()
+    skeleton = encoder.pack(value)
+    payload_offset = _aligned_offset(8 + len(skeleton))
+    blob = bytearray(payload_offset + encoder.payload_size)
+    blob[:8] = len(skeleton).to_bytes(8, 'little')
+    blob[8:8 + len(skeleton)] = skeleton
+    payload = memoryview(blob)
+    for offset, array in encoder.arrays:
+        start = payload_offset + offset
+        payload[start:start + array.nbytes] = array.reshape(-1).view(np.uint8)
+    return blob
+
+
+def _unpack_binary(blob: bytes) -> Any:
+    """Decodes a binary blob created by _pack_binary.
+    """
+    skeleton_size = int.from_bytes(blob[:8], 'little')
+    decoder = _BinaryDecoder(io.BytesIO(blob), _aligned_offset(8 + skeleton_size))
+    return decoder.unpack(blob[8:8 + skeleton_size])
+
+
+class BinaryStatusStore(YamlStatusStore):
+    """Stores the status variables of each module as binary file (".qstatus") in the app data
+    directory. Numpy arrays are stored as raw bytes and read without parsing or extra copies.
+
+    The file consists of:
+        - 8 bytes magic string b"QUDISTAT"
+        - 8 bytes little-endian length of the msgpack skeleton
+        - msgpack encoded skeleton of the status variables dict with arrays replaced by references
+        - payload of raw array data starting at the next multiple of 64 bytes
+
+    Legacy YAML status files are read if no binary file exists or the YAML file is newer.
+    If the status variables contain objects that can not be stored in binary format, the YAML file
+    is written instead. The option mmap_arrays only applies to these YAML files since binary files
+    are replaced upon each dump, which is not possible for memory-mapped files on all platforms.
+    """
+    file_extension = '.qstatus'
+    _magic = b'QUDISTAT'
+
+    def __init__(self, mmap_arrays: Optional[bool] = False):
+        # Fail early if msgpack is not available
+        _import_msgpack()
+        super().__init__(mmap_arrays=mmap_arrays)
+
+    def get_file_path(self, cls_name: str, module_base: str, module_name: str) -> str:
+        yaml_path = get_module_app_data_path(cls_name, module_base, module_name)
+        return os.path.splitext(yaml_path)[0] + self.file_extension
+
+    @classmethod
+    def _payload_offset(cls, skeleton_size: int) -> int:
+        return _aligned_offset(len(cls._magic) + 8 + skeleton_size)
+
+    def load(self, cls_name: str, module_base: str, module_name: str) -> Dict[str, Any]:
+        file_path = self.get_file_path(cls_name, module_base, module_name)
+        yaml_path = get_module_app_data_path(cls_name, module_base, module_name)
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return super().load(cls_name, module_base, module_name)
+        try:
+            if os.path.getmtime(yaml_path) > mtime:
+                return super().load(cls_name, module_base, module_name)
+        except OSError:
+            pass
+        with open(file_path, 'rb') as file:
+            if file.read(len(self._magic)) != self._magic:
+                raise ValueError(f'File "{file_path}" is not a qudi binary status file.')
+            skeleton_size = int.from_bytes(file.read(8), 'little')
+            skeleton = file.read(skeleton_size)
+            decoder = _BinaryDecoder(file, self._payload_offset(skeleton_size))
+            return decoder.unpack(skeleton)
+
+    def dump(self, cls_name: str, module_base: str, module_name: str,
+             variables: Mapping[str, Any]) -> None:
+        encoder = _BinaryEncoder()
+        try:
+            skeleton = encoder.pack(dict(variables))
+        except (TypeError, ValueError, OverflowError) as err:
+            _log.warning(f'Unable to store status variables of module "{module_name}" in binary '
+                         f'format ({err}). Falling back to YAML.')
+            super().dump(cls_name, module_base, module_name, variables)
+            return
+        file_path = self.get_file_path(cls_name, module_base, module_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        payload_offset = self._payload_offset(len(skeleton))
+        with atomic_open(file_path, 'wb') as file:
+            file.write(self._magic)
+            file.write(len(skeleton).to_bytes(8, 'little'))
+            file.write(skeleton)
+            for offset, array in encoder.arrays:
+                file.write(bytes(payload_offset + offset - file.tell()))
+                file.write(array.reshape(-1).view(np.uint8))
+
+    def exists(self, cls_name: str, module_base: str, module_name: str) -> bool:
+        file_path = self.get_file_path(cls_name, module_base, module_name)
+        return os.path.exists(file_path) or super().exists(cls_name, module_base, module_name)
+
+    def remove(self, cls_name: str, module_base: str, module_name: str) -> None:
+        try:
+            os.remove(self.get_file_path(cls_name, module_base, module_name))
+        except FileNotFoundError:
+            pass
+        super().remove(cls_name, module_base, module_name)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS status_variables (
+    module_base TEXT NOT NULL,
+    module_name TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    format TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (module_base, module_name, class_name, variable)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteStatusStore(StatusStoreBase):
+    """Stores the status variables of all modules in a single SQLite database in the app data
+    directory with one row per module and status variable.
+
+    Each dump replaces all status variables of a module in a single transaction, so the database
+    always contains either the complete old or the complete new status of a module. The database
+    is flushed to disk upon each dump in "durable" file write mode (see qudi.util.atomicfile).
+    The status variables of all modules are loaded with a single query upon prefetch.
+
+    Values are stored in the binary format of BinaryStatusStore if the optional dependency
+    "msgpack" is available. Otherwise, and for values not supported by the binary format, values
+    are stored as YAML.
+    """
+    file_name = 'status_variables.sqlite'
+
+    def __init__(self, db_path: Optional[str] = None, mmap_arrays: Optional[bool] = False):
+        """
+        Parameters
+        ----------
+        db_path : str, optional
+            File path of the SQLite database. Created if it does not exist. Defaults to
+            "<AppData>/qudi/status_variables.sqlite".
+        mmap_arrays : bool, optional
+            Ignored. Arrays are always loaded into memory.
+        """
+        if db_path is None:
+            db_path = os.path.join(get_appdata_dir(create_missing=True), self.file_name)
+        self.db_path = db_path
+        try:
+            _import_msgpack()
+        except ImportError:
+            self._binary = False
+        else:
+            self._binary = True
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        try:
+            with self._lock:
+                self._connection.execute('PRAGMA journal_mode=WAL')
+                self._connection.executescript(_SQLITE_SCHEMA)
+                self._connection.commit()
+        except:
+            self._connection.close()
+            raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _encode(self, value: Any) -> Tuple[str, Any]:
+        if self._binary:
+            try:
+                return 'binary', _pack_binary(value)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        with io.StringIO() as stream:
+            YAML().dump(value, stream)
+            return 'yaml', stream.getvalue().encode()
+
+    @staticmethod
+    def _decode(value_format: str, value: bytes) -> Any:
+        if value_format == 'binary':
+            return _unpack_binary(value)
+        return YAML().load(value.decode())
+
+    def load(self, cls_name: str, module_base: str, module_name: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT variable, format, value FROM status_variables '
+                'WHERE module_base = ? AND module_name = ? AND class_name = ?',
+                (module_base, module_name, cls_name)
+            ).fetchall()
+        return {variable: self._decode(value_format, value) for variable, value_format, value in
+                rows}
+
+    def load_all(self) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """Loads the status variables of all modules stored in the database at once. Returns a dict
+        with (cls_name, module_base, module_name) tuples as keys and status variables dicts as
+        values.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT class_name, module_base, module_name, variable, format, value '
+                'FROM status_variables'
+            ).fetchall()
+        modules = dict()
+        for cls_name, module_base, module_name, variable, value_format, value in rows:
+            variables = modules.setdefault((cls_name, module_base, module_name), dict())
+            variables[variable] = self._decode(value_format, value)
+        return modules
+
+    def prefetch(self, modules: Iterable[Tuple[str, str, str]],
+                 executor: Executor) -> List[Future]:
+        modules = [tuple(module) for module in modules]
+        futures = [Future() for _ in modules]
+
+        def load_all():
+            try:
+                all_variables = self.load_all()
+            except BaseException as err:
+                for future in futures:
+                    future.set_exception(err)
+            else:
+                for module, future in zip(modules, futures):
+                    future.set_result(all_variables.get(module, dict()))
+
+        executor.submit(load_all)
+        return futures
+
+    def dump(self, cls_name: str, module_base: str, module_name: str,
+             variables: Mapping[str, Any]) -> None:
+        # Encode all values before starting the transaction
+        rows = [(module_base, module_name, cls_name, str(variable), *self._encode(value)) for
+                variable, value in variables.items()]
+        synchronous = 'FULL' if get_write_mode() == AtomicWriteMode.DURABLE else 'NORMAL'
+        with self._lock:
+            self._connection.execute(f'PRAGMA synchronous={synchronous}')
+            with self._connection:
+                self._connection.execute(
+                    'DELETE FROM status_variables '
+                    'WHERE module_base = ? AND module_name = ? AND class_name = ?',
+                    (module_base, module_name, cls_name)
+                )
+                self._connection.executemany(
+                    'INSERT INTO status_variables VALUES (?, ?, ?, ?, ?, ?)', rows
+                )
+
+    def exists(self, cls_name: str, module_base: str, module_name: str) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT 1 FROM status_variables '
+                'WHERE module_base = ? AND module_name = ? AND class_name = ? LIMIT 1',
+                (module_base, module_name, cls_name)
+            ).fetchone() is not None
+
+    def remove(self, cls_name: str, module_base: str, module_name: str) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    'DELETE FROM status_variables '
+                    'WHERE module_base = ? AND module_name = ? AND class_name = ?',
+                    (module_base, module_name, cls_name)
+                )
+
+
+status_store_backends = {'yaml': YamlStatusStore,
+                         'binary': BinaryStatusStore,
+                         'sqlite': SqliteStatusStore}
+
+_status_store = YamlStatusStore()
+
+
+def create_status_store(backend: str, **kwargs) -> StatusStoreBase:
+    """Create a new status store instance for the given backend name (see status_store_backends).
+    Additional keyword arguments are passed on to the backend constructor.
+    """
+    try:
+        store_cls = status_store_backends[backend]
+    except KeyError:
+        raise ValueError(f'Unknown status variable backend "{backend}". Valid backends are: '
+                         f'{list(status_store_backends)}') from None
+    return store_cls(**kwargs)
+
+
+def get_status_store() -> StatusStoreBase:
+    """Returns the status store currently used by all qudi modules.
+    """
+    return _status_store
+
+
+def set_status_store(store: StatusStoreBase) -> None:
+    """Set the status store to be used by all qudi modules. The previously used store is closed.
+    """
+    global _status_store
+    if not isinstance(store, StatusStoreBase):
+        raise TypeError('Status store must be an instance of StatusStoreBase.')
+    old_store, _status_store = _status_store, store
+    if old_store is not store:
+        try:
+            old_store.close()
+        except Exception:
+            _log.exception('Error while closing previous status variable store:')
+
+
+class StatusAutosaver:
+    """Periodically saves the status variables of qudi modules in a background thread.
+
+    Only modules with status variables changed since their last dump (see
+    qudi.core.statusvariable.get_changed_status_variables) are saved. Modules that are not active
+    are skipped. The status variables are collected in the thread of each module (see
+    qudi.core.module.Base._autosave_status_variables), only serialization and file I/O happen in
+    the autosave thread. Modules busy for longer than the autosave interval are skipped until the
+    next autosave.
+    """
+
+    def __init__(self, get_modules: Callable[[], Iterable[Any]], interval: float):
+        """
+        Parameters
+        ----------
+        get_modules : callable
+            Callable without arguments returning an iterable of qudi module instances to autosave.
+        interval : float
+            Time in seconds between consecutive autosaves. Must be > 0.
+        """
+        interval = float(interval)
+        if interval <= 0:
+            raise ValueError('Status variable autosave interval must be > 0 seconds.')
+        self._get_modules = get_modules
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._save_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts the background thread. Does nothing if it is already running.
+        """
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name='status-variable-autosave',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops the background thread and waits for a running autosave to finish.
+        """
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def save_changed(self) -> int:
+        """Saves all active modules with changed status variables immediately in the calling
+        thread. Returns the number of saved modules.
+        """
+        saved = 0
+        with self._save_lock:
+            try:
+                modules = list(self._get_modules())
+            except:
+                _log.exception('Unable to get qudi modules for status variable autosave:')
+                return saved
+            for module in modules:
+                try:
+                    if module.module_state() == 'deactivated':
+                        continue
+                    if module._autosave_status_variables(timeout=self._interval):
+                        saved += 1
+                except:
+                    _log.exception(f'Status variable autosave failed for module '
+                                   f'"{getattr(module, "module_name", module)}":')
+        return saved
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            saved = self.save_changed()
+            if saved:
+                _log.debug(f'Status variables of {saved:d} module(s) autosaved.')
+
+
+# Matches status file names created by qudi.util.paths.get_module_app_data_path
+_STATUS_FILE_REGEX = re.compile(r'\Astatus-(.+?)_(gui|logic|hardware)_(.+)\.(cfg|qstatus)\Z')
+
+
+def migrate_status_files(store: StatusStoreBase, remove_files: Optional[bool] = False) -> int:
+    """Copies the status variables of all modules from the status files in the app data directory
+    (written by YamlStatusStore or BinaryStatusStore) into the given store, e.g. a
+    SqliteStatusStore. Returns the number of migrated modules.
+
+    Parameters
+    ----------
+    store : StatusStoreBase
+        Status store to migrate the status variables into.
+    remove_files : bool, optional
+        Flag to remove the status files after successful migration (default: False).
+    """
+    try:
+        file_names = os.listdir(get_appdata_dir())
+    except FileNotFoundError:
+        return 0
+    modules = dict()
+    for file_name in file_names:
+        match = _STATUS_FILE_REGEX.match(file_name)
+        if match is not None:
+            modules.setdefault(match.groups()[:3], set()).add(match.group(4))
+    migrated = 0
+    for module, extensions in sorted(modules.items()):
+        try:
+            # BinaryStatusStore reads the newest of both file types
+            file_store = BinaryStatusStore() if 'qstatus' in extensions else YamlStatusStore()
+            store.dump(*module, file_store.load(*module))
+        except Exception:
+            _log.exception(f'Unable to migrate status variables of {module[1]} module '
+                           f'"{module[2]}":')
+            continue
+        if remove_files:
+            file_store.remove(*module)
+        migrated += 1
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='qudi-migrate-status-variables',
+                                     description='Migrate qudi status variable files from the app '
+                                                 'data directory into the SQLite status store.')
+    parser.add_argument('--db',
+                        default=None,
+                        help='Path to the status variable database. Defaults to '
+                             '"<AppData>/qudi/status_variables.sqlite".')
+    parser.add_argument('--remove',
+                        action='store_true',
+                        help='Remove the status files after successful migration.')
+    args = parser.parse_args()
+
+    store = SqliteStatusStore(args.db)
+    try:
+        count = migrate_status_files(store, remove_files=args.remove)
+    finally:
+        store.close()
+    print(f'Migrated status variables of {count:d} modules into "{store.db_path}".')
+
+
+if __name__ == '__main__':
+    main()
@@ -21,7 +21,8 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
 
-__all__ = ['StatusVar']
+__all__ = ['StatusVar', 'clear_changed_status_variables', 'get_changed_status_variables',
+           'mark_status_variables_changed']
 
 import copy
 import inspect
@@ -30,10 +31,19 @@ from typing import Any, Generic, TypeVar, cast
 
 T = TypeVar('T')
 
+# Name of the instance attribute holding the set of changed status variable attribute names
+_CHANGED_ATTR = '_status_variables_changed'
+
 
 class StatusVar(Generic[T]):
     """This class defines a status variable that is loaded before activation and saved after
     deactivation.
+
+    StatusVar is a data descriptor storing the variable value in the owning instance. Each
+    assignment marks the variable as changed (see get_changed_status_variables) which allows
+    saving only modules with changed status variables. In-place modifications of mutable values
+    (e.g. numpy arrays or lists) can not be detected and must be flagged explicitly using
+    mark_status_variables_changed.
     """
 
     def __init__(self, name: str | None = None, default: T | None = None, *,
@@ -53,6 +63,7 @@ class StatusVar(Generic[T]):
         """
         self.name = name
         self.default = default
+        self._attr_name: str | None = None
         self.constructor_function: Callable[[Any, Any], T] | None = None
         self.representer_function: Callable[[Any, T], Any] | None = None
         if constructor is not None:
@@ -61,9 +72,23 @@ class StatusVar(Generic[T]):
             self.representer(representer)
 
     def __get__(self, instance, owner) -> T:
-        return self
+        if instance is None:
+            return self
+        # Return meta object itself as long as no value has been set
+        return instance.__dict__.get(self._attr_name, self)
+
+    def __set__(self, instance, value: T) -> None:
+        instance.__dict__[self._attr_name] = value
+        instance.__dict__.setdefault(_CHANGED_ATTR, set()).add(self._attr_name)
+
+    def __delete__(self, instance) -> None:
+        try:
+            del instance.__dict__[self._attr_name]
+        except KeyError:
+            raise AttributeError(self._attr_name) from None
 
     def __set_name__(self, owner, name):
+        self._attr_name = name
         if self.name is None:
             self.name = name
 
@@ -132,3 +157,28 @@ class StatusVar(Generic[T]):
 
             return wrapper
         return func
+
+
+def get_changed_status_variables(instance: Any) -> frozenset:
+    """Returns the attribute names of all status variables of the given instance that have been
+    changed since the last call to clear_changed_status_variables.
+    """
+    return frozenset(instance.__dict__.get(_CHANGED_ATTR, ()))
+
+
+def clear_changed_status_variables(instance: Any) -> frozenset:
+    """Resets the changed flags of all status variables of the given instance and returns the
+    attribute names of the status variables that have been flagged as changed before.
+    """
+    changed = instance.__dict__.pop(_CHANGED_ATTR, None)
+    return frozenset() if changed is None else frozenset(changed)
+
+
+def mark_status_variables_changed(instance: Any, *attr_names: str) -> None:
+    """Flags status variables of the given instance as changed, e.g. after modifying a mutable
+    status variable value in-place. Flags all status variables if no attribute names are given.
+    """
+    if not attr_names:
+        attr_names = [name for cls in type(instance).__mro__ for name, attr in vars(cls).items()
+                      if isinstance(attr, StatusVar)]
+    instance.__dict__.setdefault(_CHANGED_ATTR, set()).update(attr_names)
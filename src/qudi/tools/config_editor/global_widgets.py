@@ -245,6 +245,83 @@ class GlobalOptionsWidget(QtWidgets.QWidget):
         layout.addWidget(label, 8, 0)
         layout.addWidget(self.stylesheet_lineedit, 8, 1)
 
+        # Create file write mode selector
+        label = QtWidgets.QLabel('File write mode:')
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.file_write_mode_combobox = QtWidgets.QComboBox()
+        self.file_write_mode_combobox.addItems(['fast', 'durable'])
+        self.file_write_mode_combobox.setToolTip(
+            'Data and status variable files are always replaced atomically.\n"durable" additionally '
+            'flushes each written file to disk before continuing (slower).'
+        )
+        layout.addWidget(label, 9, 0)
+        layout.addWidget(self.file_write_mode_combobox, 9, 1)
+
+        # Create status variable backend selector
+        label = QtWidgets.QLabel('Status variable backend:')
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.status_backend_combobox = QtWidgets.QComboBox()
+        self.status_backend_combobox.addItems(['yaml', 'binary', 'sqlite'])
+        self.status_backend_combobox.setToolTip(
+            'Storage format for module status variables.\n"binary" is faster for large arrays and '
+            'requires the optional dependency "msgpack".\n"sqlite" stores all modules in a single '
+            'transactional database.'
+        )
+        layout.addWidget(label, 10, 0)
+        layout.addWidget(self.status_backend_combobox, 10, 1)
+
+        # Create status variable autosave interval editor
+        label = QtWidgets.QLabel('Status variable autosave interval:')
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.autosave_interval_spinbox = QtWidgets.QDoubleSpinBox()
+        self.autosave_interval_spinbox.setRange(0, 86400)
+        self.autosave_interval_spinbox.setDecimals(1)
+        self.autosave_interval_spinbox.setSuffix(' s')
+        self.autosave_interval_spinbox.setSpecialValueText('disabled')
+        self.autosave_interval_spinbox.setToolTip(
+            'Interval in seconds to periodically save changed status variables of active modules.\n'
+            'Set to 0 to save status variables only upon module deactivation.'
+        )
+        layout.addWidget(label, 11, 0)
+        layout.addWidget(self.autosave_interval_spinbox, 11, 1)
+
+        # Create flag editor to load large status variable arrays memory-mapped
+        label = QtWidgets.QLabel('Memory-map status variable arrays:')
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.mmap_arrays_checkbox = QtWidgets.QCheckBox()
+        self.mmap_arrays_checkbox.setToolTip(
+            'Whether to load large numpy arrays stored in separate files of YAML status variable '
+            'files\nmemory-mapped (copy-on-write) instead of reading them into memory.'
+        )
+        layout.addWidget(label, 12, 0)
+        layout.addWidget(self.mmap_arrays_checkbox, 12, 1)
+
+        # Create editors for parallel activation of startup modules
+        label = QtWidgets.QLabel('Startup activation workers:')
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.activation_workers_spinbox = QtWidgets.QSpinBox()
+        self.activation_workers_spinbox.setRange(1, 64)
+        self.activation_workers_spinbox.setSpecialValueText('serial')
+        self.activation_workers_spinbox.setToolTip(
+            'Maximum number of startup modules (and modules required by them) to activate '
+            'concurrently.\nSet to 1 to activate startup modules one after another.'
+        )
+        layout.addWidget(label, 13, 0)
+        layout.addWidget(self.activation_workers_spinbox, 13, 1)
+        label = QtWidgets.QLabel('Startup activation timeout:')
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.activation_timeout_spinbox = QtWidgets.QDoubleSpinBox()
+        self.activation_timeout_spinbox.setRange(0, 3600)
+        self.activation_timeout_spinbox.setDecimals(1)
+        self.activation_timeout_spinbox.setSuffix(' s')
+        self.activation_timeout_spinbox.setSpecialValueText('disabled')
+        self.activation_timeout_spinbox.setToolTip(
+            'Time in seconds to wait for the activation of each module if startup modules are '
+            'activated concurrently.\nSet to 0 to wait indefinitely.'
+        )
+        layout.addWidget(label, 14, 0)
+        layout.addWidget(self.activation_timeout_spinbox, 14, 1)
+
         # Get default config from JSON schema
         global_props = config_schema()['properties']['global']['properties']
         self._config_defaults = {
@@ -263,6 +340,12 @@ class GlobalOptionsWidget(QtWidgets.QWidget):
             'force_remote_calls_by_value': self.force_calls_by_value_checkbox.isChecked(),
             'hide_manager_window'        : self.hide_manager_window_checkbox.isChecked(),
             'daily_data_dirs'            : self.daily_data_dirs_checkbox.isChecked(),
+            'file_write_mode'            : self.file_write_mode_combobox.currentText(),
+            'status_variable_backend'    : self.status_backend_combobox.currentText(),
+            'status_variable_autosave_interval': self.autosave_interval_spinbox.value(),
+            'status_variable_mmap_arrays': self.mmap_arrays_checkbox.isChecked(),
+            'startup_activation_workers' : self.activation_workers_spinbox.value(),
+            'startup_activation_timeout' : self.activation_timeout_spinbox.value(),
             'startup_modules'            : [mod.strip() for mod in
                                             self.startup_lineedit.text().split(',') if mod.strip()],
         }
@@ -293,6 +376,12 @@ class GlobalOptionsWidget(QtWidgets.QWidget):
         stylesheet = config['stylesheet']
         self.stylesheet_lineedit.setText('' if stylesheet is None else stylesheet)
         self.startup_lineedit.setText(','.join(config['startup_modules']))
+        self.file_write_mode_combobox.setCurrentText(config['file_write_mode'])
+        self.status_backend_combobox.setCurrentText(config['status_variable_backend'])
+        self.autosave_interval_spinbox.setValue(config['status_variable_autosave_interval'])
+        self.mmap_arrays_checkbox.setChecked(config['status_variable_mmap_arrays'])
+        self.activation_workers_spinbox.setValue(config['startup_activation_workers'])
+        self.activation_timeout_spinbox.setValue(config['startup_activation_timeout'])
 
 
 class GlobalConfigWidget(QtWidgets.QWidget):
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains helpers for crash-safe file writing. Files are written to a temporary file in
+the destination directory first which replaces the destination file atomically once writing has
+finished. A crash while writing therefore never leaves a truncated file behind.
+
+Two write modes are available (see AtomicWriteMode):
+    - "fast": Temporary file and rename only. Protects against crashes of the writing process but
+      recently written files might be lost (never truncated) upon OS crash or power loss.
+    - "durable": Additionally flushes the file contents and the directory entry to the storage
+      device before returning. Directory flushes requested concurrently by multiple threads writing
+      into the same directory are batched (group commit), so that e.g. many files saved in parallel
+      share a single directory flush.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ('AtomicWriteMode', 'GroupCommitter', 'atomic_open', 'get_write_mode', 'set_write_mode')
+
+import os
+import threading
+from enum import Enum
+from contextlib import contextmanager
+from typing import Optional, Union
+
+
+class AtomicWriteMode(Enum):
+    FAST = 'fast'
+    DURABLE = 'durable'
+
+
+def _fsync_directory(dir_path: str) -> None:
+    """Flush a directory entry to disk. Not supported (and not needed) on Windows.
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class GroupCommitter:
+    """Flushes directory entries of renamed files to disk with group commit.
+
+    The first thread requesting a directory flush performs it (leader). Threads requesting a flush
+    of the same directory while it is in progress wait and are served together by a single
+    subsequent flush performed by one of them. Thus, concurrent writers into the same directory
+    share the expensive directory flush instead of flushing it once per file.
+    """
+
+    class _DirectoryState:
+        __slots__ = ('requested', 'synced', 'syncing')
+
+        def __init__(self):
+            self.requested = 0
+            self.synced = 0
+            self.syncing = False
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        self._directories = dict()
+
+    def sync_directory(self, dir_path: str) -> None:
+        """Returns once all renames into dir_path completed before this call are flushed to disk.
+        """
+        dir_path = os.path.abspath(dir_path)
+        with self._lock:
+            state = self._directories.get(dir_path, None)
+            if state is None:
+                state = self._directories[dir_path] = self._DirectoryState()
+            state.requested += 1
+            ticket = state.requested
+            try:
+                while state.synced < ticket:
+                    if state.syncing:
+                        self._lock.wait()
+                        continue
+                    # Become leader and flush for all requests issued so far
+                    state.syncing = True
+                    target = state.requested
+                    self._lock.release()
+                    try:
+                        _fsync_directory(dir_path)
+                    finally:
+                        self._lock.acquire()
+                        state.syncing = False
+                        self._lock.notify_all()
+                    state.synced = target
+            finally:
+                if not state.syncing and state.synced == state.requested:
+                    self._directories.pop(dir_path, None)
+
+
+_write_mode = AtomicWriteMode.FAST
+_group_committer = GroupCommitter()
+
+
+def get_write_mode() -> AtomicWriteMode:
+    """Returns the global write mode used by atomic_open.
+    """
+    return _write_mode
+
+
+def set_write_mode(mode: Union[AtomicWriteMode, str]) -> None:
+    """Set the global write mode used by atomic_open ("fast" or "durable").
+    """
+    global _write_mode
+    _write_mode = AtomicWriteMode(mode)
+
+
+@contextmanager
+def atomic_open(file_path: str, mode: Optional[str] = 'w', durable: Optional[bool] = None,
+                **kwargs):
+    """Context manager opening a temporary file for writing that atomically replaces file_path upon
+    successful exit. If an exception is raised within the context, the temporary file is removed
+    and file_path is left untouched.
+
+    Parameters
+    ----------
+    file_path : str
+        Destination file path. The containing directory must exist.
+    mode : str, optional
+        Write mode passed on to open(), either "w" (default) or "wb".
+    durable : bool, optional
+        Flag overriding the global write mode for this file (see set_write_mode).
+    kwargs : optional
+        Additional keyword arguments passed on to open().
+
+    Yields
+    ------
+    file object
+        The open temporary file to write to. The destination path is available as additional
+        attribute "target_path" (the "name" attribute is the temporary file path).
+    """
+    if mode not in ('w', 'wb'):
+        raise ValueError(f'Invalid mode "{mode}" for atomic file write. Must be "w" or "wb".')
+    if durable is None:
+        durable = _write_mode == AtomicWriteMode.DURABLE
+    tmp_path = f'{file_path}.{os.getpid():d}-{threading.get_ident():d}.tmp'
+    file = open(tmp_path, mode, **kwargs)
+    file.target_path = file_path
+    try:
+        yield file
+        if durable:
+            file.flush()
+            os.fsync(file.fileno())
+        file.close()
+        os.replace(tmp_path, file_path)
+        if durable:
+            _group_committer.sync_directory(os.path.dirname(file_path) or os.curdir)
+    except BaseException:
+        file.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a SQLite based catalog of qudi data files. The catalog indexes the timestamp,
+nametag and metadata of saved data files in order to quickly query data files without walking the
+data directories and parsing thousands of file headers.
+
+The catalog can be updated incrementally by the qudi.util.datastorage storage classes (see
+DataStorageBase.set_data_catalog) and backfilled by scanning existing data directories:
+
+    qudi-data-catalog <data root directory> [--db <catalog file path>]
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ('CatalogEntry', 'DataCatalog', 'get_default_catalog_path', 'read_catalog_info')
+
+import os
+import re
+import sqlite3
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from qudi.util.mutex import Mutex
+from qudi.util.paths import get_default_data_dir
+from qudi.util.datastorage import get_info_from_file, parse_metadata_value, NpyDataStorage
+from qudi.util.datastorage import NpzDataStorage
+from qudi.util.datastorage import ChunkedArrayDataStorage, Hdf5DataStorage
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    timestamp REAL,
+    nametag TEXT,
+    storage TEXT,
+    mtime REAL,
+    size INTEGER
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    num_value REAL,
+    str_value TEXT,
+    repr_value TEXT NOT NULL,
+    PRIMARY KEY (file_id, key)
+);
+CREATE INDEX IF NOT EXISTS files_timestamp ON files(timestamp);
+CREATE INDEX IF NOT EXISTS files_nametag ON files(nametag);
+CREATE INDEX IF NOT EXISTS metadata_num ON metadata(key, num_value);
+CREATE INDEX IF NOT EXISTS metadata_str ON metadata(key, str_value);
+"""
+
+# Operators allowed in metadata query conditions
+_OPERATORS = {'==': '=', '=': '=', '!=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=',
+              'like': 'LIKE'}
+
+# Extracts the nametag from generic qudi data file names, e.g. "20210130-1130-59_nametag.dat"
+_FILENAME_REGEX = re.compile(r'\A\d{8}-\d{4}-\d{2}(?:_(.+?))?(?:_metadata)?(?:\.[^.]*)?\Z')
+
+# File extensions of files that are never data files
+_IGNORED_EXTENSIONS = ('.png', '.pdf', '.jpg', '.svg', '.tmp', '.sqlite', '.sqlite-wal',
+                       '.sqlite-shm', '.chunk', '.json', '.idx')
+
+
+class CatalogEntry(NamedTuple):
+    """A single data file entry in the data catalog.
+    """
+    path: str
+    timestamp: Optional[datetime]
+    nametag: Optional[str]
+    storage: Optional[str]
+
+
+def get_default_catalog_path(data_root: Optional[str] = None) -> str:
+    """Returns the default file path of the catalog database for the given data root directory
+    (defaults to the qudi default data directory).
+    """
+    if data_root is None:
+        data_root = get_default_data_dir()
+    return os.path.join(data_root, 'qudi_data_catalog.sqlite')
+
+
+def _nametag_from_path(file_path: str) -> Optional[str]:
+    match = _FILENAME_REGEX.match(os.path.basename(file_path))
+    return match.group(1) if match else None
+
+
+def _split_value(value: Any) -> Tuple[Optional[float], Optional[str], str]:
+    """Helper to convert a metadata value into the columns (num_value, str_value, repr_value).
+    """
+    if isinstance(value, str):
+        return None, value, repr(value)
+    try:
+        num_value = float(value)
+    except (TypeError, ValueError):
+        num_value = None
+    return num_value, None, repr(value)
+
+
+def read_catalog_info(file_path: str) -> Optional[Tuple[str, Optional[datetime], str,
+                                                         Dict[str, Any], float, int]]:
+    """Reads the catalog information of a single qudi data file or store.
+    Returns None if the path is not a readable qudi data file.
+
+    Returns
+    -------
+    tuple
+        file path (str), timestamp (datetime.datetime), storage class name (str), metadata (dict),
+        modification time (float), size in bytes (int)
+    """
+    try:
+        stat = os.stat(file_path)
+        if os.path.isdir(file_path):
+            if not file_path.endswith('.qchunks'):
+                return None
+            metadata, general = ChunkedArrayDataStorage.load_metadata(file_path)
+            storage = ChunkedArrayDataStorage.__name__
+        elif file_path.endswith(('.npy', '.qnpy')):
+            metadata, general = NpyDataStorage.load_metadata(file_path)
+            storage = NpyDataStorage.__name__
+        elif file_path.endswith('.npz'):
+            metadata, general = NpzDataStorage.load_metadata(file_path)
+            storage = NpzDataStorage.__name__
+        elif file_path.endswith(('.h5', '.hdf5')):
+            metadata, general = Hdf5DataStorage.load_metadata(file_path)
+            storage = Hdf5DataStorage.__name__
+        elif file_path.endswith('_metadata.txt') or file_path.endswith(_IGNORED_EXTENSIONS):
+            return None
+        else:
+            general, metadata, _ = get_info_from_file(file_path)
+            storage = 'CsvDataStorage' if general['delimiter'] == ',' else 'TextDataStorage'
+    except Exception:
+        return None
+    return file_path, general.get('timestamp', None), storage, metadata, stat.st_mtime, stat.st_size
+
+
+class DataCatalog:
+    """SQLite based catalog of qudi data files.
+    Indexes file path, timestamp, nametag, storage class and metadata of each data file and provides
+    queries on metadata values and time ranges.
+
+    Metadata keys are handled in lower case since qudi data file headers do not preserve case.
+    All methods are thread-safe.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        db_path : str, optional
+            File path of the SQLite database. Created if it does not exist. Defaults to
+            get_default_catalog_path().
+        """
+        self.db_path = get_default_catalog_path() if db_path is None else db_path
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = Mutex()
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA foreign_keys=ON')
+            self._connection.executescript(_SCHEMA)
+            self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def _insert(self, file_path: str, timestamp: Optional[datetime], nametag: Optional[str],
+                storage: Optional[str], metadata: Optional[Mapping[str, Any]],
+                mtime: Optional[float], size: Optional[int]) -> None:
+        """Insert or replace a single file entry. Must be called with the lock held.
+        """
+        cursor = self._connection.execute('DELETE FROM files WHERE path = ?', (file_path,))
+        cursor.execute(
+            'INSERT INTO files (path, timestamp, nametag, storage, mtime, size) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (file_path,
+             None if timestamp is None else timestamp.timestamp(),
+             nametag,
+             storage,
+             mtime,
+             size)
+        )
+        file_id = cursor.lastrowid
+        if metadata:
+            cursor.executemany(
+                'INSERT OR REPLACE INTO metadata (file_id, key, num_value, str_value, repr_value) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(file_id, str(key).lower(), *_split_value(value))
+                 for key, value in metadata.items()]
+            )
+
+    def add(self, file_path: str, timestamp: Optional[datetime] = None,
+            metadata: Optional[Mapping[str, Any]] = None, nametag: Optional[str] = None,
+            storage: Optional[str] = None) -> None:
+        """Add (or update) a single data file to the catalog.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the data file.
+        timestamp : datetime.datetime, optional
+            Timestamp of the data file.
+        metadata : dict, optional
+            Metadata saved with the data file.
+        nametag : str, optional
+            Nametag of the data file. Derived from the file name if omitted.
+        storage : str, optional
+            Name of the storage class used to save the file.
+        """
+        file_path = os.path.abspath(file_path)
+        if nametag is None:
+            nametag = _nametag_from_path(file_path)
+        try:
+            stat = os.stat(file_path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            mtime = size = None
+        with self._lock:
+            try:
+                self._insert(file_path, timestamp, nametag, storage, metadata, mtime, size)
+                self._connection.commit()
+            except:
+                self._connection.rollback()
+                raise
+
+    def remove(self, file_paths: Iterable[str]) -> None:
+        """Remove data files from the catalog. Paths not in the catalog are ignored.
+        """
+        with self._lock:
+            self._connection.executemany('DELETE FROM files WHERE path = ?',
+                                         [(os.path.abspath(path),) for path in file_paths])
+            self._connection.commit()
+
+    def scan(self, root_dir: str, workers: Optional[int] = None, rebuild: bool = False,
+             remove_missing: bool = True) -> int:
+        """Walk a data directory tree and add all qudi data files to the catalog. Headers are
+        parsed in parallel in a process pool. Files already in the catalog with unchanged
+        modification time and size are skipped unless rebuild is True.
+
+        Parameters
+        ----------
+        root_dir : str
+            Root directory to scan recursively, e.g. the qudi data root directory.
+        workers : int, optional
+            Number of worker processes. Defaults to the number of CPUs.
+        rebuild : bool, optional
+            Flag indicating whether to re-read all files regardless of their catalog state.
+        remove_missing : bool, optional
+            Flag indicating whether to remove catalog entries of files in root_dir that no longer
+            exist.
+
+        Returns
+        -------
+        int
+            Number of files added or updated.
+        """
+        root_dir = os.path.abspath(root_dir)
+        candidates = dict()
+        for dir_path, dir_names, file_names in os.walk(root_dir):
+            for dir_name in list(dir_names):
+                if dir_name.endswith('.qchunks'):
+                    dir_names.remove(dir_name)
+                    file_names.append(dir_name)
+            for file_name in file_names:
+                if file_name.endswith('_metadata.txt') or file_name.endswith(_IGNORED_EXTENSIONS):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                candidates[path] = (stat.st_mtime, stat.st_size)
+
+        # Exact prefix match, LIKE would treat "_" and "%" in directory names as wildcards
+        prefix = os.path.join(root_dir, '')
+        with self._lock:
+            known = {path: (mtime, size) for path, mtime, size in self._connection.execute(
+                'SELECT path, mtime, size FROM files WHERE substr(path, 1, ?) = ?',
+                (len(prefix), prefix)
+            )}
+            if remove_missing:
+                missing = [(path,) for path in known if path not in candidates]
+                self._connection.executemany('DELETE FROM files WHERE path = ?', missing)
+                self._connection.commit()
+        if not rebuild:
+            candidates = {path: info for path, info in candidates.items() if known.get(path) != info}
+        if not candidates:
+            return 0
+
+        paths = sorted(candidates)
+        if workers == 1 or len(paths) < 64:
+            infos = map(read_catalog_info, paths)
+            return self._insert_infos(infos)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            infos = executor.map(read_catalog_info, paths, chunksize=64)
+            return self._insert_infos(infos)
+
+    def _insert_infos(self, infos: Iterable[Optional[tuple]]) -> int:
+        count = 0
+        with self._lock:
+            try:
+                for info in infos:
+                    if info is None:
+                        continue
+                    path, timestamp, storage, metadata, mtime, size = info
+                    self._insert(path, timestamp, _nametag_from_path(path), storage, metadata,
+                                 mtime, size)
+                    count += 1
+                self._connection.commit()
+            except:
+                self._connection.rollback()
+                raise
+        return count
+
+    def query(self, *, nametag: Optional[str] = None, start: Optional[datetime] = None,
+              end: Optional[datetime] = None, root_dir: Optional[str] = None,
+              storage: Optional[str] = None,
+              metadata: Optional[Mapping[str, Any]] = None) -> List[CatalogEntry]:
+        """Query data files by nametag, time range, location, storage class and metadata values.
+        All given criteria must be fulfilled.
+
+        Parameters
+        ----------
+        nametag : str, optional
+            Nametag of the data files. SQL wildcards "%" and "_" are allowed.
+        start : datetime.datetime, optional
+            Earliest timestamp (inclusive).
+        end : datetime.datetime, optional
+            Latest timestamp (exclusive).
+        root_dir : str, optional
+            Only return files located in this directory (recursively).
+        storage : str, optional
+            Name of the storage class used to save the files.
+        metadata : dict, optional
+            Metadata conditions. Each key maps to either a value (equality) or a tuple of operator
+            and value, with operators "==", "!=", "<", "<=", ">", ">=" and "like", e.g.
+            {'laser_power': ('>', 1e-3), 'sample': 'xyz'}
+
+        Returns
+        -------
+        list
+            CatalogEntry for each matching data file sorted by timestamp.
+        """
+        clauses = list()
+        params = list()
+        if nametag is not None:
+            clauses.append('f.nametag LIKE ?')
+            params.append(nametag)
+        if start is not None:
+            clauses.append('f.timestamp >= ?')
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append('f.timestamp < ?')
+            params.append(end.timestamp())
+        if root_dir is not None:
+            prefix = os.path.join(os.path.abspath(root_dir), '')
+            clauses.append('substr(f.path, 1, ?) = ?')
+            params.extend((len(prefix), prefix))
+        if storage is not None:
+            clauses.append('f.storage = ?')
+            params.append(storage)
+        for key, condition in (metadata or dict()).items():
+            if isinstance(condition, tuple) and len(condition) == 2 and condition[0] in _OPERATORS:
+                operator, value = condition
+            else:
+                operator, value = '==', condition
+            if isinstance(value, str):
+                column = 'm.str_value'
+            elif isinstance(value, (int, float)):
+                column = 'm.num_value'
+            else:
+                column, value = 'm.repr_value', repr(value)
+            clauses.append(f'EXISTS (SELECT 1 FROM metadata m WHERE m.file_id = f.id AND '
+                           f'm.key = ? AND {column} {_OPERATORS[operator]} ?)')
+            params.extend((str(key).lower(), value))
+        sql = 'SELECT f.path, f.timestamp, f.nametag, f.storage FROM files f'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY f.timestamp'
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [CatalogEntry(path,
+                             None if timestamp is None else datetime.fromtimestamp(timestamp),
+                             tag,
+                             storage_name) for path, timestamp, tag, storage_name in rows]
+
+    def get_metadata(self, file_path: str) -> Dict[str, Any]:
+        """Return the cataloged metadata of a single data file.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT m.key, m.str_value, m.repr_value FROM metadata m '
+                'JOIN files f ON f.id = m.file_id WHERE f.path = ?',
+                (os.path.abspath(file_path),)
+            ).fetchall()
+        metadata = dict()
+        for key, str_value, repr_value in rows:
+            if str_value is not None:
+                metadata[key] = str_value
+                continue
+            try:
+                metadata[key] = parse_metadata_value(repr_value)
+            except ValueError:
+                metadata[key] = repr_value
+        return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='qudi-data-catalog',
+                                     description='Scan qudi data directories and update the data '
+                                                 'catalog.')
+    parser.add_argument('root_dir',
+                        nargs='?',
+                        default=None,
+                        help='Data root directory to scan. Defaults to the qudi default data dir.')
+    parser.add_argument('--db',
+                        default=None,
+                        help='Path to the catalog database. Defaults to '
+                             '"<root_dir>/qudi_data_catalog.sqlite".')
+    parser.add_argument('-j',
+                        '--workers',
+                        type=int,
+                        default=None,
+                        help='Number of worker processes to parse file headers.')
+    parser.add_argument('--rebuild',
+                        action='store_true',
+                        help='Re-read all files even if they are unchanged.')
+    args = parser.parse_args()
+
+    root_dir = get_default_data_dir() if args.root_dir is None else args.root_dir
+    db_path = get_default_catalog_path(root_dir) if args.db is None else args.db
+    with DataCatalog(db_path) as catalog:
+        count = catalog.scan(root_dir, workers=args.workers, rebuild=args.rebuild)
+        print(f'Updated {count:d} catalog entries in "{db_path}" ({len(catalog):d} in total).')
+
+
+if __name__ == '__main__':
+    main()
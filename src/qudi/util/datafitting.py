@@ -20,55 +20,142 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-__all__ = ('is_fit_model', 'get_all_fit_models', 'FitConfiguration', 'FitConfigurationsModel',
-           'FitContainer')
+__all__ = ('is_fit_model', 'get_all_fit_models', 'get_fit_model_names', 'FitConfiguration',
+           'FitConfigurationsModel', 'FitContainer')
 
+import ast
 import importlib
 import logging
 import inspect
-import lmfit
 import numpy as np
 from PySide6 import QtCore
-from typing import Iterable, Optional, Mapping, Union
+from collections.abc import Mapping as _Mapping
+from typing import TYPE_CHECKING, Iterable, Optional, Mapping, Union
 
 import qudi.util.fit_models as _fit_models_ns
 from qudi.util.mutex import Mutex
 from qudi.util.units import create_formatted_output
 from qudi.util.helpers import iter_modules_recursive
-from qudi.util.fit_models.model import FitModelBase
+
+if TYPE_CHECKING:
+    import lmfit
 
 
 _log = logging.getLogger(__name__)
 
 
 def is_fit_model(cls):
+    from qudi.util.fit_models.model import FitModelBase
     return inspect.isclass(cls) and issubclass(cls, FitModelBase) and (cls is not FitModelBase)
 
 
-# Upon import of this module the global attribute _fit_models is initialized with a dict
-# containing all importable fit model objects with names as keys.
-_fit_models = dict()
-for mod_finder in iter_modules_recursive(_fit_models_ns.__path__, _fit_models_ns.__name__ + '.'):
-    try:
-        _fit_models.update(
-            {name: cls for name, cls in
-             inspect.getmembers(importlib.import_module(mod_finder.name), is_fit_model)}
-        )
-    except:
-        _log.exception(
-            f'Exception while importing qudi.util.fit_models sub-module "{mod_finder.name}":'
-        )
+class _FitModelRegistry(_Mapping):
+    """Read-only mapping of fit model names to fit model classes found in qudi.util.fit_models.
+
+    Fit model names are discovered by statically parsing the sub-module sources for subclasses of
+    FitModelBase. The sub-modules (and with them lmfit and scipy) are only imported upon first
+    access of a fit model class.
+    """
+
+    def __init__(self):
+        self._lock = Mutex()
+        self._module_names = None  # model name -> module name
+        self._models = dict()
+
+    def _discover(self):
+        if self._module_names is not None:
+            return self._module_names
+        class_bases = list()
+        for mod_finder in iter_modules_recursive(_fit_models_ns.__path__,
+                                                 _fit_models_ns.__name__ + '.'):
+            try:
+                spec = mod_finder.module_finder.find_spec(mod_finder.name)
+                with open(spec.origin, 'r', encoding='utf-8') as file:
+                    tree = ast.parse(file.read(), filename=spec.origin)
+            except:
+                _log.exception(f'Exception while parsing qudi.util.fit_models sub-module '
+                               f'"{mod_finder.name}":')
+                continue
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    bases = {base.attr if isinstance(base, ast.Attribute) else base.id
+                             for base in node.bases if isinstance(base, (ast.Name, ast.Attribute))}
+                    class_bases.append((mod_finder.name, node.name, bases))
+        # Collect all (indirect) subclasses of FitModelBase
+        module_names = dict()
+        base_names = {'FitModelBase'}
+        found_new = True
+        while found_new:
+            found_new = False
+            for module_name, class_name, bases in class_bases:
+                if class_name not in base_names and not bases.isdisjoint(base_names):
+                    base_names.add(class_name)
+                    module_names.setdefault(class_name, module_name)
+                    found_new = True
+        self._module_names = dict(sorted(module_names.items()))
+        return self._module_names
+
+    def __getitem__(self, name):
+        with self._lock:
+            try:
+                return self._models[name]
+            except KeyError:
+                pass
+            module_name = self._discover()[name]
+            try:
+                model = getattr(importlib.import_module(module_name), name)
+            except:
+                _log.exception(f'Exception while importing qudi.util.fit_models sub-module '
+                               f'"{module_name}":')
+                raise KeyError(name) from None
+            if not is_fit_model(model):
+                raise KeyError(name)
+            self._models[name] = model
+            return model
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._discover()
+
+    def __iter__(self):
+        with self._lock:
+            return iter(tuple(self._discover()))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._discover())
+
+    def items(self):
+        # Skip fit models failing to import
+        items = list()
+        for name in self:
+            try:
+                items.append((name, self[name]))
+            except KeyError:
+                pass
+        return items
+
+
+# Registry of all fit models found in qudi.util.fit_models with names as keys. Fit model
+# sub-modules are imported on first use.
+_fit_models = _FitModelRegistry()
+
+
+def get_fit_model_names():
+    """Returns the names of all available fit models without importing them.
+    """
+    return tuple(_fit_models)
 
 
 def get_all_fit_models():
-    return _fit_models.copy()
+    return dict(_fit_models.items())
 
 
 class FitConfiguration:
     """
     """
 
-    def __init__(self, name: str, model: str, estimator: Optional[str] = None, custom_parameters: Optional[lmfit.Parameters] = None):
+    def __init__(self, name: str, model: str, estimator: Optional[str] = None, custom_parameters: Optional['lmfit.Parameters'] = None):
         assert isinstance(name, str), 'FitConfiguration name must be str type.'
         assert name, 'FitConfiguration name must be non-empty string.'
         assert model in _fit_models, f'Invalid fit model name encountered: "{model}".'
@@ -107,15 +194,19 @@ class FitConfiguration:
     @property
     def default_parameters(self):
         params = _fit_models[self._model]().make_params()
-        return lmfit.Parameters() if params is None else params
+        if params is None:
+            import lmfit
+            return lmfit.Parameters()
+        return params
 
     @property
     def custom_parameters(self):
         return self._custom_parameters.copy() if self._custom_parameters is not None else None
 
     @custom_parameters.setter
-    def custom_parameters(self, value: Union[lmfit.Parameters, None]):
+    def custom_parameters(self, value: Union['lmfit.Parameters', None]):
         if value is not None:
+            import lmfit
             default_params = self.default_parameters
             invalid = set(value).difference(default_params)
             assert not invalid, f'Invalid model parameters encountered: {invalid}'
@@ -135,6 +226,7 @@ class FitConfiguration:
     def from_dict(cls, dict_repr):
         assert set(dict_repr) == {'name', 'model', 'estimator', 'custom_parameters'}
         if isinstance(dict_repr['custom_parameters'], str):
+            import lmfit
             dict_repr['custom_parameters'] = lmfit.Parameters().loads(
                 dict_repr['custom_parameters']
             )
@@ -173,7 +265,7 @@ class FitConfigurationsModel(QtCore.QAbstractListModel):
         return self._fit_configurations.copy()
 
     @QtCore.Slot(str, str)
-    def add_configuration(self, name: str, model: str, estimator: Optional[str] = None, custom_parameters: Optional[lmfit.Parameters] = None):
+    def add_configuration(self, name: str, model: str, estimator: Optional[str] = None, custom_parameters: Optional['lmfit.Parameters'] = None):
         assert name not in self.configuration_names, f'Fit config "{name}" already defined.'
         assert name != 'No Fit', '"No Fit" is a reserved name for fit configs. Choose another.'
         config = FitConfiguration(name, model, estimator, custom_parameters)
@@ -349,7 +441,7 @@ class FitContainer(QtCore.QObject):
             return '', None
 
     @staticmethod
-    def formatted_result(fit_result: Union[None, lmfit.model.ModelResult],
+    def formatted_result(fit_result: Union[None, 'lmfit.model.ModelResult'],
                          parameters_units: Optional[Mapping[str, str]] = None) -> str:
         if fit_result is None:
             return ''
@@ -368,7 +460,7 @@ class FitContainer(QtCore.QObject):
         return create_formatted_output(parameters_to_format)
 
     @staticmethod
-    def dict_result(fit_result: Union[None, lmfit.model.ModelResult],
+    def dict_result(fit_result: Union[None, 'lmfit.model.ModelResult'],
                     parameters_units: Optional[Mapping[str, str]] = None,
                     export_keys: Optional[Iterable[str]] = ('value', 'stderr')) -> dict:
         if fit_result is None:
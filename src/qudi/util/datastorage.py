@@ -22,28 +22,65 @@ If not, see <https://www.gnu.org/licenses/>.
 
 __all__ = ('get_timestamp_filename', 'format_column_headers', 'format_header',
            'metadata_to_str_dict', 'str_dict_to_metadata', 'get_header_from_file',
-           'get_info_from_header', 'CsvDataStorage', 'create_dir_for_file', 'DataStorageBase',
-           'ImageFormat', 'NpyDataStorage', 'TextDataStorage')
+           'get_info_from_header', 'get_info_from_file', 'parse_metadata_value',
+           'iter_text_data_blocks', 'load_text_data', 'CsvDataStorage', 'create_dir_for_file',
+           'DataStorageBase', 'ImageFormat', 'NpyDataStorage', 'NpzDataStorage', 'TextDataStorage',
+           'Hdf5DataStorage', 'TextDataStream', 'AsyncSaveQueue', 'ThumbnailRenderer',
+           'ChunkedArrayDataStorage')
 
 import os
 import re
+import ast
+import bz2
+import lzma
+import zlib
 import copy
+import json
+import time
+import atexit
+import itertools
+import pickle
+import weakref
+import functools
+import zipfile
+import threading
+import multiprocessing
 import numpy as np
-import matplotlib.pyplot as plt
 import importlib
+import logging
 
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from collections import OrderedDict
+from collections.abc import Mapping
 from abc import ABCMeta, abstractmethod
-from matplotlib.backends.backend_pdf import PdfPages
-from configparser import ConfigParser
+from configparser import DuplicateOptionError
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import wait as wait_for_futures
 from io import StringIO
 
 from qudi.util.mutex import Mutex
+from qudi.util.atomicfile import atomic_open
 from qudi.util.helpers import is_string_type, is_integer_type, is_float_type, is_complex_type
 from qudi.util.helpers import is_string, is_integer, is_float, is_complex, is_number
 
 
+_log = logging.getLogger(__name__)
+
+
+# Heavy (and optional) dependencies are imported on first use in order to keep the import of this
+# module cheap for users only interested in e.g. text files.
+def _import_h5py():
+    """Returns the h5py module. Raises ImportError if the optional dependency is not installed.
+    """
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError('Hdf5DataStorage requires the optional dependency "h5py" to be '
+                          'installed.') from None
+    return h5py
+
+
 class ImageFormat(Enum):
     """Image format to use for saving data thumbnails."""
 
@@ -90,29 +127,194 @@ def format_column_headers(column_headers, delimiter=';;'):
 
 def metadata_to_str_dict(metadata):
     if metadata:
-        return {str(param): repr(value) for param, value in metadata.items()}
+        # Value strings of global metadata are formatted only once per global metadata snapshot
+        snapshot = DataStorageBase.get_global_metadata_snapshot()
+        return {str(param): snapshot.get_repr(param, value) for param, value in metadata.items()}
     return dict()
 
 
-def str_dict_to_metadata(str_dict):
+def _literal_dtype(node):
+    """Helper to convert the AST node of a "dtype" keyword argument into a numpy dtype.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return np.dtype(node.value)
+    if isinstance(node, ast.Name):
+        name = node.id
+    elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and \
+            node.value.id in ('np', 'numpy'):
+        name = node.attr
+    else:
+        raise ValueError('Unsupported dtype specifier.')
+    if name in ('int', 'float', 'complex', 'bool', 'str'):
+        return np.dtype(name)
+    dtype = getattr(np, name, None)
+    if isinstance(dtype, type) and issubclass(dtype, np.generic):
+        return np.dtype(dtype)
+    raise ValueError(f'Unsupported dtype specifier "{name}".')
+
+
+def _literal_callable(node):
+    """Helper to resolve the callable of an AST Call node to one of the few allowed constructors
+    (numpy arrays and scalars, datetime objects).
+    """
+    if isinstance(node, ast.Name):
+        module, name = None, node.id
+    elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        module, name = node.value.id, node.attr
+    else:
+        raise ValueError('Unsupported callable.')
+    if name == 'array' and module in (None, 'np', 'numpy'):
+        return np.array
+    if module in ('np', 'numpy'):
+        obj = getattr(np, name, None)
+        if isinstance(obj, type) and issubclass(obj, np.generic):
+            return obj
+    elif module in (None, 'datetime'):
+        obj = {'datetime': datetime, 'date': date, 'timedelta': timedelta}.get(name, None)
+        if obj is not None:
+            return obj
+    raise ValueError(f'Unsupported callable "{name}".')
+
+
+def _literal_from_node(node):
+    """Helper to safely evaluate an AST node consisting only of literals, containers, numpy array
+    and scalar constructors and datetime constructors.
+    """
+    if isinstance(node, ast.Constant):
+        if node.value is Ellipsis:
+            raise ValueError('Ellipsis is not supported.')
+        return node.value
+    if isinstance(node, ast.Tuple):
+        return tuple(_literal_from_node(elt) for elt in node.elts)
+    if isinstance(node, ast.List):
+        return [_literal_from_node(elt) for elt in node.elts]
+    if isinstance(node, ast.Set):
+        return {_literal_from_node(elt) for elt in node.elts}
+    if isinstance(node, ast.Dict):
+        if any(key is None for key in node.keys):
+            raise ValueError('Dict unpacking is not supported.')
+        return {_literal_from_node(key): _literal_from_node(value)
+                for key, value in zip(node.keys, node.values)}
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _literal_from_node(node.operand)
+        if isinstance(operand, (int, float, complex)) and not isinstance(operand, bool):
+            return +operand if isinstance(node.op, ast.UAdd) else -operand
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+        # Only allowed for complex numbers like "1+2j"
+        left = _literal_from_node(node.left)
+        right = _literal_from_node(node.right)
+        if isinstance(left, (int, float)) and isinstance(right, complex):
+            return left + right if isinstance(node.op, ast.Add) else left - right
+    elif isinstance(node, ast.Name) and node.id in ('nan', 'inf'):
+        return float(node.id)
+    elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and \
+            node.value.id in ('np', 'numpy') and node.attr in ('nan', 'inf', 'True_', 'False_'):
+        return getattr(np, node.attr)
+    elif isinstance(node, ast.Call):
+        func = _literal_callable(node.func)
+        args = [_literal_from_node(arg) for arg in node.args]
+        kwargs = dict()
+        for keyword in node.keywords:
+            if keyword.arg == 'dtype':
+                kwargs['dtype'] = _literal_dtype(keyword.value)
+            elif keyword.arg is not None and func is not np.array:
+                kwargs[keyword.arg] = _literal_from_node(keyword.value)
+            else:
+                raise ValueError(f'Unsupported keyword argument "{keyword.arg}".')
+        return func(*args, **kwargs)
+    raise ValueError(f'Unsupported expression "{ast.dump(node)}".')
+
+
+def parse_metadata_value(value_str):
+    """Safely convert a metadata value string (created by repr) back into a Python object without
+    using eval. Supports Python literals (numbers, str, bytes, bool, None, tuple, list, dict, set)
+    as well as numpy arrays/scalars and datetime objects. Numbers and lists/arrays containing only
+    numbers are parsed via fast paths.
+
+    Parameters
+    ----------
+    value_str : str
+        The value string to parse.
+
+    Returns
+    -------
+    object
+        The parsed value.
+
+    Raises
+    ------
+    ValueError
+        If the string can not be parsed.
+    """
+    value_str = value_str.strip()
+    if not value_str:
+        raise ValueError('Empty value string can not be parsed.')
+    # Fast path for plain numbers
+    first_char = value_str[0]
+    if first_char.isdigit() or first_char in '+-.' or value_str in ('nan', 'inf'):
+        try:
+            return int(value_str)
+        except ValueError:
+            try:
+                return float(value_str)
+            except ValueError:
+                pass
+    # Fast path for lists and numpy arrays of numbers (without dtype)
+    elif first_char == '[':
+        try:
+            return json.loads(value_str)
+        except ValueError:
+            pass
+    elif value_str.startswith('array(') and value_str.endswith(')'):
+        try:
+            return np.array(json.loads(value_str[6:-1]))
+        except ValueError:
+            pass
+    try:
+        return _literal_from_node(ast.parse(value_str, mode='eval').body)
+    except (SyntaxError, TypeError, ValueError, RecursionError) as err:
+        raise ValueError(f'Unable to parse metadata value string "{value_str}"') from err
+
+
+def _eval_metadata_value(value_str):
+    """Helper to convert a metadata value string into a Python object via eval.
+    Modules of unknown names are dynamically imported. Returns the string itself on failure.
+    """
+    try:
+        return eval(value_str)
+    except NameError as e:
+        match = re.match(r"name '(\w+)' is not defined", str(e))
+        if match:
+            missing_name = match.group(1)
+            try:
+                modules = {}
+                modules[missing_name] = importlib.import_module(missing_name)
+                return eval(value_str, modules)
+            except Exception:
+                return value_str
+        return value_str
+    except Exception:
+        return value_str
+
+
+def str_dict_to_metadata(str_dict, allow_eval=False):
+    """Convert a dict of metadata value strings into a dict of metadata values.
+    Values are parsed with parse_metadata_value. Values that can not be parsed are kept as strings.
+    If allow_eval is True, those value strings are evaluated instead (importing modules for unknown
+    names if needed). This eval fallback is unsafe for untrusted files and deprecated.
+    """
     metadata = dict()
     for param, value in str_dict.items():
         try:
-            metadata[param] = eval(value)
-        except NameError as e:
-            match = re.match(r"name '(\w+)' is not defined", str(e))
-            if match:
-                missing_name = match.group(1)
-                try:
-                    modules = {}
-                    modules[missing_name] = importlib.import_module(missing_name)
-                    metadata[param] = eval(value, modules)
-                except Exception as e:
-                    metadata[param] = value
+            metadata[param] = parse_metadata_value(value)
+        except ValueError:
+            if allow_eval:
+                _log.warning(f'Metadata value "{param}" can not be parsed as literal and is '
+                             f'evaluated instead. Evaluating metadata values is deprecated and '
+                             f'will be removed in a future release.')
+                metadata[param] = _eval_metadata_value(value)
             else:
                 metadata[param] = value
-        except Exception:
-            metadata[param] = value
     return metadata
 
 
@@ -184,14 +386,40 @@ def _is_1d_array(array):
         raise ValueError('Checking if empty array is 1D is not allowed.')
 
 
+_INTERPOLATION_REGEX = re.compile(r'%\(([^)]+)\)s')
+
+
+def _format_config_section(name, str_dict):
+    """Helper to format a section of key-value string pairs into lines of INI text.
+    Produces the same output (and errors) as configparser.ConfigParser (with "=" delimiter and no
+    spaces around delimiters) without its overhead, i.e. keys are converted to lower case and
+    multi-line values are continued by indented lines.
+    """
+    lines = [f'[{name}]']
+    keys = set()
+    for key, value in str_dict.items():
+        key = str(key).lower()
+        value = str(value)
+        if key in keys:
+            raise DuplicateOptionError(name, key, '<dict>')
+        keys.add(key)
+        position = _INTERPOLATION_REGEX.sub('', value.replace('%%', '')).find('%')
+        if position >= 0:
+            raise ValueError(f'invalid interpolation syntax in {value!r} at position {position:d}')
+        if '\n' in value:
+            lines.extend(f'{key}={value}'.replace('\n', '\n\t').splitlines())
+        else:
+            lines.append(f'{key}={value}')
+    lines.append('')
+    return lines
+
+
 def format_header(timestamp, number_format=None, metadata=None, notes=None, column_dtypes=None,
                   column_headers=None, comments=None, delimiter=None):
     """
     """
     if comments is None:
         comments = ''
-    # Collect all data to include in the header into a config parser
-    config = ConfigParser(comment_prefixes=None, delimiters=('=',))
 
     # write general section
     general_dict = {'timestamp': timestamp.isoformat()}
@@ -218,18 +446,11 @@ def format_header(timestamp, number_format=None, metadata=None, notes=None, colu
         general_dict['column_headers'] = repr(format_column_headers(column_headers))
     if notes:
         general_dict['notes'] = repr(notes)
-    config['General'] = general_dict
+    header_lines = _format_config_section('General', general_dict)
 
     # Write user metadata section
     if metadata:
-        config['Metadata'] = metadata_to_str_dict(metadata)
-
-    # Write config to string buffer instead of a temporary file
-    buffer = StringIO()
-    config.write(buffer, space_around_delimiters=False)
-    buffer.seek(0)
-    header_lines = buffer.read().splitlines()
-    buffer.close()
+        header_lines.extend(_format_config_section('Metadata', metadata_to_str_dict(metadata)))
 
     # Include comment specifiers at the beginning of each line
     # Also add an "end header" marker for easier custom header parsing
@@ -238,43 +459,102 @@ def format_header(timestamp, number_format=None, metadata=None, notes=None, colu
     return f'{comments}{line_sep.join(header_lines)}\n'
 
 
+_HEADER_END_MARKER = '---- END HEADER ----'
+
+
 def get_header_from_file(file_path):
-    offset = 0
-    comments = None
+    """Read the header of a qudi data file in a single pass, stopping at the end header marker.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to read the header from.
+
+    Returns
+    -------
+    str
+        Header text with comment specifiers removed.
+    int
+        Number of header lines (excluding the end header marker line).
+    """
+    header_lines = list()
     with open(file_path, 'r') as file:
         for line in file:
             # Determine comments specifier (if there is any)
-            if line.endswith('---- END HEADER ----\n'):
-                comments = line.rsplit('---- END HEADER ----', 1)[0]
+            if line.endswith(f'{_HEADER_END_MARKER}\n'):
+                comments = line.rsplit(_HEADER_END_MARKER, 1)[0]
                 break
-            offset += len(line)
-        file.seek(0)
-        if comments is None:
+            header_lines.append(line)
+        else:
             raise RuntimeError(
                 'Qudi data file is missing "---- END HEADER ----" marker. File was probably not '
                 'created by the same qudi.util.datastorage.<storage class> helper object'
             )
-        header_lines = file.read(offset).splitlines()
     line_start = len(comments)
-    return '\n'.join(line[line_start:] for line in header_lines), len(header_lines)
+    header = '\n'.join(line[line_start:].rstrip('\n') for line in header_lines)
+    return header, len(header_lines)
 
 
-def get_info_from_header(header):
+def _parse_header_sections(header):
+    """Helper to split a header (INI format as written by format_header) into sections of raw
+    key-value string pairs. Behaves like configparser.ConfigParser for headers written by
+    format_header, i.e. keys are converted to lower case and indented lines continue values.
     """
+    sections = dict()
+    section = None
+    values = None
+    for line in header.splitlines():
+        if not line.strip():
+            if values is not None:
+                values.append('')
+            continue
+        if values is not None and line[0].isspace():
+            values.append(line.strip())
+            continue
+        stripped = line.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            section = sections.setdefault(stripped[1:-1], dict())
+            values = None
+            continue
+        key, delimiter, value = line.partition('=')
+        if section is None or not delimiter:
+            raise ValueError(f'Invalid qudi data file header line encountered: "{line}"')
+        values = [value.strip()]
+        section[key.strip().lower()] = values
+    return {name: {key: '\n'.join(values).rstrip() for key, values in section.items()}
+            for name, section in sections.items()}
+
+
+def get_info_from_header(header, allow_eval=False):
+    """Parse a header string (as returned by get_header_from_file) into general header
+    information and user metadata.
+
+    Parameters
+    ----------
+    header : str
+        The header text to parse.
+    allow_eval : bool, optional
+        Flag indicating whether to fall back to eval for metadata values that are not literals
+        (deprecated, default False). If False, such values are returned as strings.
 
+    Returns
+    -------
+    dict
+        General header data.
+    dict
+        User metadata.
     """
-    # Parse header sections
-    config = ConfigParser(comment_prefixes=None, delimiters=('=',))
-    config.read_string(header)
+    sections = _parse_header_sections(header)
 
     # extract and convert general section
-    general = {'timestamp': config.get('General', 'timestamp', raw=True, fallback=None),
-               'comments': config.get('General', 'comments', raw=True, fallback=None),
-               'delimiter': config.get('General', 'delimiter', raw=True, fallback=None),
-               'number_format': config.get('General', 'number_format', raw=True, fallback=None),
-               'column_dtypes': config.get('General', 'column_dtypes', raw=True, fallback=None),
-               'column_headers': config.get('General', 'column_headers', raw=True, fallback=None),
-               'notes': config.get('General', 'notes', raw=True, fallback=None)}
+    general_section = sections.get('General', dict())
+    general = {key: general_section.get(key, None) for key in ('timestamp',
+                                                               'comments',
+                                                               'delimiter',
+                                                               'number_format',
+                                                               'column_dtypes',
+                                                               'column_headers',
+                                                               'notes')}
     if general['timestamp']:
         general['timestamp'] = datetime.fromisoformat(general['timestamp'])
     if general['column_dtypes']:
@@ -286,23 +566,182 @@ def get_info_from_header(header):
         else:
             general['column_dtypes'] = None
     if general['comments']:
-        general['comments'] = eval(general['comments'])
+        general['comments'] = parse_metadata_value(general['comments'])
     if general['delimiter']:
-        general['delimiter'] = eval(general['delimiter'])
+        general['delimiter'] = parse_metadata_value(general['delimiter'])
     if general['notes']:
-        general['notes'] = eval(general['notes'])
+        general['notes'] = parse_metadata_value(general['notes'])
     if general['column_headers']:
-        general['column_headers'] = tuple(eval(general['column_headers']).split(';;'))
+        general['column_headers'] = tuple(
+            parse_metadata_value(general['column_headers']).split(';;')
+        )
 
     # extract metadata
-    if config.has_section('Metadata'):
-        metadata_str_dict = dict(config.items('Metadata', raw=True))
-        metadata = str_dict_to_metadata(metadata_str_dict)
-    else:
-        metadata = dict()
+    metadata = str_dict_to_metadata(sections.get('Metadata', dict()), allow_eval=allow_eval)
     return general, metadata
 
 
+_header_cache = OrderedDict()
+_header_cache_lock = Mutex()
+_header_cache_size = 1024
+
+
+def get_info_from_file(file_path):
+    """Read and parse the header of a qudi data file. Parsed headers are cached (keyed by file
+    path, modification time and file size), so repeatedly reading the header of unchanged files is
+    cheap.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to read the header from.
+
+    Returns
+    -------
+    dict
+        General header data.
+    dict
+        User metadata.
+    int
+        Number of header lines (excluding the end header marker line).
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    with _header_cache_lock:
+        info = _header_cache.get(key, None)
+        if info is not None:
+            _header_cache.move_to_end(key)
+    if info is None:
+        header, header_lines = get_header_from_file(file_path)
+        general, metadata = get_info_from_header(header)
+        info = (general, metadata, header_lines)
+        with _header_cache_lock:
+            _header_cache[key] = info
+            while len(_header_cache) > _header_cache_size:
+                _header_cache.popitem(last=False)
+    # Return copies to protect cached data from being altered by the caller
+    general, metadata, header_lines = copy.deepcopy(info)
+    return general, metadata, header_lines
+
+
+def _parse_text_block(lines, delimiter, column_dtypes):
+    """Helper to convert a list of data lines into a numpy array.
+    Homogeneous numeric data is parsed in a single numpy call into a 2D array. Mixed dtypes result
+    in a 1D structured array with fields "f0", "f1", etc.
+    """
+    rows = None
+    number_of_columns = len(lines[0].split(delimiter))
+    if isinstance(column_dtypes, (tuple, list)):
+        if len(column_dtypes) != number_of_columns:
+            raise ValueError(f'Number of data columns ({number_of_columns:d}) does not match number '
+                             f'of column dtypes in header ({len(column_dtypes):d}).')
+        if all(typ == column_dtypes[0] for typ in column_dtypes):
+            column_dtypes = column_dtypes[0]
+    if column_dtypes is None:
+        column_dtypes = float
+
+    # Homogeneous numeric data
+    if isinstance(column_dtypes, type):
+        if column_dtypes in (int, float):
+            # Fast path: Parse all values at once in C
+            sep = ' ' if delimiter is None else delimiter
+            data = np.fromstring(sep.join(lines), dtype=column_dtypes, sep=sep)
+            if data.size == len(lines) * number_of_columns:
+                return data.reshape(len(lines), number_of_columns)
+        if rows is None:
+            rows = [line.split(delimiter) for line in lines]
+        if any(len(row) != number_of_columns for row in rows):
+            raise ValueError('Inconsistent number of data columns encountered.')
+        if column_dtypes is str:
+            return np.array(rows, dtype=str)
+        return np.array([val.strip() for row in rows for val in row],
+                        dtype=column_dtypes).reshape(len(rows), number_of_columns)
+
+    # Mixed dtypes. Convert each column separately and combine in structured array.
+    if rows is None:
+        rows = [line.split(delimiter) for line in lines]
+    if any(len(row) != number_of_columns for row in rows):
+        raise ValueError('Inconsistent number of data columns encountered.')
+    columns = [np.array(col if typ is str else [val.strip() for val in col], dtype=typ)
+               for col, typ in zip(zip(*rows), column_dtypes)]
+    data = np.empty(len(rows), dtype=[(f'f{ii:d}', col.dtype) for ii, col in enumerate(columns)])
+    for ii, col in enumerate(columns):
+        data[f'f{ii:d}'] = col
+    return data
+
+
+def iter_text_data_blocks(file_path, block_rows=65536, skip_rows=0):
+    """Generator reading a qudi text data file (e.g. created by TextDataStorage) in blocks of rows.
+    The column dtypes, delimiter and comments specifier are taken from the file header.
+    Since only block_rows rows are in memory at a time, this can be used to process files that are
+    larger than the available memory.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to load data from.
+    block_rows : int, optional
+        Maximum number of rows per yielded block.
+    skip_rows : int, optional
+        Number of lines to skip after the header, e.g. 1 for the column headers of csv files.
+
+    Yields
+    ------
+    numpy.ndarray
+        Block of data rows as 2D array (homogeneous dtype) or 1D structured array (mixed dtypes).
+    """
+    if block_rows < 1:
+        raise ValueError('block_rows must be integer value >= 1')
+    general, _, header_lines = get_info_from_file(file_path)
+    comments = general['comments']
+    delimiter = general['delimiter']
+    if delimiter is not None and not delimiter.strip():
+        # Split by any whitespace
+        delimiter = None
+    with open(file_path, 'r') as file:
+        # Skip header including end marker line and additional rows
+        lines_iter = itertools.islice(file, header_lines + 1 + skip_rows, None)
+        while True:
+            lines = list(itertools.islice(lines_iter, block_rows))
+            if not lines:
+                break
+            lines = [line.rstrip('\r\n') for line in lines]
+            lines = [line for line in lines
+                     if line.strip() and not (comments and line.startswith(comments))]
+            if lines:
+                yield _parse_text_block(lines, delimiter, general['column_dtypes'])
+
+
+def load_text_data(file_path, block_rows=65536, skip_rows=0):
+    """Load an entire qudi text data file by reading it in blocks of rows via
+    iter_text_data_blocks. This is usually several times faster than numpy.genfromtxt.
+    Like numpy.genfromtxt, single rows or columns are returned as 1D array.
+
+    For a description of the parameters, see: iter_text_data_blocks
+
+    Returns
+    -------
+    np.ndarray
+        Data as a numpy array.
+    dict
+        User metadata.
+    dict
+        General header data.
+    """
+    general, metadata, _ = get_info_from_file(file_path)
+    blocks = list(iter_text_data_blocks(file_path, block_rows=block_rows, skip_rows=skip_rows))
+    if not blocks:
+        return np.empty(0), metadata, general
+    if blocks[0].dtype.names is None:
+        data = np.concatenate(blocks)
+    else:
+        # str field widths may differ between blocks
+        dtype = [(name, np.result_type(*(block.dtype[name] for block in blocks)))
+                 for name in blocks[0].dtype.names]
+        data = np.concatenate([block.astype(dtype) for block in blocks])
+    return data.squeeze() if data.ndim > 1 else data, metadata, general
+
+
 def create_dir_for_file(file_path):
     """Helper method to create the directory (recursively) for a given file path.
     Will NOT raise an error if the directory already exists.
@@ -315,6 +754,242 @@ def create_dir_for_file(file_path):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
 
+class AsyncSaveQueue:
+    """Bounded background writer executing save jobs in a thread pool.
+    Submitting a job blocks the caller if the maximum number of pending jobs is reached until a slot
+    becomes available (backpressure). Jobs already submitted are always finished before the pool is
+    shut down, also upon interpreter exit.
+    """
+
+    def __init__(self, max_workers=2, max_pending=16):
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of worker threads executing save jobs concurrently.
+        max_pending : int, optional
+            Maximum number of submitted jobs (queued and running) before submit blocks.
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be integer value >= 1')
+        if max_pending < max_workers:
+            raise ValueError('max_pending must be integer value >= max_workers')
+        self._executor = self._create_executor(int(max_workers))
+        self._slots = threading.BoundedSemaphore(int(max_pending))
+        self._pending = set()
+        self._lock = Mutex()
+
+    @staticmethod
+    def _create_executor(max_workers):
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='qudi-datastorage')
+
+    @property
+    def pending(self):
+        """Number of submitted jobs that are not finished yet.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, func, *args, timeout=None, **kwargs):
+        """Submit a callable to be executed in the background.
+
+        Parameters
+        ----------
+        func : callable
+            The job to execute.
+        *args
+            Positional arguments passed to func.
+        timeout : float, optional
+            Maximum time in seconds to wait for a free slot if the queue is full. Waits
+            indefinitely if None (default).
+        **kwargs
+            Keyword arguments passed to func.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future object holding the return value of func once finished.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError('Timed out waiting for a free slot in the background save queue.')
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def wait(self, timeout=None):
+        """Block until all jobs submitted so far are finished.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time in seconds to wait. Waits indefinitely if None (default).
+
+        Returns
+        -------
+        bool
+            True if all jobs have finished, False if the timeout was reached.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait_for_futures(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self, wait=True):
+        """Shut down the thread pool. No new jobs can be submitted afterwards. Already submitted
+        jobs will always be executed.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Flag indicating whether to block until all submitted jobs are finished.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+def _init_thumbnail_worker():
+    """Initializer of thumbnail render worker processes. Selects the non-interactive Agg backend.
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _render_thumbnail(figure, file_path, image_format):
+    """Render a thumbnail image in a worker process.
+
+    Parameters
+    ----------
+    figure : bytes or callable
+        Pickled matplotlib figure or a picklable callable returning a matplotlib figure.
+    file_path : str
+        Full file path of the image to save (including file extension).
+    image_format : str
+        Value of the ImageFormat Enum to save.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    if callable(figure):
+        figure = figure()
+    else:
+        figure = pickle.loads(figure)
+    try:
+        if image_format == ImageFormat.PDF.value:
+            with PdfPages(file_path) as pdf:
+                pdf.savefig(figure, bbox_inches='tight', pad_inches=0.05)
+        else:
+            figure.savefig(file_path, bbox_inches='tight', pad_inches=0.05)
+    finally:
+        plt.close(figure)
+    return file_path
+
+
+class ThumbnailRenderer(AsyncSaveQueue):
+    """Bounded background renderer saving matplotlib figures as thumbnail images in a pool of
+    worker processes using the Agg backend. This keeps rendering (often several 100 ms per figure)
+    off the calling thread and out of the GIL of the qudi main process.
+    Figures are pickled and closed in the calling thread at submit time. Submitting blocks if the
+    maximum number of pending renders is reached. Renders already submitted are always finished
+    before the pool is shut down.
+    """
+
+    def __init__(self, max_workers=2, max_pending=8):
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of worker processes rendering concurrently.
+        max_pending : int, optional
+            Maximum number of submitted renders (queued and running) before submit blocks.
+        """
+        super().__init__(max_workers=max_workers, max_pending=max_pending)
+
+    @staticmethod
+    def _create_executor(max_workers):
+        # Do not fork the (possibly Qt GUI) parent process
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_thumbnail_worker)
+
+    def submit_figure(self, mpl_figure, file_path, image_format=ImageFormat.PNG, timeout=None):
+        """Submit a figure to be rendered and saved in the background.
+
+        Parameters
+        ----------
+        mpl_figure : matplotlib.figure.Figure or callable
+            The matplotlib figure object to save as image. Alternatively a picklable callable
+            without arguments (e.g. functools.partial of a module-level function) that creates the
+            figure in the worker process.
+        file_path : str
+            Full file path of the image (including file extension).
+        image_format : ImageFormat, optional
+            Image file format Enum to save.
+        timeout : float, optional
+            Maximum time in seconds to wait for a free slot if too many renders are pending.
+            Waits indefinitely if None (default).
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future resolving to the full file path of the saved image.
+        """
+        if callable(mpl_figure):
+            figure = mpl_figure
+        else:
+            import matplotlib.pyplot as plt
+            figure = pickle.dumps(mpl_figure)
+            plt.close(mpl_figure)
+        return self.submit(_render_thumbnail, figure, file_path, image_format.value,
+                           timeout=timeout)
+
+
+class _MetadataSnapshot(Mapping):
+    """Immutable snapshot of the global metadata. A new snapshot with incremented version is
+    published by DataStorageBase upon each change of the global metadata, so readers can use a
+    snapshot without locking or copying.
+    """
+    __slots__ = ('_metadata', '_reprs', 'version')
+
+    def __init__(self, metadata, version):
+        self._metadata = metadata
+        self._reprs = dict()
+        self.version = version
+
+    def get_repr(self, key, value):
+        """Returns repr(value). If value is the global metadata value for key, the string is cached
+        for the lifetime of this snapshot.
+        """
+        if self._metadata.get(key, None) is not value:
+            return repr(value)
+        try:
+            return self._reprs[key]
+        except KeyError:
+            value_repr = self._reprs[key] = repr(value)
+            return value_repr
+
+    def __getitem__(self, key):
+        return self._metadata[key]
+
+    def __iter__(self):
+        return iter(self._metadata)
+
+    def __len__(self):
+        return len(self._metadata)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._metadata!r}, version={self.version:d})'
+
+
 class DataStorageBase(metaclass=ABCMeta):
     """Base helper class to store/load (measurement)data to/from disk.
     Subclasses handle saving and loading of measurement data (including metadata) for specific file
@@ -327,8 +1002,14 @@ class DataStorageBase(metaclass=ABCMeta):
     If the storage type is file based and root_dir is not initialized, each call to save_data must
     provide the full save path information and not just a file name or name tag.
     """
-    _global_metadata = dict()
-    _global_metadata_lock = Mutex()
+    _global_metadata = _MetadataSnapshot(dict(), 0)
+    _global_metadata_lock = Mutex()  # Only serializes updates of global metadata
+    _async_queue = None
+    _async_queue_lock = Mutex()
+    _data_catalog = None
+    _resolved_dir = None
+    _thumbnail_renderer = None
+    _thumbnail_renderer_lock = Mutex()
 
     def __init__(self, *, root_dir=None, include_global_metadata=True,
                  image_format=ImageFormat.PNG):
@@ -366,6 +1047,9 @@ class DataStorageBase(metaclass=ABCMeta):
         str
             Full absolute path of the saved image.
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_pdf import PdfPages
+
         file_path += self.image_format.value
 
         if self.image_format is ImageFormat.PDF:
@@ -380,6 +1064,194 @@ class DataStorageBase(metaclass=ABCMeta):
         plt.close(mpl_figure)
         return file_path
 
+    @classmethod
+    def set_data_catalog(cls, catalog):
+        """Set a data catalog (e.g. qudi.util.datacatalog.DataCatalog) to register all files
+        created by any storage instance with. Pass None to disable cataloging.
+
+        Parameters
+        ----------
+        catalog : object
+            Catalog object providing an "add" method or None.
+        """
+        DataStorageBase._data_catalog = catalog
+
+    @classmethod
+    def get_data_catalog(cls):
+        """Returns the data catalog currently registered with all storage instances or None.
+        """
+        return DataStorageBase._data_catalog
+
+    def _add_to_catalog(self, file_path, timestamp, metadata=None, nametag=None):
+        """Helper method to register a newly created file with the data catalog (if set).
+        Catalog errors are logged and never interfere with saving data.
+        """
+        catalog = DataStorageBase._data_catalog
+        if catalog is None:
+            return
+        try:
+            catalog.add(file_path,
+                        timestamp=timestamp,
+                        metadata=self.get_unified_metadata(metadata),
+                        nametag=nametag,
+                        storage=type(self).__name__)
+        except Exception:
+            _log.exception(f'Unable to add file "{file_path}" to data catalog:')
+
+    def _create_dir_for_file(self, file_path):
+        """Helper to create the directory for a file to save unless it is known to exist already.
+        """
+        if self._resolved_dir is None or os.path.dirname(file_path) != self._resolved_dir:
+            create_dir_for_file(file_path)
+
+    def save_data_batch(self, items, *, timestamp=None, workers=None, **kwargs):
+        """Save many (small) data sets in one call, e.g. the data of each point of a sweep.
+        All files share the same timestamp, are saved in the root directory (created only once)
+        and reuse the formatted global metadata. The files can optionally be written in parallel
+        by a pool of threads.
+
+        Parameters
+        ----------
+        items : iterable
+            Iterable of (data, metadata, nametag) tuples. metadata and nametag can be omitted or
+            None. The nametags must be unique. If no nametag is given, the item index is used.
+        timestamp : datetime.datetime, optional
+            Timestamp to use for all files. Will create one if missing.
+        workers : int, optional
+            Number of threads writing files in parallel. Files are written one after the other in
+            the calling thread if None (default).
+        kwargs : optional
+            Keyword arguments passed on to save_data for each item (e.g. notes or column_headers).
+
+        Returns
+        -------
+        list
+            Return values of save_data in the same order as items.
+        """
+        if 'metadata' in kwargs or 'nametag' in kwargs or 'filename' in kwargs:
+            raise TypeError('Batch save items provide metadata and nametag for each data set. '
+                            'Custom filenames are not supported.')
+        if timestamp is None:
+            timestamp = datetime.now()
+        jobs = list()
+        nametags = set()
+        for index, item in enumerate(items):
+            data, metadata, nametag = (*item, None, None)[:3]
+            if nametag is None:
+                nametag = str(index)
+            if nametag in nametags:
+                raise ValueError(f'Duplicate nametag "{nametag}" in batch save items.')
+            nametags.add(nametag)
+            jobs.append((data, self.get_unified_metadata(metadata), nametag))
+        if not jobs:
+            return list()
+
+        # Use a shallow copy of this storage object with global metadata already included and the
+        # root directory already resolved
+        storage = copy.copy(self)
+        storage.include_global_metadata = False
+        dummy_path = os.path.join(self.root_dir, 'dummy')
+        create_dir_for_file(dummy_path)
+        storage._resolved_dir = os.path.dirname(dummy_path)
+
+        def save(job):
+            return storage.save_data(job[0],
+                                     metadata=job[1],
+                                     nametag=job[2],
+                                     timestamp=timestamp,
+                                     **kwargs)
+
+        if workers is None or workers <= 1:
+            return [save(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=int(workers),
+                                thread_name_prefix='qudi-batch-save') as executor:
+            return list(executor.map(save, jobs))
+
+    def save_thumbnail_async(self, mpl_figure, file_path, timeout=None):
+        """Non-blocking version of save_thumbnail. The figure is rendered and saved in a pool of
+        worker processes (see ThumbnailRenderer) and this call returns immediately.
+        The figure is closed before returning. Rendering errors are logged.
+
+        Parameters
+        ----------
+        mpl_figure : matplotlib.figure.Figure or callable
+            The matplotlib figure object to save as an image or a picklable callable without
+            arguments creating the figure (see ThumbnailRenderer.submit_figure).
+        file_path : str
+            Full file path to use without the file extension.
+        timeout : float, optional
+            Maximum time in seconds to wait for a free slot if too many renders are pending.
+
+        Returns
+        -------
+        str
+            Full absolute path of the image to be saved.
+        """
+        file_path += self.image_format.value
+        future = self.get_thumbnail_renderer().submit_figure(mpl_figure,
+                                                             file_path,
+                                                             self.image_format,
+                                                             timeout=timeout)
+        future.add_done_callback(self._thumbnail_done)
+        return file_path
+
+    @staticmethod
+    def _thumbnail_done(future):
+        try:
+            future.result()
+        except Exception:
+            _log.exception('Rendering thumbnail in background failed:')
+
+    @classmethod
+    def get_thumbnail_renderer(cls):
+        """Return the background thumbnail renderer shared by all storage objects in this process.
+        Creates a renderer with default settings if none has been configured yet.
+        """
+        with DataStorageBase._thumbnail_renderer_lock:
+            if DataStorageBase._thumbnail_renderer is None:
+                DataStorageBase._thumbnail_renderer = ThumbnailRenderer()
+            return DataStorageBase._thumbnail_renderer
+
+    @classmethod
+    def configure_thumbnail_rendering(cls, max_workers=2, max_pending=8):
+        """(Re-)Configure the background thumbnail renderer shared by all storage objects in this
+        process. Renders pending in a previously configured renderer will be finished before this
+        call returns.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of worker processes rendering concurrently.
+        max_pending : int, optional
+            Maximum number of pending renders before save_thumbnail_async blocks.
+        """
+        renderer = ThumbnailRenderer(max_workers=max_workers, max_pending=max_pending)
+        with DataStorageBase._thumbnail_renderer_lock:
+            old_renderer = DataStorageBase._thumbnail_renderer
+            DataStorageBase._thumbnail_renderer = renderer
+        if old_renderer is not None:
+            old_renderer.shutdown(wait=True)
+
+    @classmethod
+    def wait_for_thumbnails(cls, timeout=None):
+        """Block until all thumbnails submitted via save_thumbnail_async so far are saved.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time in seconds to wait. Waits indefinitely if None (default).
+
+        Returns
+        -------
+        bool
+            True if all thumbnails are saved, False if the timeout was reached.
+        """
+        with DataStorageBase._thumbnail_renderer_lock:
+            renderer = DataStorageBase._thumbnail_renderer
+        if renderer is None:
+            return True
+        return renderer.wait(timeout=timeout)
+
     def get_unified_metadata(self, local_metadata=None):
         """Helper method to return a dict containing provided local_metadata as well as global
         metadata depending on include_global_metadata flag.
@@ -396,7 +1268,10 @@ class DataStorageBase(metaclass=ABCMeta):
         dict
             New dictionary containing local metadata and global metadata.
         """
-        metadata = self.get_global_metadata() if self.include_global_metadata else dict()
+        if self.include_global_metadata:
+            metadata = dict(self.get_global_metadata_snapshot())
+        else:
+            metadata = dict()
         if local_metadata is not None:
             metadata.update(local_metadata)
         return metadata
@@ -456,22 +1331,133 @@ class DataStorageBase(metaclass=ABCMeta):
         """
         pass
 
+    def save_data_async(self, data, *, thumbnail=None, timeout=None, **kwargs):
+        """Opt-in asynchronous version of save_data. Puts the save job in the shared background
+        save queue and returns immediately. If the queue is full, this call will block until a slot
+        becomes available.
+        The data array and metadata (including global metadata) are copied at the time of this
+        call, so the caller is free to modify them afterwards. If no timestamp is given, the current
+        time is used.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Data array to be saved.
+        thumbnail : matplotlib.figure.Figure, optional
+            Figure to save as thumbnail alongside the data file after the data has been saved. The
+            figure is pickled and closed by this call and rendered by the shared thumbnail renderer
+            (see ThumbnailRenderer), since pyplot must not be used from the save worker threads.
+        timeout : float, optional
+            Maximum time in seconds to wait for a free slot in the save queue.
+        kwargs : optional
+            Keyword arguments passed on to save_data.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future resolving to the return value of save_data, i.e. full file path (str),
+            timestamp used (datetime.datetime), saved data shape (tuple).
+        """
+        if kwargs.get('timestamp', None) is None:
+            kwargs['timestamp'] = datetime.now()
+        # Global metadata values are never mutated, so only the local metadata must be copied
+        kwargs['metadata'] = self.get_unified_metadata(
+            copy.deepcopy(kwargs.get('metadata', None))
+        )
+        if data is not None:
+            data = np.array(data, copy=True)
+        if (thumbnail is not None) and not callable(thumbnail):
+            import matplotlib.pyplot as plt
+            figure_bytes = pickle.dumps(thumbnail)
+            plt.close(thumbnail)
+            thumbnail = functools.partial(pickle.loads, figure_bytes)
+        # Use a shallow copy of this storage object with global metadata already included
+        storage = copy.copy(self)
+        storage.include_global_metadata = False
+        return self.get_async_queue().submit(storage._save_job, data, thumbnail, timeout=timeout,
+                                             **kwargs)
+
+    def _save_job(self, data, thumbnail, **kwargs):
+        result = self.save_data(data, **kwargs)
+        if thumbnail is not None:
+            file_path = os.path.splitext(result[0])[0] + self.image_format.value
+            self.get_thumbnail_renderer().submit_figure(thumbnail,
+                                                        file_path,
+                                                        self.image_format).result()
+        return result
+
     @classmethod
-    def get_global_metadata(cls):
-        """Return a copy of the global metadata dict.
+    def get_async_queue(cls):
+        """Return the background save queue shared by all storage objects in this process.
+        Creates a queue with default settings if none has been configured yet.
         """
-        with cls._global_metadata_lock:
-            return cls._global_metadata.copy()
+        with DataStorageBase._async_queue_lock:
+            if DataStorageBase._async_queue is None:
+                DataStorageBase._async_queue = AsyncSaveQueue()
+            return DataStorageBase._async_queue
 
     @classmethod
-    def add_global_metadata(cls, name, value=None, *, overwrite=False):
-        """Set a single global metadata key-value pair or alternatively multiple ones as dict.
-        Metadata added this way will persist for all data storage instances in this process until
-        being selectively removed by calls to "remove_global_metadata".
+    def configure_async_saving(cls, max_workers=2, max_pending=16):
+        """(Re-)Configure the background save queue shared by all storage objects in this process.
+        Jobs pending in a previously configured queue will be finished before this call returns.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of save jobs executed concurrently.
+        max_pending : int, optional
+            Maximum number of pending save jobs before save_data_async blocks.
         """
-        if isinstance(name, str):
-            metadata = {name: copy.deepcopy(value)}
-        elif isinstance(name, dict):
+        queue = AsyncSaveQueue(max_workers=max_workers, max_pending=max_pending)
+        with DataStorageBase._async_queue_lock:
+            old_queue = DataStorageBase._async_queue
+            DataStorageBase._async_queue = queue
+        if old_queue is not None:
+            old_queue.shutdown(wait=True)
+
+    @classmethod
+    def wait_for_async_saves(cls, timeout=None):
+        """Block until all save jobs submitted via save_data_async so far are finished.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time in seconds to wait. Waits indefinitely if None (default).
+
+        Returns
+        -------
+        bool
+            True if all save jobs have finished, False if the timeout was reached.
+        """
+        with DataStorageBase._async_queue_lock:
+            queue = DataStorageBase._async_queue
+        if queue is None:
+            return True
+        return queue.wait(timeout=timeout)
+
+    @classmethod
+    def get_global_metadata(cls):
+        """Return a copy of the global metadata dict.
+        """
+        return dict(DataStorageBase._global_metadata)
+
+    @classmethod
+    def get_global_metadata_snapshot(cls):
+        """Return the current immutable snapshot of the global metadata without locking or copying.
+        The snapshot is a read-only mapping with a "version" attribute that is incremented with
+        each change of the global metadata. The metadata values must not be mutated.
+        """
+        return DataStorageBase._global_metadata
+
+    @classmethod
+    def add_global_metadata(cls, name, value=None, *, overwrite=False):
+        """Set a single global metadata key-value pair or alternatively multiple ones as dict.
+        Metadata added this way will persist for all data storage instances in this process until
+        being selectively removed by calls to "remove_global_metadata".
+        """
+        if isinstance(name, str):
+            metadata = {name: copy.deepcopy(value)}
+        elif isinstance(name, dict):
             if any(not isinstance(key, str) for key in name):
                 TypeError('Metadata dict must contain only str type keys.')
             metadata = copy.deepcopy(name)
@@ -479,13 +1465,17 @@ class DataStorageBase(metaclass=ABCMeta):
             raise TypeError('add_global_metadata expects either a single dict as first argument or '
                             'a str key and a value as first two arguments.')
 
-        with cls._global_metadata_lock:
+        with DataStorageBase._global_metadata_lock:
+            current = DataStorageBase._global_metadata
             if not overwrite:
-                duplicate_keys = set(metadata).intersection(cls._global_metadata)
+                duplicate_keys = set(metadata).intersection(current)
                 if duplicate_keys:
                     raise KeyError(f'global metadata keys "{duplicate_keys}" already set while '
                                    f'overwrite flag is False.')
-            cls._global_metadata.update(metadata)
+            # Publish a new snapshot instead of modifying the current one (copy-on-write)
+            new_metadata = dict(current)
+            new_metadata.update(metadata)
+            DataStorageBase._global_metadata = _MetadataSnapshot(new_metadata, current.version + 1)
 
     @classmethod
     def remove_global_metadata(cls, names):
@@ -494,9 +1484,12 @@ class DataStorageBase(metaclass=ABCMeta):
         """
         if isinstance(names, str):
             names = [names]
-        with cls._global_metadata_lock:
-            for name in names:
-                cls._global_metadata.pop(name, None)
+        with DataStorageBase._global_metadata_lock:
+            current = DataStorageBase._global_metadata
+            if current.keys().isdisjoint(names):
+                return
+            new_metadata = {key: value for key, value in current.items() if key not in names}
+            DataStorageBase._global_metadata = _MetadataSnapshot(new_metadata, current.version + 1)
 
 
 class TextDataStorage(DataStorageBase):
@@ -511,6 +1504,8 @@ class TextDataStorage(DataStorageBase):
 
     # Default format specifiers for all dtypes
     _default_fmt_for_type = {int: 'd', float: '.15e', complex: 'r', str: 's'}
+    # Number of rows to format and write at once when appending 2D arrays
+    _write_block_rows = 4096
 
     def __init__(self, *, root_dir, comments='# ', delimiter='\t', file_extension='.dat',
                  column_formats=None, **kwargs):
@@ -625,10 +1620,11 @@ class TextDataStorage(DataStorageBase):
                                     column_dtypes=column_dtypes)
         # Determine full file path and create containing directories if needed
         file_path = os.path.join(self.root_dir, filename)
-        create_dir_for_file(file_path)
+        self._create_dir_for_file(file_path)
         # Write to file. Overwrite silently.
-        with open(file_path, 'w') as file:
+        with atomic_open(file_path, 'w') as file:
             file.write(header)
+        self._add_to_catalog(file_path, timestamp, metadata, nametag)
         return file_path, timestamp
 
     def append_file(self, data, file_path):
@@ -652,7 +1648,13 @@ class TextDataStorage(DataStorageBase):
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
                                     f'Create a new file to append to by calling "new_file".')
+        with open(file_path, 'a') as file:
+            return self._write_data(file, data)
 
+    def _write_data(self, file, data):
+        """Helper to format and write single or multiple rows to an open file.
+        Returns None if data is empty and (rows written, number of columns) otherwise.
+        """
         # Determine data dimension
         try:
             is_1d = _is_1d_array(data)
@@ -660,9 +1662,22 @@ class TextDataStorage(DataStorageBase):
             # Data array is empty
             return
         # Construct row format specifier
-        # Deduce from first data row if no column_formats is configured
         first_row = data if is_1d else data[0]
         number_of_columns = len(first_row)
+        row_fmt_str = self._get_row_format(first_row)
+
+        if is_1d:
+            file.write(row_fmt_str.format(*data))
+            rows_written = 1
+        else:
+            rows_written = self._write_rows(file, data, row_fmt_str)
+        return rows_written, number_of_columns
+
+    def _get_row_format(self, first_row):
+        """Helper to construct the format string for a single data row (including line break).
+        Deduces the column formats from the first data row if no column_formats is configured.
+        """
+        number_of_columns = len(first_row)
         if not self.column_formats:
             column_formats = [self._default_fmt_for_type[_value_to_dtype(val)] for val in first_row]
         elif isinstance(self.column_formats, str):
@@ -673,20 +1688,64 @@ class TextDataStorage(DataStorageBase):
             )
         else:
             column_formats = self.column_formats
-        row_fmt_str = self.delimiter.join(f'{{:{fmt}}}' for fmt in column_formats) + '\n'
+        return self.delimiter.join(f'{{:{fmt}}}' for fmt in column_formats) + '\n'
 
-        # Append data to file
-        with open(file_path, 'a') as file:
-            # Write data row-by-row
-            if is_1d:
-                file.write(row_fmt_str.format(*data))
-                rows_written = 1
-            else:
-                rows_written = 0
-                for data_row in data:
-                    file.write(row_fmt_str.format(*data_row))
-                    rows_written += 1
-        return rows_written, number_of_columns
+    def _write_rows(self, file, data, row_fmt_str):
+        """Helper to write multiple data rows to an open text file.
+        Plain 2D numpy arrays are formatted in blocks of _write_block_rows rows with a single
+        format call and a single write per block. Any other row sequence is written row-by-row.
+
+        Returns
+        -------
+        int
+            Number of rows written.
+        """
+        if isinstance(data, np.ndarray) and data.ndim == 2 and data.dtype.fields is None:
+            block_rows = self._write_block_rows
+            block_fmt_str = row_fmt_str * block_rows
+            for start in range(0, data.shape[0], block_rows):
+                block = data[start:start + block_rows]
+                if block.shape[0] != block_rows:
+                    block_fmt_str = row_fmt_str * block.shape[0]
+                file.write(block_fmt_str.format(*block.ravel().tolist()))
+            return data.shape[0]
+
+        # Write data row-by-row
+        rows_written = 0
+        for data_row in data:
+            file.write(row_fmt_str.format(*data_row))
+            rows_written += 1
+        return rows_written
+
+    def new_stream(self, *, flush_rows=1000, flush_interval=1.0, owner=None, **kwargs):
+        """Create a new data file on disk (see new_file) and return a TextDataStream writer handle
+        for it. The handle keeps the file open and buffers appended rows, which makes it much more
+        efficient than repeated calls to append_file for high-frequency data logging.
+
+        Parameters
+        ----------
+        flush_rows : int, optional
+            Number of buffered rows after which the buffer is written to disk.
+        flush_interval : float, optional
+            Time in seconds after which buffered rows are written to disk at the latest.
+        owner : qudi.core.module.Base, optional
+            Qudi module owning the stream. The stream is flushed and closed automatically upon
+            deactivation of this module.
+        kwargs : optional
+            Keyword arguments passed on to new_file.
+
+        Returns
+        -------
+        TextDataStream
+            Opened streaming writer handle to append data to.
+        """
+        file_path, timestamp = self.new_file(**kwargs)
+        return TextDataStream(self,
+                              file_path,
+                              timestamp=timestamp,
+                              flush_rows=flush_rows,
+                              flush_interval=flush_interval,
+                              owner=owner)
 
     def save_data(self, data, *, timestamp=None, metadata=None, notes=None, nametag=None,
                   column_headers=None, column_dtypes=None, filename=None):
@@ -705,16 +1764,23 @@ class TextDataStorage(DataStorageBase):
                 column_dtypes = [_value_to_dtype(val) for val in data[0]]
 
 
-        # Create new data file (overwrite old one if it exists)
-        file_path, timestamp = self.new_file(timestamp=timestamp,
-                                             metadata=metadata,
-                                             notes=notes,
-                                             nametag=nametag,
-                                             column_headers=column_headers,
-                                             column_dtypes=column_dtypes,
-                                             filename=filename)
-        # Append data to file
-        rows_columns = self.append_file(data, file_path=file_path)
+        if timestamp is None:
+            timestamp = datetime.now()
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        header = self.create_header(timestamp=timestamp,
+                                    metadata=metadata,
+                                    notes=notes,
+                                    column_headers=column_headers,
+                                    column_dtypes=column_dtypes)
+        file_path = os.path.join(self.root_dir, filename)
+        self._create_dir_for_file(file_path)
+        # Write header and data at once to a new file (overwrite old one if it exists)
+        with atomic_open(file_path, 'w') as file:
+            file.write(header)
+            rows_columns = self._write_data(file, data)
+        self._add_to_catalog(file_path, timestamp, metadata, nametag)
         return file_path, timestamp, rows_columns
 
     @staticmethod
@@ -726,8 +1792,7 @@ class TextDataStorage(DataStorageBase):
         """
         # Read back metadata
         try:
-            header, header_lines = get_header_from_file(file_path)
-            general, metadata = get_info_from_header(header)
+            general, metadata, header_lines = get_info_from_file(file_path)
             # Determine dtype specifier from general header section
             dtype = general['column_dtypes']
             if dtype is not None and not isinstance(dtype, type):
@@ -750,6 +1815,46 @@ class TextDataStorage(DataStorageBase):
                              f'trying to load is most likely no unicode textfile.') from err
         return data, metadata, general
 
+    @classmethod
+    def iter_data_blocks(cls, file_path, block_rows=65536):
+        """Generator reading a data file in blocks of rows.
+        See: qudi.util.datastorage.iter_text_data_blocks
+
+        Parameters
+        ----------
+        file_path : str
+            Path to file to load data from.
+        block_rows : int, optional
+            Maximum number of rows per yielded block.
+        """
+        general, _, _ = get_info_from_file(file_path)
+        yield from iter_text_data_blocks(file_path,
+                                         block_rows=block_rows,
+                                         skip_rows=cls._data_skip_rows(general))
+
+    @classmethod
+    def load_data_chunked(cls, file_path, block_rows=65536):
+        """Alternative to load_data reading the file in blocks of rows instead of using
+        numpy.genfromtxt. See: qudi.util.datastorage.load_text_data
+
+        Parameters
+        ----------
+        file_path : str
+            Path to file to load data from.
+        block_rows : int, optional
+            Number of rows to parse at once.
+        """
+        general, _, _ = get_info_from_file(file_path)
+        return load_text_data(file_path,
+                              block_rows=block_rows,
+                              skip_rows=cls._data_skip_rows(general))
+
+    @staticmethod
+    def _data_skip_rows(general):
+        """Number of non-data rows following the header.
+        """
+        return 0
+
 
 class CsvDataStorage(TextDataStorage):
     """Helper class to store (measurement)data on disk as CSV file.
@@ -790,6 +1895,12 @@ class CsvDataStorage(TextDataStorage):
             return f'{header}{format_column_headers(column_headers, self.delimiter)}\n'
         return header
 
+    @staticmethod
+    def _data_skip_rows(general):
+        """Skip the uncommented column headers row if present.
+        """
+        return 1 if general['column_headers'] else 0
+
     @staticmethod
     def load_data(file_path):
         """See: DataStorageBase.load_data()
@@ -798,8 +1909,7 @@ class CsvDataStorage(TextDataStorage):
             Path to file to load data from.
         """
         # Read back metadata
-        header, header_lines = get_header_from_file(file_path)
-        general, metadata = get_info_from_header(header)
+        general, metadata, header_lines = get_info_from_file(file_path)
         # Determine dtype specifier from general header section
         dtype = general['column_dtypes']
         if dtype is not None and not isinstance(dtype, type):
@@ -823,16 +1933,231 @@ class CsvDataStorage(TextDataStorage):
         return data, metadata, general
 
 
+class TextDataStream:
+    """Streaming writer handle to incrementally append data rows to a text file created by
+    TextDataStorage or CsvDataStorage. Usually created by calling "new_stream" on the storage object.
+
+    The file handle is kept open and the row format is determined only once with the first written
+    row. Written rows are buffered and flushed to disk if either the number of buffered rows
+    exceeds flush_rows or the last flush happened more than flush_interval seconds ago. The latter
+    is also checked by a background timer, so buffered rows are written to disk even if no further
+    rows arrive.
+    The buffer is always flushed when closing the stream, when leaving the context (if used as
+    context manager), upon deactivation of the owning qudi module and upon interpreter shutdown.
+
+    Example:
+
+        with storage.new_stream(nametag='counts', column_headers=('time', 'counts')) as stream:
+            stream.write(data_row)
+            stream.write(more_data_rows)
+    """
+    _open_streams = weakref.WeakSet()
+
+    def __init__(self, storage, file_path, *, timestamp=None, flush_rows=1000, flush_interval=1.0,
+                 owner=None):
+        """
+        Parameters
+        ----------
+        storage : TextDataStorage
+            Storage object defining the text format (delimiter and column formats).
+        file_path : str
+            Path of the existing file to append to.
+        timestamp : datetime.datetime, optional
+            Timestamp of the file creation.
+        flush_rows : int, optional
+            Number of buffered rows after which the buffer is written to disk.
+        flush_interval : float, optional
+            Time in seconds after which buffered rows are written to disk at the latest.
+        owner : qudi.core.module.Base, optional
+            Qudi module owning the stream. The stream is closed upon deactivation of this module.
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
+                                    f'Create a new file to append to by calling "new_file".')
+        if flush_rows < 1:
+            raise ValueError('flush_rows must be integer value >= 1')
+        if flush_interval < 0:
+            raise ValueError('flush_interval must be value >= 0')
+        self._storage = storage
+        self._file_path = file_path
+        self._timestamp = timestamp
+        self._flush_rows = int(flush_rows)
+        self._flush_interval = float(flush_interval)
+        self._lock = Mutex()
+        self._row_fmt_str = None
+        self._number_of_columns = None
+        self._buffer = StringIO()
+        self._buffered_rows = 0
+        self._last_flush = time.monotonic()
+        self._flush_timer = None
+        self._file = open(file_path, 'a')
+        self._owner_signal = None
+        if owner is not None:
+            self._owner_signal = owner.module_state.sigStateChanged
+            self._owner_signal.connect(self.__owner_state_changed)
+        self._open_streams.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, '_file', None) is not None:
+            self.close()
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    @property
+    def closed(self):
+        return self._file is None
+
+    def write(self, data):
+        """Append single or multiple rows to the stream buffer.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Data array to be appended.
+            For 1D arrays, it represents a single row.
+            For 2D arrays, it represents multiple rows.
+
+        Returns
+        -------
+        tuple
+            Number of rows written (int).
+            Number of columns written (int).
+        """
+        try:
+            is_1d = _is_1d_array(data)
+        except ValueError:
+            # Data array is empty
+            return 0, self._number_of_columns
+        first_row = data if is_1d else data[0]
+        with self._lock:
+            if self._file is None:
+                raise ValueError('Can not write to closed TextDataStream.')
+            # Compile row format specifier only once from the first row
+            if self._row_fmt_str is None:
+                self._row_fmt_str = self._storage._get_row_format(first_row)
+                self._number_of_columns = len(first_row)
+            elif len(first_row) != self._number_of_columns:
+                raise ValueError(f'Number of data columns ({len(first_row):d}) does not match the '
+                                 f'number of columns already written ({self._number_of_columns:d}).')
+            if is_1d:
+                self._buffer.write(self._row_fmt_str.format(*data))
+                rows_written = 1
+            else:
+                rows_written = self._storage._write_rows(self._buffer, data, self._row_fmt_str)
+            self._buffered_rows += rows_written
+            if (self._buffered_rows >= self._flush_rows) or \
+                    (time.monotonic() - self._last_flush >= self._flush_interval):
+                self._flush()
+            elif self._flush_timer is None:
+                # Make sure the buffered rows hit the disk even if no further write follows
+                delay = self._flush_interval - (time.monotonic() - self._last_flush)
+                self._flush_timer = threading.Timer(max(0., delay), self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return rows_written, self._number_of_columns
+
+    def flush(self):
+        """Write all buffered rows to disk.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def close(self):
+        """Flush all buffered rows and close the file handle. Calling close on an already closed
+        stream has no effect.
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._flush()
+            finally:
+                self._file.close()
+                self._file = None
+                self._open_streams.discard(self)
+                if self._owner_signal is not None:
+                    try:
+                        self._owner_signal.disconnect(self.__owner_state_changed)
+                    except (RuntimeError, TypeError):
+                        pass
+                    self._owner_signal = None
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._buffered_rows > 0:
+            self._file.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            self._buffered_rows = 0
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def __owner_state_changed(self, event):
+        if event.dst == 'deactivated':
+            self.close()
+
+    @classmethod
+    def close_all(cls):
+        """Flush and close all open TextDataStream instances in this process.
+        """
+        for stream in list(cls._open_streams):
+            stream.close()
+
+
+atexit.register(TextDataStream.close_all)
+
+
 class NpyDataStorage(DataStorageBase):
     """Helper class to store (measurement) data on disk as binary .npy file.
+    Files created by new_file can be appended along the first axis using append_file.
+
+    By default the header is saved in a separate "<name>_metadata.txt" text file. In single file
+    mode, a single self-describing ".qnpy" file is written instead. It consists of:
+        - 8 bytes magic string b"\x93QUDINPY"
+        - 2 bytes container version (major, minor)
+        - 8 bytes little-endian payload offset
+        - qudi header text (UTF-8), padded to the payload offset (multiple of 64 bytes)
+        - payload in .npy format starting at the payload offset
+    The metadata can be read without touching the payload and the payload can be memory-mapped.
+    All load methods handle both file layouts.
     """
+    _container_magic = b'\x93QUDINPY'
+    _container_version = (1, 0)
+    _container_prefix_len = len(_container_magic) + 2 + 8
 
-    def __init__(self, *, root_dir, **kwargs):
+    def __init__(self, *, root_dir, single_file=False, **kwargs):
+        """
+        Parameters
+        ----------
+        root_dir : str
+            Root directory for this storage instance to save files into.
+        single_file : bool, optional
+            Flag indicating whether to embed the header into a single ".qnpy" file instead of
+            saving a separate metadata text file (default).
+        kwargs: optional
+            For additional keyword arguments, see DataStorageBase.__init__
+        """
         super().__init__(root_dir=root_dir, **kwargs)
+        self.single_file = bool(single_file)
 
     @property
     def file_extension(self):
-        return '.npy'
+        return '.qnpy' if self.single_file else '.npy'
 
     def create_header(self, timestamp, dtype, metadata=None, notes=None, column_headers=None):
         """
@@ -845,12 +2170,179 @@ class NpyDataStorage(DataStorageBase):
                              notes=notes,
                              column_headers=column_headers)
 
+    @staticmethod
+    def _appendable_npy_header(dtype, shape):
+        """Helper to create a .npy (version 1.0) file header for a C-contiguous array.
+        The header is padded to leave enough space for the largest possible length of the first
+        axis, so the shape can later be patched in place without moving the data payload.
+        """
+        max_shape = (np.iinfo(np.int64).max, *shape[1:])
+        header_dict = {'descr': np.lib.format.dtype_to_descr(dtype),
+                       'fortran_order': False,
+                       'shape': max_shape}
+        # Reserve the space needed for the maximum shape and align to 64 bytes (like numpy does)
+        prefix_len = len(np.lib.format.magic(1, 0)) + 2
+        header_len = -(-(prefix_len + len(repr(header_dict)) + 1) // 64) * 64 - prefix_len
+        header_dict['shape'] = tuple(shape)
+        header = repr(header_dict).ljust(header_len - 1) + '\n'
+        return np.lib.format.magic(1, 0) + header_len.to_bytes(2, 'little') + header.encode('latin1')
+
+    @classmethod
+    def _container_prefix(cls, header):
+        """Helper to create the single file container prefix including the padded qudi header.
+        The .npy payload is written directly after the prefix.
+        """
+        header = header.encode('utf-8')
+        offset = -(-(cls._container_prefix_len + len(header) + 1) // 64) * 64
+        return b''.join((cls._container_magic,
+                         bytes(cls._container_version),
+                         offset.to_bytes(8, 'little'),
+                         header.ljust(offset - cls._container_prefix_len - 1),
+                         b'\n'))
+
+    @classmethod
+    def _read_container_prefix(cls, file):
+        """Helper to read the payload offset of an open data file. Returns 0 for plain .npy files.
+        The file position is set to the start of the .npy payload.
+        """
+        prefix = file.read(cls._container_prefix_len)
+        if not prefix.startswith(cls._container_magic):
+            file.seek(0)
+            return 0
+        version = tuple(prefix[len(cls._container_magic):-8])
+        if version[0] != cls._container_version[0]:
+            raise ValueError(f'Unsupported qudi binary container version {version}.')
+        offset = int.from_bytes(prefix[-8:], 'little')
+        file.seek(offset)
+        return offset
+
+    @staticmethod
+    def _read_npy_header(file):
+        """Helper to read the .npy header at the current position of an open file.
+        """
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            return np.lib.format.read_array_header_1_0(file)
+        return np.lib.format.read_array_header_2_0(file)
+
+    def new_file(self, *, dtype=float, row_shape=(), timestamp=None, metadata=None, notes=None,
+                 nametag=None, column_headers=None, filename=None):
+        """Create a new, empty .npy file that can be appended along the first axis by calling
+        append_file. The metadata text file is created alongside as for save_data.
+        The resulting file can be loaded with plain numpy.load at any time.
+
+        Parameters
+        ----------
+        dtype : numpy.dtype, optional
+            The dtype of the data array.
+        row_shape : tuple, optional
+            The shape of a single row, i.e. the data array shape excluding the first axis.
+            Default is () corresponding to a 1D array.
+
+        For a description of the other parameters, see: TextDataStorage.new_file()
+
+        Returns
+        -------
+        tuple
+            Full file path (str), timestamp used (datetime.datetime).
+        """
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise TypeError('Appendable .npy files do not support object dtypes.')
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Construct file name if none is given explicitly
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        # Create filename for separate metadata textfile
+        meta_filename = filename.rsplit('.', 1)[0] + '_metadata.txt'
+
+        # Create header
+        header = self.create_header(timestamp,
+                                    dtype,
+                                    metadata=metadata,
+                                    notes=notes,
+                                    column_headers=column_headers)
+        # Determine full file path and create containing directories if needed
+        file_path = os.path.join(self.root_dir, filename)
+        self._create_dir_for_file(file_path)
+        meta_file_path = os.path.join(self.root_dir, meta_filename)
+        # Write empty array header and metadata to file(s). Overwrite silently.
+        with atomic_open(file_path, 'wb') as file:
+            if self.single_file:
+                file.write(self._container_prefix(header))
+            file.write(self._appendable_npy_header(dtype, (0, *row_shape)))
+        if not self.single_file:
+            with atomic_open(meta_file_path, 'w') as file:
+                file.write(header)
+        self._add_to_catalog(file_path, timestamp, metadata, nametag)
+        return file_path, timestamp
+
+    def append_file(self, data, file_path):
+        """Append single or multiple rows to an existing .npy file created by new_file.
+        The data is written to the end of the file and afterwards the array shape is patched in the
+        file header. The file is never rewritten.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Data array to be appended.
+            If the array has one dimension less than the array stored in the file, it represents a
+            single row. Otherwise, it represents multiple rows.
+        file_path : str
+            File path to append to.
+
+        Returns
+        -------
+        tuple
+            Number of rows written (int).
+            Shape of a single row (tuple).
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
+                                    f'Create a new file to append to by calling "new_file".')
+        with open(file_path, 'r+b') as file:
+            offset = self._read_container_prefix(file)
+            version = np.lib.format.read_magic(file)
+            if version != (1, 0):
+                raise ValueError(f'File "{file_path}" is not an appendable .npy file. Create a new '
+                                 f'file to append to by calling "new_file".')
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            header_len = file.tell() - offset
+            if fortran_order:
+                raise ValueError(f'Can not append to Fortran-ordered .npy file "{file_path}".')
+            data = np.asarray(data)
+            rows = data[np.newaxis] if data.ndim == len(shape) - 1 else data
+            if rows.shape[1:] != shape[1:]:
+                raise ValueError(f'Row shape {rows.shape[1:]} of data to append does not match '
+                                 f'row shape {shape[1:]} of array in file.')
+            if not np.can_cast(rows.dtype, dtype, casting='same_kind'):
+                raise TypeError(f'Can not append data of dtype "{rows.dtype}" to array of dtype '
+                                f'"{dtype}".')
+            if rows.shape[0] == 0:
+                return 0, shape[1:]
+            new_shape = (shape[0] + rows.shape[0], *shape[1:])
+            new_header = self._appendable_npy_header(dtype, new_shape)
+            if len(new_header) != header_len:
+                raise ValueError(f'Header of .npy file "{file_path}" has no space left to update '
+                                 f'the array shape. Create files to append to by calling '
+                                 f'"new_file".')
+            # Write payload first and only afterwards make it visible by patching the header
+            file.seek(offset + header_len + shape[0] * int(np.prod(shape[1:])) * dtype.itemsize)
+            file.write(np.ascontiguousarray(rows, dtype=dtype).tobytes())
+            file.truncate()
+            file.seek(offset)
+            file.write(new_header)
+        return rows.shape[0], shape[1:]
+
     def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
                   column_headers=None, filename=None):
         """Saves a binary file containing the data array.
         Also saves alongside a text file containing the notes, (global) metadata and column headers
         for this data set. The filename of the text file will be the same as for the binary file
-        appended by "_metadata".
+        appended by "_metadata". In single file mode, this header is embedded in the binary file
+        instead.
 
         For more information, see :meth:`~qudi.util.datastorage.DataStorageBase.save_data`.
 
@@ -876,18 +2368,96 @@ class NpyDataStorage(DataStorageBase):
                                     column_headers=column_headers)
         # Determine full file path and create containing directories if needed
         file_path = os.path.join(self.root_dir, filename)
-        create_dir_for_file(file_path)
+        self._create_dir_for_file(file_path)
         meta_file_path = os.path.join(self.root_dir, meta_filename)
-        # Write data and metadata to file. Overwrite silently.
-        with open(file_path, 'wb') as file:
+        # Write data and metadata to file(s). Overwrite silently.
+        with atomic_open(file_path, 'wb') as file:
+            if self.single_file:
+                file.write(self._container_prefix(header))
             # Write numpy data array in binary format
             np.save(file, data, allow_pickle=False)
-        with open(meta_file_path, 'w') as file:
-            file.write(header)
+        if not self.single_file:
+            with atomic_open(meta_file_path, 'w') as file:
+                file.write(header)
+        self._add_to_catalog(file_path, timestamp, metadata, nametag)
         return file_path, timestamp, data.shape
 
-    @staticmethod
-    def load_data(file_path):
+    @classmethod
+    def load_metadata(cls, file_path):
+        """Load only the metadata of a saved data set from the header embedded in a single file
+        container or else from the accompanying metadata text file. The data payload is never read.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the binary data file (not the metadata file).
+
+        Returns
+        -------
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        with open(file_path, 'rb') as file:
+            prefix = file.read(cls._container_prefix_len)
+            if prefix.startswith(cls._container_magic):
+                offset = int.from_bytes(prefix[-8:], 'little')
+                header = file.read(offset - cls._container_prefix_len).decode('utf-8')
+                header = header.rsplit(_HEADER_END_MARKER, 1)[0]
+                general, metadata = get_info_from_header(header)
+                return metadata, general
+        metadata_path = file_path.split('.npy')[0] + '_metadata.txt'
+        try:
+            general, metadata, _ = get_info_from_file(metadata_path)
+        except FileNotFoundError:
+            return dict(), dict()
+        return metadata, general
+
+    @classmethod
+    def get_data_info(cls, file_path):
+        """Read only the .npy file header to determine shape and dtype of the saved data array.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the binary data file.
+
+        Returns
+        -------
+        tuple
+            Shape of the data array (tuple), dtype of the data array (numpy.dtype).
+        """
+        with open(file_path, 'rb') as file:
+            cls._read_container_prefix(file)
+            shape, _, dtype = cls._read_npy_header(file)
+        return shape, dtype
+
+    @classmethod
+    def _load_payload(cls, file_path, mmap_mode=None):
+        """Helper to load or memory-map the .npy payload of a plain .npy file or single file
+        container.
+        """
+        with open(file_path, 'rb') as file:
+            offset = cls._read_container_prefix(file)
+            if offset == 0:
+                return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+            if mmap_mode is None:
+                return np.lib.format.read_array(file, allow_pickle=False)
+            shape, fortran_order, dtype = cls._read_npy_header(file)
+            data_offset = file.tell()
+        if 0 in shape:
+            # Empty arrays can not be memory-mapped
+            return np.empty(shape, dtype=dtype, order='F' if fortran_order else 'C')
+        return np.memmap(file_path,
+                         dtype=dtype,
+                         mode=mmap_mode,
+                         offset=data_offset,
+                         shape=shape,
+                         order='F' if fortran_order else 'C')
+
+    @classmethod
+    def load_data(cls, file_path, mmap_mode=None, index=None):
         """
         See :meth:`~DataStorageBase.load_data` for more information.
 
@@ -895,19 +2465,972 @@ class NpyDataStorage(DataStorageBase):
         ----------
         file_path : str
             Path to the file to load data from.
+        mmap_mode : str, optional
+            If not None, the data array is memory-mapped instead of loaded into memory.
+            See numpy.load for valid modes ('r', 'r+', 'w+' or 'c').
+        index : slice or tuple, optional
+            Numpy-style index selecting a part of the data array, e.g. a row/column slice or a
+            subsampling like numpy.s_[::10, ::10]. Only the selected part is read from disk.
+            If mmap_mode is None, the selection is returned as regular in-memory array, otherwise
+            as view into the memory-mapped array.
 
         Returns
         -------
         np.ndarray
             Data as a numpy array.
+        dict
+            User metadata.
+        dict
+            General header data.
         """
-        # Load numpy array
-        data = np.load(file_path, allow_pickle=False)
-        # Try to find and load metadata from text file
-        metadata_path = file_path.split('.npy')[0] + '_metadata.txt'
-        try:
-            header, _ = get_header_from_file(metadata_path)
-        except FileNotFoundError:
-            return data, dict(), dict()
+        if index is None:
+            data = cls._load_payload(file_path, mmap_mode=mmap_mode)
+        elif mmap_mode is None:
+            # Map the file temporarily and only copy the selected part into memory
+            data = np.array(cls._load_payload(file_path, mmap_mode='r')[index])
+        else:
+            data = cls._load_payload(file_path, mmap_mode=mmap_mode)[index]
+        metadata, general = cls.load_metadata(file_path)
+        return data, metadata, general
+
+
+class NpzDataStorage(DataStorageBase):
+    """Helper class to store (measurement) data on disk as compressed binary .npz file.
+    The data array is saved as "data.npy" and the qudi header (including global metadata) as
+    "header.txt" inside the zip archive. No separate metadata file is created.
+    The files stay readable with plain numpy.load (e.g. numpy.load(file_path)['data']).
+
+    Supported compression codecs are "zlib" (deflate), "lzma" and "bz2" from the Python standard
+    library or None for an uncompressed archive. Note that the zip format does not support
+    compression levels for "lzma".
+    """
+    _data_entry = 'data.npy'
+    _header_entry = 'header.txt'
+    _zip_compression = {None: zipfile.ZIP_STORED,
+                        'zlib': zipfile.ZIP_DEFLATED,
+                        'lzma': zipfile.ZIP_LZMA,
+                        'bz2': zipfile.ZIP_BZIP2}
+    # Valid compression levels per codec. None means the codec does not support levels.
+    _compression_levels = {None: None,
+                           'zlib': range(0, 10),
+                           'lzma': None,
+                           'bz2': range(1, 10)}
+
+    def __init__(self, *, root_dir, compression='zlib', compression_level=None, **kwargs):
+        """
+        Parameters
+        ----------
+        root_dir : str
+            Root directory for this storage instance to save files into.
+        compression : str, optional
+            Compression codec ("zlib", "lzma", "bz2" or None).
+        compression_level : int, optional
+            Compression level passed to the codec (0..9 for "zlib", 1..9 for "bz2"). Uses the
+            codec default if None. Must be None for "lzma" and uncompressed archives.
+        kwargs: optional
+            For additional keyword arguments, see DataStorageBase.__init__
+        """
+        super().__init__(root_dir=root_dir, **kwargs)
+        if compression not in self._zip_compression:
+            raise ValueError(f'Unknown compression "{compression}". Must be one of '
+                             f'{tuple(self._zip_compression)}.')
+        if compression_level is not None:
+            valid_levels = self._compression_levels[compression]
+            if valid_levels is None:
+                raise ValueError(f'Compression "{compression}" does not support compression '
+                                 f'levels. compression_level must be None.')
+            if not isinstance(compression_level, int) or compression_level not in valid_levels:
+                raise ValueError(f'compression_level for compression "{compression}" must be '
+                                 f'integer value in [{valid_levels[0]:d}, {valid_levels[-1]:d}]')
+        self.compression = compression
+        self.compression_level = compression_level
+
+    @property
+    def file_extension(self):
+        return '.npz'
+
+    def create_header(self, timestamp, dtype, metadata=None, notes=None, column_headers=None):
+        """
+        """
+        # Gather all metadata (both global and locally provided) into a single dict
+        metadata = self.get_unified_metadata(metadata)
+        return format_header(timestamp,
+                             dtype,
+                             metadata=metadata,
+                             notes=notes,
+                             column_headers=column_headers)
+
+    def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
+                  column_headers=None, filename=None):
+        """Saves a compressed .npz archive containing the data array and the header with notes,
+        (global) metadata and column headers.
+
+        For more information, see :meth:`~qudi.util.datastorage.DataStorageBase.save_data`.
+
+        Parameters
+        ----------
+        column_headers : str or list, optional
+            Data column header strings or a single string.
+        """
+        data = np.asarray(data)
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Construct file name if none is given explicitly
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        # Create header
+        header = self.create_header(timestamp,
+                                    data.dtype,
+                                    metadata=metadata,
+                                    notes=notes,
+                                    column_headers=column_headers)
+        # Determine full file path and create containing directories if needed
+        file_path = os.path.join(self.root_dir, filename)
+        self._create_dir_for_file(file_path)
+        # Write data and header to archive. Overwrite silently.
+        with atomic_open(file_path, 'wb') as zip_file:
+            with zipfile.ZipFile(zip_file,
+                                 'w',
+                                 compression=self._zip_compression[self.compression],
+                                 compresslevel=self.compression_level) as archive:
+                archive.writestr(self._header_entry, header)
+                with archive.open(self._data_entry, 'w', force_zip64=True) as file:
+                    np.lib.format.write_array(file, data, allow_pickle=False)
+        self._add_to_catalog(file_path, timestamp, metadata, nametag)
+        return file_path, timestamp, data.shape
+
+    @classmethod
+    def load_metadata(cls, file_path):
+        """Load only the header of a .npz archive without decompressing the data array.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file to load the header from.
+
+        Returns
+        -------
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        with zipfile.ZipFile(file_path, 'r') as archive:
+            try:
+                header = archive.read(cls._header_entry).decode()
+            except KeyError:
+                return dict(), dict()
+        header = header.rsplit(_HEADER_END_MARKER, 1)[0]
         general, metadata = get_info_from_header(header)
+        return metadata, general
+
+    @classmethod
+    def get_data_info(cls, file_path):
+        """Read only the .npy header of the data array inside the archive to determine shape and
+        dtype of the saved data array.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the .npz file.
+
+        Returns
+        -------
+        tuple
+            Shape of the data array (tuple), dtype of the data array (numpy.dtype).
+        """
+        with zipfile.ZipFile(file_path, 'r') as archive:
+            with archive.open(cls._data_entry, 'r') as file:
+                version = np.lib.format.read_magic(file)
+                if version == (1, 0):
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(file)
+                else:
+                    shape, _, dtype = np.lib.format.read_array_header_2_0(file)
+        return shape, dtype
+
+    @classmethod
+    def load_data(cls, file_path):
+        """
+        See :meth:`~DataStorageBase.load_data` for more information.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file to load data from.
+
+        Returns
+        -------
+        np.ndarray
+            Data as a numpy array.
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        with zipfile.ZipFile(file_path, 'r') as archive:
+            with archive.open(cls._data_entry, 'r') as file:
+                data = np.lib.format.read_array(file, allow_pickle=False)
+        metadata, general = cls.load_metadata(file_path)
+        return data, metadata, general
+
+
+class Hdf5DataStorage(DataStorageBase):
+    """Helper class to store (measurement) data on disk as HDF5 file.
+    Data is written into a single chunked and compressed dataset that can be resized along the
+    first axis. This makes it possible to append single or multiple rows to an existing file
+    without rewriting it.
+    The qudi header (general information and metadata) is stored as file attribute and can be read
+    without touching the dataset payload. Loading data can be restricted to a slice of the dataset
+    so only the selected part is read from disk.
+    String arrays are stored as variable-length UTF-8 strings.
+
+    Requires the optional dependency "h5py".
+    """
+    _header_attr = 'qudi_header'
+    _dataset_attr = 'qudi_dataset'
+
+    def __init__(self, *, root_dir, file_extension='.h5', dataset_name='data', compression='gzip',
+                 compression_opts=4, shuffle=True, chunk_rows=None, **kwargs):
+        """
+        Parameters
+        ----------
+        root_dir : str
+            Root directory for this storage instance to save files into.
+        file_extension : str, optional
+            File extension to use for HDF5 files.
+        dataset_name : str, optional
+            Name of the HDF5 dataset holding the data array.
+        compression : str, optional
+            HDF5 compression filter to use ("gzip", "lzf" or None for no compression).
+        compression_opts : int, optional
+            Compression level for the "gzip" filter (0-9). Ignored for other filters.
+        shuffle : bool, optional
+            Flag indicating whether to apply the HDF5 byte shuffle filter before compression.
+        chunk_rows : int, optional
+            Number of rows (along the first axis) per HDF5 chunk. If None (default), the chunk
+            shape is guessed by h5py.
+        kwargs: optional
+            For additional keyword arguments, see DataStorageBase.__init__
+        """
+        _import_h5py()
+        super().__init__(root_dir=root_dir, **kwargs)
+        if chunk_rows is not None and chunk_rows < 1:
+            raise ValueError('chunk_rows must be integer value >= 1 or None')
+        self._file_extension = ''
+        self.file_extension = file_extension
+        self.dataset_name = dataset_name
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.shuffle = bool(shuffle)
+        self.chunk_rows = None if chunk_rows is None else int(chunk_rows)
+
+    @property
+    def file_extension(self):
+        return self._file_extension
+
+    @file_extension.setter
+    def file_extension(self, value):
+        if (value is not None) and (not isinstance(value, str)):
+            raise TypeError('file_extension must be str or None')
+        if not value:
+            self._file_extension = ''
+        elif value.startswith('.'):
+            self._file_extension = value
+        else:
+            self._file_extension = '.' + value
+
+    def create_header(self, timestamp=None, metadata=None, notes=None, column_headers=None,
+                      column_dtypes=None):
+        """
+        """
+        # Gather all metadata (both global and locally provided) into a single dict
+        metadata = self.get_unified_metadata(metadata)
+        return format_header(timestamp,
+                             metadata=metadata,
+                             notes=notes,
+                             column_headers=column_headers,
+                             column_dtypes=column_dtypes)
+
+    @staticmethod
+    def _to_hdf5_array(data):
+        """Helper to convert numpy unicode string arrays (not supported by HDF5) into arrays of
+        variable-length UTF-8 strings. All other arrays are returned unchanged.
+        """
+        h5py = _import_h5py()
+        if data.dtype.kind == 'U':
+            return data.astype(h5py.string_dtype())
+        if data.dtype.kind == 'O' and h5py.check_string_dtype(data.dtype) is None:
+            raise TypeError('Hdf5DataStorage can not store arrays of dtype "object". Convert the '
+                            'data to a numeric or string dtype first.')
+        return data
+
+    def _create_dataset(self, file, data, resizable_shape):
+        """Helper to create a new chunked and compressed dataset in an open HDF5 file.
+        """
+        data = self._to_hdf5_array(data)
+        maxshape = (None, *resizable_shape[1:])
+        if self.chunk_rows is None:
+            chunks = True
+        else:
+            chunks = (self.chunk_rows, *(max(1, dim) for dim in resizable_shape[1:]))
+        compression_opts = self.compression_opts if self.compression == 'gzip' else None
+        return file.create_dataset(self.dataset_name,
+                                   data=data,
+                                   maxshape=maxshape,
+                                   chunks=chunks,
+                                   compression=self.compression,
+                                   compression_opts=compression_opts,
+                                   shuffle=self.shuffle and self.compression is not None)
+
+    def new_file(self, *, timestamp=None, metadata=None, notes=None, nametag=None,
+                 column_headers=None, column_dtypes=None, filename=None):
+        """Create a new HDF5 file on disk and write the header to it. The dataset itself is
+        created with the first call to append_file. Will overwrite old files silently if they have
+        the same path.
+
+        For a description of the parameters, see: TextDataStorage.new_file()
+
+        Returns
+        -------
+        tuple
+            Full file path (str), timestamp used (datetime.datetime).
+        """
+        # Create timestamp if missing
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Construct file name if none is given explicitly
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        # Create header
+        header = self.create_header(timestamp=timestamp,
+                                    metadata=metadata,
+                                    notes=notes,
+                                    column_headers=column_headers,
+                                    column_dtypes=column_dtypes)
+        # Determine full file path and create containing directories if needed
+        file_path = os.path.join(self.root_dir, filename)
+        self._create_dir_for_file(file_path)
+        # Write to file. Overwrite silently.
+        with _import_h5py().File(file_path, 'w') as file:
+            file.attrs[self._header_attr] = header
+            file.attrs[self._dataset_attr] = self.dataset_name
+        self._add_to_catalog(file_path, timestamp, metadata, nametag)
+        return file_path, timestamp
+
+    def append_file(self, data, file_path):
+        """Append single or multiple rows to an existing HDF5 file. The dataset is resized along
+        the first axis and only the new rows are written to disk.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Data array to be appended.
+            If the array has one dimension less than the stored dataset, it represents a single
+            row. Otherwise, it represents multiple rows.
+            If no dataset has been created yet, 1D arrays are considered a single row.
+        file_path : str
+            File path to append to.
+
+        Returns
+        -------
+        tuple
+            Number of rows written (int).
+            Shape of a single row (tuple).
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
+                                    f'Create a new file to append to by calling "new_file".')
+        data = np.asarray(data)
+        if data.size == 0:
+            return 0, data.shape[1:]
+
+        with _import_h5py().File(file_path, 'a') as file:
+            dataset = file.get(self.dataset_name, None)
+            if dataset is None:
+                rows = data[np.newaxis] if data.ndim < 2 else data
+                self._create_dataset(file, rows, rows.shape)
+                return rows.shape[0], rows.shape[1:]
+
+            rows = data[np.newaxis] if data.ndim == dataset.ndim - 1 else data
+            if rows.shape[1:] != dataset.shape[1:]:
+                raise ValueError(f'Row shape {rows.shape[1:]} of data to append does not match '
+                                 f'row shape {dataset.shape[1:]} of dataset in file.')
+            old_rows = dataset.shape[0]
+            dataset.resize(old_rows + rows.shape[0], axis=0)
+            dataset[old_rows:] = self._to_hdf5_array(rows)
+        return rows.shape[0], rows.shape[1:]
+
+    def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
+                  column_headers=None, column_dtypes=None, filename=None):
+        """Saves a HDF5 file containing the data array as chunked and compressed dataset along with
+        notes, (global) metadata and column headers as attributes.
+
+        For more information, see :meth:`~qudi.util.datastorage.DataStorageBase.save_data`.
+
+        Parameters
+        ----------
+        column_headers : str or list, optional
+            Data column header strings or a single string.
+        column_dtypes : str or sequence, optional
+            The column dtypes to include in the header.
+        """
+        data = self._to_hdf5_array(np.asarray(data))
+        file_path, timestamp = self.new_file(timestamp=timestamp,
+                                             metadata=metadata,
+                                             notes=notes,
+                                             nametag=nametag,
+                                             column_headers=column_headers,
+                                             column_dtypes=column_dtypes,
+                                             filename=filename)
+        if data.ndim > 0:
+            with _import_h5py().File(file_path, 'a') as file:
+                self._create_dataset(file, data, data.shape)
+        return file_path, timestamp, data.shape
+
+    @classmethod
+    def _info_from_file(cls, file):
+        """Helper to parse the qudi header attribute of an open HDF5 file.
+        """
+        header = file.attrs.get(cls._header_attr, None)
+        if header is None:
+            return dict(), dict()
+        if isinstance(header, bytes):
+            header = header.decode()
+        header = header.rsplit('---- END HEADER ----', 1)[0]
+        general, metadata = get_info_from_header(header)
+        return metadata, general
+
+    @classmethod
+    def load_metadata(cls, file_path):
+        """Load only the header information of a HDF5 file without reading any data.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file to load the header from.
+
+        Returns
+        -------
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        with _import_h5py().File(file_path, 'r') as file:
+            return cls._info_from_file(file)
+
+    @classmethod
+    def load_data(cls, file_path, index=None, dataset_name=None):
+        """See: DataStorageBase.load_data()
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file to load data from.
+        index : slice or tuple, optional
+            Numpy-style index to select a part of the dataset. Only the selected part is read from
+            disk. If None (default), the whole dataset is loaded.
+        dataset_name : str, optional
+            Name of the HDF5 dataset to load. If None (default), the dataset name stored in the file
+            is used (falls back to "data").
+
+        Returns
+        -------
+        np.ndarray
+            Data as a numpy array.
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        with _import_h5py().File(file_path, 'r') as file:
+            metadata, general = cls._info_from_file(file)
+            if dataset_name is None:
+                dataset_name = file.attrs.get(cls._dataset_attr, 'data')
+                if isinstance(dataset_name, bytes):
+                    dataset_name = dataset_name.decode()
+            dataset = file.get(dataset_name, None)
+            if dataset is None:
+                return np.empty(0), metadata, general
+            string_info = _import_h5py().check_string_dtype(dataset.dtype)
+            if string_info is not None and string_info.length is None:
+                dataset = dataset.asstr()
+            data = dataset[()] if index is None else dataset[index]
+            if isinstance(data, np.ndarray) and data.dtype.kind == 'O':
+                data = data.astype(str)
+        return data, metadata, general
+
+
+class _ChunkedArrayStore:
+    """Helper class providing access to an N-dimensional chunked array directory store as created
+    by ChunkedArrayDataStorage. Each chunk is stored (compressed) in a separate file. Chunk files
+    are replaced atomically, so readers never see partially written chunks. The chunk index file is
+    append-only and lists all chunks written so far.
+    """
+    _layout_file = 'layout.json'
+    _header_file = 'header.txt'
+    _index_file = 'chunks.idx'
+    _codecs = {None: None, 'zlib': zlib, 'lzma': lzma, 'bz2': bz2}
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, self._layout_file), 'r') as file:
+            layout = json.load(file)
+        self.shape = tuple(layout['shape'])
+        self.dtype = np.dtype(layout['dtype'])
+        self.chunk_shape = tuple(layout['chunk_shape'])
+        self.fill_value = parse_metadata_value(layout['fill_value'])
+        self.compression = layout['compression']
+        self.compression_level = layout['compression_level']
+        self.grid_shape = tuple(-(-dim // chunk) for dim, chunk in zip(self.shape, self.chunk_shape))
+        self._lock = Mutex()
+        self._written_chunks = None
+
+    @classmethod
+    def create(cls, path, shape, dtype, chunk_shape, fill_value, compression, compression_level,
+               header):
+        if compression not in cls._codecs:
+            raise ValueError(f'Unknown compression "{compression}". Must be one of '
+                             f'{tuple(cls._codecs)}.')
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise TypeError('Chunked array stores do not support object dtypes.')
+        shape = tuple(int(dim) for dim in shape)
+        if len(shape) < 1 or any(dim < 1 for dim in shape):
+            raise ValueError('shape must contain at least one dimension and only sizes >= 1')
+        if chunk_shape is None:
+            chunk_shape = cls._guess_chunk_shape(shape, dtype.itemsize)
+        chunk_shape = tuple(min(int(chunk), dim) for chunk, dim in zip(chunk_shape, shape))
+        if len(chunk_shape) != len(shape) or any(chunk < 1 for chunk in chunk_shape):
+            raise ValueError('chunk_shape must have the same number of dimensions as shape and '
+                             'only sizes >= 1')
+        layout = {'shape': shape,
+                  'dtype': np.lib.format.dtype_to_descr(dtype),
+                  'chunk_shape': chunk_shape,
+                  'fill_value': repr(dtype.type(fill_value).item()),
+                  'compression': compression,
+                  'compression_level': compression_level}
+        os.makedirs(path, exist_ok=True)
+        # Remove leftovers of a previous store with the same path
+        for file_name in os.listdir(path):
+            if file_name.endswith('.chunk') or file_name == cls._index_file:
+                os.remove(os.path.join(path, file_name))
+        with atomic_open(os.path.join(path, cls._header_file), 'w') as file:
+            file.write(header)
+        with atomic_open(os.path.join(path, cls._layout_file), 'w') as file:
+            json.dump(layout, file)
+        with atomic_open(os.path.join(path, cls._index_file), 'w'):
+            pass
+        return cls(path)
+
+    @staticmethod
+    def _guess_chunk_shape(shape, itemsize, target_bytes=2**20):
+        """Helper to determine a chunk shape of roughly target_bytes by halving the largest chunk
+        dimension until the chunk is small enough.
+        """
+        chunk_shape = list(shape)
+        while np.prod(chunk_shape) * itemsize > target_bytes and max(chunk_shape) > 1:
+            largest = int(np.argmax(chunk_shape))
+            chunk_shape[largest] = -(-chunk_shape[largest] // 2)
+        return tuple(chunk_shape)
+
+    def _chunk_path(self, chunk_index):
+        return os.path.join(self.path, '.'.join(str(ii) for ii in chunk_index) + '.chunk')
+
+    def _chunk_region(self, chunk_index):
+        return tuple(slice(ii * chunk, min((ii + 1) * chunk, dim))
+                     for ii, chunk, dim in zip(chunk_index, self.chunk_shape, self.shape))
+
+    def _read_chunk(self, chunk_index):
+        """Read a single chunk. Returns None if the chunk has not been written yet.
+        """
+        try:
+            with open(self._chunk_path(chunk_index), 'rb') as file:
+                buffer = file.read()
+        except FileNotFoundError:
+            return None
+        codec = self._codecs[self.compression]
+        if codec is not None:
+            buffer = codec.decompress(buffer)
+        shape = tuple(region.stop - region.start for region in self._chunk_region(chunk_index))
+        return np.frombuffer(buffer, dtype=self.dtype).reshape(shape)
+
+    def _write_chunk(self, chunk_index, chunk):
+        codec = self._codecs[self.compression]
+        buffer = np.ascontiguousarray(chunk).tobytes()
+        if codec is not None:
+            if self.compression_level is None:
+                buffer = codec.compress(buffer)
+            elif codec is lzma:
+                buffer = codec.compress(buffer, preset=self.compression_level)
+            else:
+                buffer = codec.compress(buffer, self.compression_level)
+        # Write to temporary file first and replace the chunk file atomically
+        chunk_path = self._chunk_path(chunk_index)
+        with atomic_open(chunk_path, 'wb') as file:
+            file.write(buffer)
+
+    def _chunks_in_box(self, start, stop):
+        ranges = (range(begin // chunk, -(-end // chunk))
+                  for begin, end, chunk in zip(start, stop, self.chunk_shape))
+        return itertools.product(*ranges)
+
+    def written_chunks(self):
+        """Return the set of indices of all chunks written so far (as tuples).
+        """
+        with open(os.path.join(self.path, self._index_file), 'r') as file:
+            return {tuple(int(ii) for ii in line.split('.')) for line in file if line.strip()}
+
+    def write(self, data, offset):
+        """Write an N-dimensional block of data into the array at the given offset.
+        """
+        data = np.asarray(data)
+        if data.ndim != len(self.shape):
+            raise ValueError(f'Data to write must have {len(self.shape):d} dimensions.')
+        if offset is None:
+            offset = (0,) * len(self.shape)
+        start = tuple(int(ii) for ii in offset)
+        stop = tuple(begin + size for begin, size in zip(start, data.shape))
+        if len(start) != len(self.shape) or any(begin < 0 for begin in start) or \
+                any(end > dim for end, dim in zip(stop, self.shape)):
+            raise IndexError(f'Block of shape {data.shape} at offset {start} exceeds array shape '
+                             f'{self.shape}.')
+        if not np.can_cast(data.dtype, self.dtype, casting='same_kind'):
+            raise TypeError(f'Can not write data of dtype "{data.dtype}" to array of dtype '
+                            f'"{self.dtype}".')
+        with self._lock:
+            if self._written_chunks is None:
+                self._written_chunks = self.written_chunks()
+            new_chunks = list()
+            for chunk_index in self._chunks_in_box(start, stop):
+                region = self._chunk_region(chunk_index)
+                # Intersection of block and chunk in global, chunk and block coordinates
+                lower = [max(r.start, begin) for r, begin in zip(region, start)]
+                upper = [min(r.stop, end) for r, end in zip(region, stop)]
+                in_chunk = tuple(slice(lo - r.start, up - r.start)
+                                 for lo, up, r in zip(lower, upper, region))
+                in_block = tuple(slice(lo - begin, up - begin)
+                                 for lo, up, begin in zip(lower, upper, start))
+                chunk_shape = tuple(r.stop - r.start for r in region)
+                if all(s.stop - s.start == size for s, size in zip(in_chunk, chunk_shape)):
+                    # Block covers the entire chunk
+                    chunk = data[in_block]
+                else:
+                    chunk = self._read_chunk(chunk_index)
+                    if chunk is None:
+                        chunk = np.full(chunk_shape, self.fill_value, dtype=self.dtype)
+                    else:
+                        chunk = chunk.copy()
+                    chunk[in_chunk] = data[in_block]
+                self._write_chunk(chunk_index, chunk.astype(self.dtype, copy=False))
+                if chunk_index not in self._written_chunks:
+                    self._written_chunks.add(chunk_index)
+                    new_chunks.append(chunk_index)
+            if new_chunks:
+                with open(os.path.join(self.path, self._index_file), 'a') as file:
+                    file.write(''.join('.'.join(str(ii) for ii in chunk_index) + '\n'
+                                       for chunk_index in new_chunks))
+        return data.shape
+
+    def read(self, index=None):
+        """Read a part of the array selected by a numpy-style basic index (integers and slices).
+        Chunks not written yet are filled with the fill value. Only chunks intersecting the
+        selection are read from disk.
+        """
+        if index is None:
+            index = tuple()
+        elif not isinstance(index, tuple):
+            index = (index,)
+        if any(idx is Ellipsis for idx in index):
+            ellipsis_pos = index.index(Ellipsis)
+            missing = len(self.shape) - len(index) + 1
+            index = index[:ellipsis_pos] + (slice(None),) * missing + index[ellipsis_pos + 1:]
+        if len(index) > len(self.shape):
+            raise IndexError('Too many indices for chunked array.')
+        index = index + (slice(None),) * (len(self.shape) - len(index))
+        # Determine bounding box of the selection
+        slices = list()
+        squeeze_axes = list()
+        for axis, (idx, dim) in enumerate(zip(index, self.shape)):
+            if isinstance(idx, slice):
+                slices.append(range(*idx.indices(dim)))
+            elif isinstance(idx, (int, np.integer)):
+                idx = int(idx) + dim if idx < 0 else int(idx)
+                if not 0 <= idx < dim:
+                    raise IndexError(f'Index {idx:d} out of bounds for axis {axis:d}.')
+                slices.append(range(idx, idx + 1))
+                squeeze_axes.append(axis)
+            else:
+                raise TypeError('Only integers and slices are supported to index chunked arrays.')
+        if any(len(rng) == 0 for rng in slices):
+            return np.empty([len(rng) for rng in slices], dtype=self.dtype)
+        start = tuple(min(rng[0], rng[-1]) for rng in slices)
+        stop = tuple(max(rng[0], rng[-1]) + 1 for rng in slices)
+        box = np.full([end - begin for begin, end in zip(start, stop)],
+                      self.fill_value,
+                      dtype=self.dtype)
+        for chunk_index in self._chunks_in_box(start, stop):
+            chunk = self._read_chunk(chunk_index)
+            if chunk is None:
+                continue
+            region = self._chunk_region(chunk_index)
+            lower = [max(r.start, begin) for r, begin in zip(region, start)]
+            upper = [min(r.stop, end) for r, end in zip(region, stop)]
+            in_chunk = tuple(slice(lo - r.start, up - r.start)
+                             for lo, up, r in zip(lower, upper, region))
+            in_box = tuple(slice(lo - begin, up - begin)
+                           for lo, up, begin in zip(lower, upper, start))
+            box[in_box] = chunk[in_chunk]
+        # Apply slice steps within the bounding box and remove integer-indexed axes
+        steps = tuple(slice(rng[0] - begin, None if rng[-1] - begin + rng.step < 0 else
+                            rng[-1] - begin + rng.step, rng.step)
+                      for rng, begin in zip(slices, start))
+        return np.squeeze(box[steps], axis=tuple(squeeze_axes)) if squeeze_axes else box[steps]
+
+
+class ChunkedArrayDataStorage(DataStorageBase):
+    """Helper class to store N-dimensional (measurement) data on disk in a chunked directory store.
+    The array is split into chunks of equal shape that are stored as separate (compressed) files
+    in a directory alongside a qudi header file (including global metadata) and a chunk index.
+
+    This is intended for multi-axis scans that are filled incrementally. Arbitrary N-dimensional
+    blocks can be written via write_block while other threads or processes read the already
+    written data via load_data (unwritten parts are filled with the fill value).
+    Only a single writer per store is supported.
+    The storage object keeps the layout of the most recently used stores in memory. Call close_file
+    once a store is complete to release it early.
+    """
+    _max_open_stores = 16
+
+    def __init__(self, *, root_dir, file_extension='.qchunks', chunk_shape=None,
+                 compression='zlib', compression_level=1, **kwargs):
+        """
+        Parameters
+        ----------
+        root_dir : str
+            Root directory for this storage instance to save stores into.
+        file_extension : str, optional
+            Extension of the store directory names.
+        chunk_shape : tuple, optional
+            Shape of a single chunk. If None (default), chunks of roughly 1 MB are used.
+        compression : str, optional
+            Compression codec used for each chunk ("zlib", "lzma", "bz2" or None).
+        compression_level : int, optional
+            Compression level passed to the codec.
+        kwargs: optional
+            For additional keyword arguments, see DataStorageBase.__init__
+        """
+        super().__init__(root_dir=root_dir, **kwargs)
+        if compression not in _ChunkedArrayStore._codecs:
+            raise ValueError(f'Unknown compression "{compression}". Must be one of '
+                             f'{tuple(_ChunkedArrayStore._codecs)}.')
+        self._file_extension = ''
+        self.file_extension = file_extension
+        self.chunk_shape = chunk_shape
+        self.compression = compression
+        self.compression_level = compression_level
+        self._open_stores = OrderedDict()
+        self._open_stores_lock = Mutex()
+
+    @property
+    def file_extension(self):
+        return self._file_extension
+
+    @file_extension.setter
+    def file_extension(self, value):
+        if (value is not None) and (not isinstance(value, str)):
+            raise TypeError('file_extension must be str or None')
+        if not value:
+            self._file_extension = ''
+        elif value.startswith('.'):
+            self._file_extension = value
+        else:
+            self._file_extension = '.' + value
+
+    def create_header(self, timestamp=None, metadata=None, notes=None, column_headers=None):
+        """
+        """
+        # Gather all metadata (both global and locally provided) into a single dict
+        metadata = self.get_unified_metadata(metadata)
+        return format_header(timestamp,
+                             metadata=metadata,
+                             notes=notes,
+                             column_headers=column_headers)
+
+    def _get_store(self, path):
+        with self._open_stores_lock:
+            store = self._open_stores.get(path, None)
+            if store is None:
+                store = _ChunkedArrayStore(path)
+            self._cache_store(path, store)
+            return store
+
+    def _cache_store(self, path, store):
+        """Helper to add a store to the least-recently-used cache of open stores. Must be called
+        with _open_stores_lock held.
+        """
+        self._open_stores[path] = store
+        self._open_stores.move_to_end(path)
+        while len(self._open_stores) > self._max_open_stores:
+            self._open_stores.popitem(last=False)
+
+    def close_file(self, file_path):
+        """Release the in-memory state of a store opened by this storage object. The store can
+        still be written to afterwards, it will just be opened again.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the store directory.
+        """
+        with self._open_stores_lock:
+            self._open_stores.pop(file_path, None)
+
+    def new_file(self, *, shape, dtype=float, fill_value=0, chunk_shape=None, timestamp=None,
+                 metadata=None, notes=None, nametag=None, column_headers=None, filename=None):
+        """Create a new, empty chunked array store on disk. Will overwrite old stores silently if
+        they have the same path.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the N-dimensional array.
+        dtype : numpy.dtype, optional
+            The dtype of the array.
+        fill_value : scalar, optional
+            Value of array elements not written yet.
+        chunk_shape : tuple, optional
+            Overrides the chunk shape configured for this storage instance.
+
+        For a description of the other parameters, see: TextDataStorage.new_file()
+
+        Returns
+        -------
+        tuple
+            Full path of the store directory (str), timestamp used (datetime.datetime).
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Construct file name if none is given explicitly
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        header = self.create_header(timestamp=timestamp,
+                                    metadata=metadata,
+                                    notes=notes,
+                                    column_headers=column_headers)
+        path = os.path.join(self.root_dir, filename)
+        store = _ChunkedArrayStore.create(
+            path,
+            shape=shape,
+            dtype=dtype,
+            chunk_shape=self.chunk_shape if chunk_shape is None else chunk_shape,
+            fill_value=fill_value,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            header=header
+        )
+        with self._open_stores_lock:
+            self._cache_store(path, store)
+        self._add_to_catalog(path, timestamp, metadata, nametag)
+        return path, timestamp
+
+    def write_block(self, data, file_path, offset=None):
+        """Write an N-dimensional block of data (hyper-rectangle) into an existing store.
+        Only the chunks intersecting the block are (re-)written.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Data block to write. Must have the same number of dimensions as the stored array.
+        file_path : str
+            Path of the store directory.
+        offset : tuple, optional
+            Index of the first element of the block in the stored array. Default is the origin.
+
+        Returns
+        -------
+        tuple
+            Shape of the block written.
+        """
+        return self._get_store(file_path).write(data, offset)
+
+    def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
+                  column_headers=None, filename=None):
+        """Saves an N-dimensional data array into a new chunked array store.
+
+        For more information, see :meth:`~qudi.util.datastorage.DataStorageBase.save_data`.
+        """
+        data = np.asarray(data)
+        file_path, timestamp = self.new_file(shape=data.shape,
+                                             dtype=data.dtype,
+                                             timestamp=timestamp,
+                                             metadata=metadata,
+                                             notes=notes,
+                                             nametag=nametag,
+                                             column_headers=column_headers,
+                                             filename=filename)
+        self.write_block(data, file_path)
+        return file_path, timestamp, data.shape
+
+    @staticmethod
+    def load_metadata(file_path):
+        """Load only the header information of a chunked array store.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the store directory.
+
+        Returns
+        -------
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        general, metadata, _ = get_info_from_file(
+            os.path.join(file_path, _ChunkedArrayStore._header_file)
+        )
+        return metadata, general
+
+    @staticmethod
+    def get_written_chunks(file_path):
+        """Return the chunk shape and the indices of all chunks written so far, e.g. to determine
+        the progress of a running measurement.
+
+        Returns
+        -------
+        tuple
+            Chunk shape (tuple), set of written chunk indices (tuples).
+        """
+        store = _ChunkedArrayStore(file_path)
+        return store.chunk_shape, store.written_chunks()
+
+    @classmethod
+    def load_data(cls, file_path, index=None):
+        """See: DataStorageBase.load_data()
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the store directory.
+        index : int, slice or tuple, optional
+            Numpy-style basic index (integers and slices) to select a part of the array. Only the
+            chunks intersecting the selection are read from disk. If None (default), the whole
+            array is loaded.
+
+        Returns
+        -------
+        np.ndarray
+            Data as a numpy array. Elements not written yet are set to the fill value.
+        dict
+            User metadata.
+        dict
+            General header data.
+        """
+        data = _ChunkedArrayStore(file_path).read(index)
+        metadata, general = cls.load_metadata(file_path)
         return data, metadata, general
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a memory-mapped ring buffer on disk for continuous long-duration data
+acquisition with a bounded file size.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ('DiskRingBuffer',)
+
+import ast
+import numpy as np
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+from qudi.util.datastorage import create_dir_for_file
+
+
+class DiskRingBuffer:
+    """Fixed capacity ring buffer of array rows stored in a memory-mapped file.
+    Once the capacity is reached, the oldest rows are overwritten. Rows are addressed by their
+    absolute index, i.e. the total number of rows written before them.
+
+    The file consists of a small header and the row payload:
+        - 8 bytes magic string b"QUDIRBUF"
+        - 8 bytes little-endian header text length
+        - 3x 8 bytes little-endian counters "committed", "pending" and "start"
+        - header text (Python literal dict with dtype descriptor, row shape and capacity)
+        - payload (capacity x row shape) starting at the next multiple of 4096 bytes
+    The write cursor is part of the memory-mapped header, so it persists across restarts.
+
+    A single writer and any number of readers (in the same or other processes) can access the
+    buffer concurrently without locking. The writer announces rows to be written by increasing the
+    "pending" counter before writing them and makes them visible by increasing the "committed"
+    counter afterwards. Readers validate after copying that the rows they copied have not been
+    overwritten in the meantime and drop the overwritten ones. Only one writer per file is
+    allowed.
+    """
+    _magic = b'QUDIRBUF'
+    _counters_offset = 16
+    _text_offset = 40
+    _alignment = 4096
+
+    def __init__(self, file_path: str, read_only: bool = True):
+        """Open an existing ring buffer file. Use DiskRingBuffer.create to create a new one.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the ring buffer file.
+        read_only : bool, optional
+            Flag indicating whether to open the buffer for reading only (default) or as writer.
+        """
+        self.file_path = file_path
+        self.read_only = bool(read_only)
+        with open(file_path, 'rb') as file:
+            prefix = file.read(self._text_offset)
+            if len(prefix) != self._text_offset or not prefix.startswith(self._magic):
+                raise ValueError(f'File "{file_path}" is not a qudi ring buffer file.')
+            text_len = int.from_bytes(prefix[len(self._magic):self._counters_offset], 'little')
+            layout = ast.literal_eval(file.read(text_len).decode('latin1'))
+        self.dtype = np.lib.format.descr_to_dtype(layout['descr'])
+        self.row_shape = tuple(layout['row_shape'])
+        self.capacity = int(layout['capacity'])
+        payload_offset = self._payload_offset(text_len)
+        mode = 'r' if self.read_only else 'r+'
+        self._counters = np.memmap(file_path,
+                                   dtype='<u8',
+                                   mode=mode,
+                                   offset=self._counters_offset,
+                                   shape=(3,))
+        self._data = np.memmap(file_path,
+                               dtype=self.dtype,
+                               mode=mode,
+                               offset=payload_offset,
+                               shape=(self.capacity, *self.row_shape))
+        if not self.read_only:
+            self._recover()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        first, stop = self.valid_range
+        return max(stop - first, 0)
+
+    @classmethod
+    def _payload_offset(cls, text_len: int) -> int:
+        return -(-(cls._text_offset + text_len) // cls._alignment) * cls._alignment
+
+    @classmethod
+    def create(cls, file_path: str, capacity: int, dtype: Any = float,
+               row_shape: Sequence[int] = ()) -> 'DiskRingBuffer':
+        """Create a new, empty ring buffer file opened as writer. Will overwrite old files
+        silently if they have the same path.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the ring buffer file.
+        capacity : int
+            Maximum number of rows to keep.
+        dtype : numpy.dtype, optional
+            The dtype of the rows. Use a structured dtype to store e.g. timestamps along with the
+            data.
+        row_shape : tuple, optional
+            The shape of a single row. Default is () corresponding to scalar rows.
+
+        Returns
+        -------
+        DiskRingBuffer
+            The new ring buffer opened as writer.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise TypeError('Ring buffers do not support object dtypes.')
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError('capacity must be integer value >= 1')
+        row_shape = tuple(int(dim) for dim in row_shape)
+        layout = {'descr': np.lib.format.dtype_to_descr(dtype),
+                  'row_shape': row_shape,
+                  'capacity': capacity}
+        text = repr(layout).encode('latin1')
+        payload_offset = cls._payload_offset(len(text))
+        create_dir_for_file(file_path)
+        with open(file_path, 'wb') as file:
+            file.write(cls._magic)
+            file.write(len(text).to_bytes(8, 'little'))
+            file.write(bytes(24))
+            file.write(text)
+            file.truncate(payload_offset + capacity * int(np.prod(row_shape)) * dtype.itemsize)
+        return cls(file_path, read_only=False)
+
+    def _recover(self) -> None:
+        """Restore a consistent state after the previous writer crashed while writing rows.
+        The slots of rows announced but not committed may be partially overwritten, so the rows
+        previously stored there are invalidated.
+        """
+        committed, pending, start = (int(value) for value in self._counters)
+        if pending != committed:
+            self._counters[2] = max(start, pending - self.capacity)
+            self._counters[1] = committed
+            self._counters.flush()
+
+    @property
+    def total_written(self) -> int:
+        """Total number of rows written to this buffer since its creation.
+        """
+        return int(self._counters[0])
+
+    @property
+    def valid_range(self) -> Tuple[int, int]:
+        """Absolute index range [first, stop) of the rows currently held by the buffer.
+        """
+        stop = int(self._counters[0])
+        return self._first_valid(), stop
+
+    def _first_valid(self) -> int:
+        # Read "pending" before "start" in order to never overestimate the valid range
+        pending = int(self._counters[1])
+        return max(int(self._counters[2]), pending - self.capacity, 0)
+
+    def append(self, data: np.ndarray) -> int:
+        """Append single or multiple rows. If more rows than the capacity are given, only the last
+        rows fitting into the buffer are written.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Rows to append. If the array has the same number of dimensions as a single row, it
+            represents a single row. Otherwise, it represents multiple rows.
+
+        Returns
+        -------
+        int
+            Absolute index of the next row to be written after this call.
+        """
+        if self.read_only:
+            raise PermissionError('Ring buffer has been opened read-only.')
+        data = np.asarray(data)
+        rows = data[np.newaxis] if data.ndim == len(self.row_shape) else data
+        if rows.shape[1:] != self.row_shape:
+            raise ValueError(f'Row shape {rows.shape[1:]} of data to append does not match '
+                             f'row shape {self.row_shape} of ring buffer.')
+        committed = int(self._counters[0])
+        new_count = committed + rows.shape[0]
+        rows = rows[-self.capacity:]
+        # Announce the rows to be (over-)written, write them and make them visible
+        self._counters[1] = new_count
+        first_slot = (new_count - rows.shape[0]) % self.capacity
+        head = min(rows.shape[0], self.capacity - first_slot)
+        self._data[first_slot:first_slot + head] = rows[:head]
+        self._data[:rows.shape[0] - head] = rows[head:]
+        self._counters[0] = new_count
+        return new_count
+
+    def _read(self, start: Optional[int], stop: Optional[int]) -> Tuple[int, np.ndarray]:
+        committed = int(self._counters[0])
+        first = self._first_valid()
+        start = first if start is None else max(int(start), first)
+        stop = committed if stop is None else min(int(stop), committed)
+        if stop <= start:
+            return max(start, first), np.empty((0, *self.row_shape), dtype=self.dtype)
+        first_slot = start % self.capacity
+        head = min(stop - start, self.capacity - first_slot)
+        data = np.concatenate([self._data[first_slot:first_slot + head],
+                               self._data[:stop - start - head]])
+        # Drop rows overwritten by the writer while copying
+        first = self._first_valid()
+        if first > start:
+            data = data[first - start:]
+            start = first
+        return start, data
+
+    def read(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """Return a copy of the rows with absolute indices [start, stop), clipped to the rows
+        currently held by the buffer.
+
+        Parameters
+        ----------
+        start : int, optional
+            Absolute index of the first row. Defaults to the oldest row in the buffer.
+        stop : int, optional
+            Absolute index after the last row. Defaults to the number of rows written so far.
+
+        Returns
+        -------
+        numpy.ndarray
+            Copy of the requested rows.
+        """
+        return self._read(start, stop)[1]
+
+    def read_last(self, count: int) -> np.ndarray:
+        """Return a copy of the (up to) count most recently written rows.
+        """
+        return self.read(start=self.total_written - int(count))
+
+    def export(self, storage, *, start: Optional[int] = None, stop: Optional[int] = None,
+               metadata: Optional[Mapping[str, Any]] = None, **kwargs):
+        """Save a window of rows to a data file using a qudi.util.datastorage storage object.
+        The absolute index of the first exported row is added to the metadata as
+        "ring_buffer_first_row".
+
+        Parameters
+        ----------
+        storage : qudi.util.datastorage.DataStorageBase
+            Storage object to save the data with.
+        start : int, optional
+            Absolute index of the first row. Defaults to the oldest row in the buffer.
+        stop : int, optional
+            Absolute index after the last row. Defaults to the number of rows written so far.
+        metadata : dict, optional
+            Additional metadata to save.
+        kwargs : optional
+            Keyword arguments passed on to storage.save_data.
+
+        Returns
+        -------
+        tuple
+            Return value of storage.save_data.
+        """
+        first, data = self._read(start, stop)
+        metadata = dict() if metadata is None else dict(metadata)
+        metadata['ring_buffer_first_row'] = first
+        return storage.save_data(data, metadata=metadata, **kwargs)
+
+    def flush(self) -> None:
+        """Flush all written rows and the write cursor to disk.
+        """
+        if not self.read_only:
+            self._data.flush()
+            self._counters.flush()
+
+    def close(self) -> None:
+        """Flush (if opened as writer) and release the memory maps. The object is unusable
+        afterwards.
+        """
+        self.flush()
+        del self._data
+        del self._counters
@@ -24,10 +24,6 @@ __all__ = ('create_formatted_output', 'get_relevant_digit', 'get_si_norm', 'get_
 
 import math
 import numpy as np
-try:
-    import pyqtgraph.functions as fn
-except ImportError:
-    fn = None
 
 
 def get_unit_prefix_dict():
@@ -186,8 +182,11 @@ def create_formatted_output(param_dict, num_sig_digits=5):
     
     >>> param_dict['ODMR contrast']['error']
     """
-    if fn is None:
-        raise RuntimeError('Function "create_formatted_output" requires pyqtgraph.')
+    # pyqtgraph is imported on first use since it is slow to import
+    try:
+        import pyqtgraph.functions as fn
+    except ImportError:
+        raise RuntimeError('Function "create_formatted_output" requires pyqtgraph.') from None
 
     output_str = ''
     atol = 1e-18    # absolute tolerance for the detection of zero.
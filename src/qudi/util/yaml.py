@@ -3,6 +3,12 @@
 This file extends the ruamel.yaml package functionality to load and dump more data types needed by
 qudi (mostly numpy array and number types).
 Provides easy to use yaml_load and yaml_dump functions to read and write qudi YAML files.
+YAML engine instances are cached per thread and reused by these functions. Parsed file contents can
+optionally be cached as well (see yaml_load).
+
+Large numpy arrays are stored in separate .npy files next to the YAML file ("extndarray"). These
+files are named after a hash of the array content, so unchanged arrays are not written again upon
+the next dump. They can optionally be loaded memory-mapped (see yaml_load).
 
 Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
 distribution and on <https://github.com/Ulm-IQO/qudi-core/>
@@ -21,11 +27,15 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-__all__ = ['SafeRepresenter', 'SafeConstructor', 'YAML', 'yaml_load', 'yaml_dump', 'ParserError',
-           'YAMLError', 'MarkedYAMLError', 'YAMLStreamError', 'ScannerError', 'ConstructorError',
-           'DuplicateKeyError']
+__all__ = ['SafeRepresenter', 'SafeConstructor', 'YAML', 'yaml_load', 'yaml_dump', 'yaml_remove',
+           'yaml_clear_cache', 'ParserError', 'YAMLError', 'MarkedYAMLError', 'YAMLStreamError',
+           'ScannerError', 'ConstructorError', 'DuplicateKeyError']
 
 import os
+import re
+import copy
+import hashlib
+import threading
 import numpy as np
 import ruamel.yaml as _yaml
 from ruamel.yaml.error import YAMLError, MarkedYAMLError, YAMLStreamError
@@ -34,12 +44,50 @@ from ruamel.yaml.constructor import ConstructorError, DuplicateKeyError
 from enum import Enum, IntEnum, IntFlag, Flag
 from importlib import import_module
 from collections import OrderedDict
+from contextlib import contextmanager
 from io import BytesIO, TextIOWrapper
-from typing import Optional, Any, Mapping, Dict, Union
+from typing import Optional, Any, Mapping, Dict, Union, Iterable
+
+from qudi.util.atomicfile import atomic_open
 
 
 _FilePath = Union[str, bytes, os.PathLike]
 
+_thread_local = threading.local()
+
+
+def _extndarray_file_path(file_path: str, data: np.ndarray) -> str:
+    """Returns the path of the external .npy file to store the array data in.
+    The file name consists of the YAML file name and a hash of the array content.
+    """
+    data = np.ascontiguousarray(data)
+    digest = hashlib.sha1(usedforsecurity=False)
+    digest.update(repr((np.lib.format.dtype_to_descr(data.dtype), data.shape)).encode())
+    digest.update(data.reshape(-1).view(np.uint8))
+    return f'{os.path.splitext(file_path)[0]}-{digest.hexdigest()}.npy'
+
+
+def _remove_extndarray_files(file_path: str, keep: Optional[Iterable[str]] = None) -> None:
+    """Removes all external .npy files belonging to the YAML file file_path except for the file
+    paths given in keep.
+    """
+    dir_path, file_name = os.path.split(os.fsdecode(file_path))
+    # Match content hash as well as legacy counter file names
+    prefix = re.escape(os.path.splitext(file_name)[0])
+    pattern = re.compile(prefix + r'-([0-9a-f]{40}|\d{6})\.npy')
+    keep = set() if keep is None else {os.path.basename(path) for path in keep}
+    try:
+        names = os.listdir(dir_path or os.curdir)
+    except OSError:
+        return
+    for name in names:
+        if name not in keep and pattern.fullmatch(name):
+            try:
+                os.remove(os.path.join(dir_path, name))
+            except OSError:
+                # e.g. file still memory-mapped on Windows. Will be removed by the next dump.
+                pass
+
 
 class SafeRepresenter(_yaml.SafeRepresenter):
     """Custom YAML representer for qudi config files.
@@ -48,7 +96,8 @@ class SafeRepresenter(_yaml.SafeRepresenter):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._extndarray_count = 0
+        # Paths of all external .npy files referenced by the current dump
+        self.extndarray_files = set()
 
     def ignore_aliases(self, ignore_data):
         """Ignore aliases and anchors. Overwrites base class implementation.
@@ -121,17 +170,23 @@ class SafeRepresenter(_yaml.SafeRepresenter):
         If the output stream to dump to is a "regular" open text file handle (io.TextIOWrapper) and
         the array size exceeds the specified maximum ndarray size, it is dumped into a separate
         binary .npy file and is represented in YAML as file path string.
+        The .npy file name contains a hash of the array content. If the file already exists, the
+        array is unchanged and the file is not written again.
+        Also handles ndarray subclasses like numpy.memmap (e.g. arrays loaded memory-mapped).
         """
         # Write to separate file if possible and required (array size > self.ndarray_max_size)
         # FIXME: Find a better way... this is a mean hack to get the file path to dump,
         if isinstance(self.dumper._output, TextIOWrapper) and data.size > self.ndarray_max_size:
             try:
-                out_stream_path = self.dumper._output.name
-                dir_path = os.path.dirname(out_stream_path)
-                file_name = os.path.splitext(os.path.basename(out_stream_path))[0]
-                file_path = f'{os.path.join(dir_path, file_name)}-{self._extndarray_count:06}.npy'
-                np.save(file_path, data, allow_pickle=False)
-                self._extndarray_count += 1
+                # Files written by atomic_open provide their final path as "target_path"
+                out_stream_path = getattr(self.dumper._output,
+                                          'target_path',
+                                          self.dumper._output.name)
+                file_path = _extndarray_file_path(out_stream_path, data)
+                if not os.path.exists(file_path):
+                    with atomic_open(file_path, 'wb') as file:
+                        np.save(file, data, allow_pickle=False)
+                self.extndarray_files.add(file_path)
                 return self.represent_scalar(tag='tag:yaml.org,2002:extndarray', value=file_path)
             except:
                 pass
@@ -150,7 +205,7 @@ SafeRepresenter.add_representer(frozenset, SafeRepresenter.represent_frozenset)
 SafeRepresenter.add_representer(complex, SafeRepresenter.represent_complex)
 SafeRepresenter.add_representer(dict, SafeRepresenter.represent_dict_no_sort)
 SafeRepresenter.add_representer(OrderedDict, SafeRepresenter.represent_dict_no_sort)
-SafeRepresenter.add_representer(np.ndarray, SafeRepresenter.represent_ndarray)
+SafeRepresenter.add_multi_representer(np.ndarray, SafeRepresenter.represent_ndarray)
 SafeRepresenter.add_multi_representer(Enum, SafeRepresenter.represent_enum)
 SafeRepresenter.add_multi_representer(IntEnum, SafeRepresenter.represent_enum)
 SafeRepresenter.add_multi_representer(Flag, SafeRepresenter.represent_flag)
@@ -173,8 +228,11 @@ class SafeConstructor(_yaml.SafeConstructor):
 
     def construct_extndarray(self, node):
         """The constructor for a numpy array that is saved in a separate file.
+        The file is memory-mapped copy-on-write if requested by yaml_load.
         """
-        return np.load(self.construct_yaml_str(node), allow_pickle=False)
+        return np.load(self.construct_yaml_str(node),
+                       allow_pickle=False,
+                       mmap_mode=getattr(_thread_local, 'extndarray_mmap_mode', None))
 
     def construct_frozenset(self, node):
         """The frozenset constructor.
@@ -239,7 +297,84 @@ class YAML(_yaml.YAML):
         self.Constructor = SafeConstructor
 
 
-def yaml_load(file_path: _FilePath, ignore_missing: Optional[bool] = False) -> Dict[str, Any]:
+@contextmanager
+def _cached_yaml():
+    """Context manager providing a YAML instance cached for the calling thread.
+    ruamel.yaml.YAML instances are not thread-safe but can be reused for consecutive load/dump
+    calls, saving the setup of representer and constructor. Nested calls (e.g. from custom
+    constructors) get their own instance. Instances are discarded if an error occurs while in use.
+    """
+    try:
+        pool = _thread_local.yaml_pool
+    except AttributeError:
+        pool = _thread_local.yaml_pool = list()
+    yaml = pool.pop() if pool else YAML()
+    yield yaml
+    # ruamel.yaml keeps a record of each loaded document
+    doc_infos = getattr(yaml, 'doc_infos', None)
+    if doc_infos:
+        doc_infos.clear()
+    pool.append(yaml)
+
+
+class _YamlLoadCache:
+    """Thread-safe LRU cache for parsed YAML file contents. Cached entries are validated against
+    the file modification time and size.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 32):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(file_path: _FilePath) -> str:
+        return os.path.abspath(os.fsdecode(file_path))
+
+    def get(self, file_path: _FilePath, stat: os.stat_result) -> Any:
+        """Returns a deep copy of the cached data for file_path or None if not cached or outdated.
+        """
+        key = self._key(file_path)
+        with self._lock:
+            try:
+                signature, data = self._entries[key]
+            except KeyError:
+                return None
+            if signature != (stat.st_mtime_ns, stat.st_size):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(data)
+
+    def put(self, file_path: _FilePath, stat: os.stat_result, data: Any) -> None:
+        key = self._key(file_path)
+        with self._lock:
+            self._entries[key] = ((stat.st_mtime_ns, stat.st_size), copy.deepcopy(data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, file_path: _FilePath) -> None:
+        with self._lock:
+            self._entries.pop(self._key(file_path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_load_cache = _YamlLoadCache()
+
+
+def yaml_clear_cache() -> None:
+    """Removes all parsed file contents cached by yaml_load.
+    """
+    _load_cache.clear()
+
+
+def yaml_load(file_path: _FilePath, ignore_missing: Optional[bool] = False,
+              use_cache: Optional[bool] = False,
+              mmap_arrays: Optional[bool] = False) -> Dict[str, Any]:
     """Loads a qudi style YAML file.
     Raises OSError if the file does not exist or can not be accessed.
 
@@ -249,17 +384,40 @@ def yaml_load(file_path: _FilePath, ignore_missing: Optional[bool] = False) -> D
         Path to config file.
     ignore_missing : bool, optional
         Flag to suppress FileNotFoundError.
+    use_cache : bool, optional
+        Flag to return cached data if the file has been loaded before and its modification time
+        and size did not change since (default: False). The returned data is always a deep copy.
+        Useful for files that are read repeatedly. Ignored if mmap_arrays is True.
+    mmap_arrays : bool, optional
+        Flag to load numpy arrays stored in separate .npy files memory-mapped in copy-on-write mode
+        (default: False). Changes to these arrays are kept in memory and never written to disk.
 
     Returns
     -------
     dict
         The data as python/numpy objects in a dict.
     """
+    use_cache = use_cache and not mmap_arrays
     try:
         with open(file_path, 'r') as f:
-            data = YAML().load(f)
+            if use_cache:
+                # Get file signature before parsing so a concurrent change invalidates the entry
+                stat = os.fstat(f.fileno())
+                data = _load_cache.get(file_path, stat)
+                if data is not None:
+                    return data
+            mmap_mode = getattr(_thread_local, 'extndarray_mmap_mode', None)
+            _thread_local.extndarray_mmap_mode = 'c' if mmap_arrays else None
+            try:
+                with _cached_yaml() as yaml:
+                    data = yaml.load(f)
+            finally:
+                _thread_local.extndarray_mmap_mode = mmap_mode
             # yaml returns None if the stream was empty
-            return dict() if data is None else data
+            data = dict() if data is None else data
+            if use_cache:
+                _load_cache.put(file_path, stat, data)
+            return data
     except OSError:
         if ignore_missing:
             return dict()
@@ -269,6 +427,8 @@ def yaml_load(file_path: _FilePath, ignore_missing: Optional[bool] = False) -> D
 
 def yaml_dump(file_path: _FilePath, data: Mapping[str, Any]) -> None:
     """Saves data to file_path in qudi style YAML format. Creates subdirectories if needed.
+    The file is replaced atomically, i.e. a crash while writing never leaves a truncated file.
+    External .npy files of large arrays that are no longer referenced are removed afterwards.
 
     file_path : str
         Path to YAML file to save data into.
@@ -278,5 +438,31 @@ def yaml_dump(file_path: _FilePath, data: Mapping[str, Any]) -> None:
     file_dir = os.path.dirname(file_path)
     if file_dir:
         os.makedirs(file_dir, exist_ok=True)
-    with open(file_path, 'w') as f:
-        YAML().dump(data, f)
+    with atomic_open(file_path, 'w') as f:
+        with _cached_yaml() as yaml:
+            representer = yaml.representer
+            representer.extndarray_files = set()
+            yaml.dump(data, f)
+            extndarray_files = representer.extndarray_files
+    _load_cache.invalidate(file_path)
+    _remove_extndarray_files(file_path, keep=extndarray_files)
+
+
+def yaml_remove(file_path: _FilePath, ignore_missing: Optional[bool] = False) -> None:
+    """Removes a YAML file written by yaml_dump including all external .npy files it references.
+    Raises FileNotFoundError if the file does not exist unless ignore_missing is True.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to YAML file to remove.
+    ignore_missing : bool, optional
+        Flag to suppress FileNotFoundError.
+    """
+    _load_cache.invalidate(file_path)
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        if not ignore_missing:
+            raise
+    _remove_extndarray_files(file_path)
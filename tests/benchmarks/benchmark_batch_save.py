@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a benchmark for saving many small data sets (e.g. the points of a parameter
+sweep) with qudi.util.datastorage.TextDataStorage. It compares individual save_data calls with
+save_data_batch, serial and with a thread pool.
+
+Usage: python benchmark_batch_save.py [number_of_files] [number_of_workers]
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from datetime import datetime
+
+from qudi.util.datastorage import TextDataStorage
+
+
+def main(files=500, workers=4):
+    # Typical global metadata of a setup: some scalar parameters and a calibration array
+    for index in range(20):
+        TextDataStorage.add_global_metadata(f'setup_param_{index:d}', np.random.rand())
+    TextDataStorage.add_global_metadata('calibration', np.random.rand(50))
+    items = [(np.random.rand(10, 2), {'sweep_value': float(index)}, f'point_{index:d}')
+             for index in range(files)]
+    timestamp = datetime.now()
+    with tempfile.TemporaryDirectory() as root_dir:
+        results = dict()
+        storage = TextDataStorage(root_dir=os.path.join(root_dir, 'single'))
+        start = time.perf_counter()
+        for data, metadata, nametag in items:
+            storage.save_data(data, metadata=metadata, nametag=nametag, timestamp=timestamp)
+        results['save_data loop'] = time.perf_counter() - start
+
+        storage = TextDataStorage(root_dir=os.path.join(root_dir, 'batch'))
+        start = time.perf_counter()
+        storage.save_data_batch(items, timestamp=timestamp)
+        results['save_data_batch'] = time.perf_counter() - start
+
+        storage = TextDataStorage(root_dir=os.path.join(root_dir, 'parallel'))
+        start = time.perf_counter()
+        storage.save_data_batch(items, timestamp=timestamp, workers=workers)
+        results[f'save_data_batch ({workers:d} workers)'] = time.perf_counter() - start
+
+    for name, duration in results.items():
+        print(f'{name:>30s}: {1e6 * duration / files:8.1f} us/file')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing file size and save/load throughput of the qudi data storage classes for
+typical low-entropy measurement data (sparse histograms and count traces).
+
+Usage: python benchmark_binary_storage.py [<number of samples>]
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from qudi.util.datastorage import TextDataStorage, NpyDataStorage, NpzDataStorage
+
+
+def _file_size(file_path):
+    size = os.path.getsize(file_path)
+    metadata_path = os.path.splitext(file_path)[0] + '_metadata.txt'
+    if os.path.isfile(metadata_path):
+        size += os.path.getsize(metadata_path)
+    return size
+
+
+def main(samples=2_000_000):
+    rng = np.random.default_rng(42)
+    datasets = {
+        # Sparse histogram: mostly zero bins with a few peaks
+        'histogram': np.where(rng.random(samples) < 0.02,
+                              rng.poisson(50, samples),
+                              0).astype(np.int64),
+        # Low count rate photon counting trace
+        'counts': rng.poisson(3, samples).astype(np.int64),
+        # Full entropy floating point noise as reference
+        'noise': rng.random(samples),
+    }
+    with tempfile.TemporaryDirectory() as root_dir:
+        storages = {
+            'text': TextDataStorage(root_dir=root_dir, include_global_metadata=False),
+            'npy': NpyDataStorage(root_dir=root_dir, include_global_metadata=False),
+        }
+        for compression, level in (('zlib', 1), ('zlib', 6), ('bz2', 9), ('lzma', None)):
+            label = f'npz-{compression}' if level is None else f'npz-{compression}-{level:d}'
+            storages[label] = NpzDataStorage(root_dir=root_dir,
+                                             compression=compression,
+                                             compression_level=level,
+                                             include_global_metadata=False)
+        for data_name, data in datasets.items():
+            print(f'{data_name} ({data.size:d} x {data.dtype}, {data.nbytes / 2**20:.1f} MiB):')
+            for storage_name, storage in storages.items():
+                start = time.perf_counter()
+                file_path, _, _ = storage.save_data(data, filename=f'{data_name}_{storage_name}')
+                save_time = time.perf_counter() - start
+                start = time.perf_counter()
+                storage.load_data(file_path)
+                load_time = time.perf_counter() - start
+                print(f'    {storage_name:>12s}: '
+                      f'size {_file_size(file_path) / 2**20:8.2f} MiB, '
+                      f'save {data.nbytes / 2**20 / save_time:8.1f} MiB/s, '
+                      f'load {data.nbytes / 2**20 / load_time:8.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
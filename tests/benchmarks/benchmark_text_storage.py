@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a benchmark for appending data rows to text files with
+qudi.util.datastorage.TextDataStorage. It compares the legacy row-by-row formatting with the
+block-wise formatting of 2D numpy arrays and checks that both produce identical files.
+
+Usage: python benchmark_text_storage.py [number_of_rows] [number_of_columns]
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from datetime import datetime
+
+from qudi.util.datastorage import TextDataStorage
+
+
+class RowByRowTextDataStorage(TextDataStorage):
+    """TextDataStorage writing each row with a separate format and write call (legacy behaviour).
+    """
+    def _write_rows(self, file, data, row_fmt_str):
+        rows_written = 0
+        for data_row in data:
+            file.write(row_fmt_str.format(*data_row))
+            rows_written += 1
+        return rows_written
+
+
+def _time_append(storage, data, file_path):
+    start = time.perf_counter()
+    storage.append_file(data, file_path)
+    return time.perf_counter() - start
+
+
+def main(rows=1_000_000, columns=3):
+    datasets = {
+        'float': np.random.rand(rows, columns),
+        'int': np.random.randint(-2**31, 2**31, size=(rows, columns)),
+    }
+    timestamp = datetime.now()
+    with tempfile.TemporaryDirectory() as root_dir:
+        legacy = RowByRowTextDataStorage(root_dir=root_dir, include_global_metadata=False)
+        blocked = TextDataStorage(root_dir=root_dir, include_global_metadata=False)
+        for name, data in datasets.items():
+            legacy_path, _ = legacy.new_file(timestamp=timestamp, filename=f'legacy_{name}.dat')
+            blocked_path, _ = blocked.new_file(timestamp=timestamp, filename=f'blocked_{name}.dat')
+            legacy_time = _time_append(legacy, data, legacy_path)
+            blocked_time = _time_append(blocked, data, blocked_path)
+            with open(legacy_path, 'rb') as legacy_file, open(blocked_path, 'rb') as blocked_file:
+                identical = legacy_file.read() == blocked_file.read()
+            print(f'{name:>5s} ({rows:d}x{columns:d}): '
+                  f'row-by-row {rows / legacy_time:12.0f} rows/s, '
+                  f'block-wise {rows / blocked_time:12.0f} rows/s, '
+                  f'speedup {legacy_time / blocked_time:5.2f}, '
+                  f'identical output: {identical}, '
+                  f'file size {os.path.getsize(blocked_path) / 2**20:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a microbenchmark for loading and dumping typical qudi configuration and status
+variable files with qudi.util.yaml. It compares a new YAML engine per call (previous behaviour)
+with the per-thread cached engines used by yaml_load/yaml_dump and with the optional load cache.
+
+Usage: python benchmark_yaml.py [number_of_repetitions]
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from qudi.util.yaml import YAML, yaml_load, yaml_dump
+
+
+def _config_data(modules=30):
+    """Typical qudi configuration with hardware, logic and gui modules.
+    """
+    config = {'global': {'startup_modules': ['gui_0'],
+                         'remote_modules_server': {'address': 'localhost', 'port': 12345},
+                         'namespace_server_port': 18861,
+                         'force_remote_calls_by_value': True,
+                         'default_data_dir': None,
+                         'daily_data_dirs': True}}
+    for base in ('hardware', 'logic', 'gui'):
+        config[base] = {
+            f'{base}_{index:d}': {'module.Class': f'dummy.{base}_dummy.Dummy{index:d}',
+                                  'connect': {'target': f'logic_{index:d}'},
+                                  'options': {'rate': 1e6,
+                                              'channels': ['ch0', 'ch1', 'ch2'],
+                                              'limits': {'min': -10.0, 'max': 10.0},
+                                              'name': f'device {index:d}'}}
+            for index in range(modules)
+        }
+    return config
+
+
+def _status_data():
+    """Typical status variables of a logic module including numpy arrays.
+    """
+    return {'scan_range': [1e-6, 5e-6],
+            'resolution': 100,
+            'averages': np.int64(10),
+            'frequency': np.float64(2.87e9),
+            'settings': {'power': -10.0, 'mode': 'cw', 'enabled': True},
+            'fit_config': [{'name': f'fit_{index:d}', 'model': 'Lorentzian', 'estimator': 'Dip'}
+                           for index in range(5)],
+            'small_array': np.linspace(0, 1, 10),
+            'data': np.random.rand(100, 100)}
+
+
+def _timeit(func, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - start) / repetitions
+
+
+def _load_new_engine(file_path):
+    with open(file_path, 'r') as file:
+        return YAML().load(file)
+
+
+def _dump_new_engine(file_path, data):
+    with open(file_path, 'w') as file:
+        YAML().dump(data, file)
+
+
+def main(repetitions=50):
+    results = dict()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, data in (('config', _config_data()), ('status', _status_data())):
+            file_path = os.path.join(tmp_dir, f'{name}.cfg')
+            results[f'{name} dump (new engine)'] = _timeit(
+                lambda path=file_path, data=data: _dump_new_engine(path, data), repetitions
+            )
+            results[f'{name} dump (yaml_dump)'] = _timeit(
+                lambda path=file_path, data=data: yaml_dump(path, data), repetitions
+            )
+            results[f'{name} load (new engine)'] = _timeit(
+                lambda path=file_path: _load_new_engine(path), repetitions
+            )
+            results[f'{name} load (yaml_load)'] = _timeit(
+                lambda path=file_path: yaml_load(path), repetitions
+            )
+            results[f'{name} load (yaml_load, cached)'] = _timeit(
+                lambda path=file_path: yaml_load(path, use_cache=True), repetitions
+            )
+
+    for name, duration in results.items():
+        print(f'{name:>30s}: {1e6 * duration:10.1f} us')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the crash-safe file writing helpers in qudi.util.atomicfile.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from qudi.util.atomicfile import atomic_open, get_write_mode, set_write_mode, AtomicWriteMode
+
+
+class TestAtomicOpen(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._tmp_dir.name, 'test.txt')
+        with open(self.file_path, 'w') as file:
+            file.write('old')
+
+    def tearDown(self):
+        set_write_mode(AtomicWriteMode.FAST)
+        self._tmp_dir.cleanup()
+
+    def _read(self, file_path=None):
+        with open(self.file_path if file_path is None else file_path, 'r') as file:
+            return file.read()
+
+    def test_replace(self):
+        with atomic_open(self.file_path, 'w') as file:
+            file.write('new')
+            self.assertEqual(file.target_path, self.file_path)
+            # Target file is untouched until the context exits
+            self.assertEqual(self._read(), 'old')
+        self.assertEqual(self._read(), 'new')
+        self.assertEqual(os.listdir(self._tmp_dir.name), ['test.txt'])
+
+    def test_failed_write(self):
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.file_path, 'w') as file:
+                file.write('new')
+                raise RuntimeError('crash while writing')
+        self.assertEqual(self._read(), 'old')
+        self.assertEqual(os.listdir(self._tmp_dir.name), ['test.txt'])
+
+    def test_durable_group_commit(self):
+        set_write_mode('durable')
+        self.assertIs(get_write_mode(), AtomicWriteMode.DURABLE)
+
+        def write(index):
+            file_path = os.path.join(self._tmp_dir.name, f'{index:d}.txt')
+            with atomic_open(file_path, 'w') as file:
+                file.write(str(index))
+            return file_path
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            file_paths = list(executor.map(write, range(32)))
+        for index, file_path in enumerate(file_paths):
+            self.assertEqual(self._read(file_path), str(index))
+        self.assertEqual(len(os.listdir(self._tmp_dir.name)), 33)
+
+
+if __name__ == '__main__':
+    unittest.main()
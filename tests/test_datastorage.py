@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi data storage classes.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+import itertools
+import unittest
+import tempfile
+import numpy as np
+
+from datetime import datetime, timedelta
+from configparser import ConfigParser
+
+from qudi.util.datastorage import TextDataStorage, CsvDataStorage, parse_metadata_value
+from qudi.util.datastorage import str_dict_to_metadata, metadata_to_str_dict, format_header
+from qudi.util.datastorage import get_info_from_file, DataStorageBase, NpzDataStorage
+from qudi.util.datastorage import NpyDataStorage, Hdf5DataStorage, AsyncSaveQueue
+from qudi.util.datastorage import ChunkedArrayDataStorage, ThumbnailRenderer, ImageFormat
+from qudi.util.datacatalog import DataCatalog
+
+
+class TestTextDataStorage(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.storage = TextDataStorage(root_dir=self._tmp_dir.name, include_global_metadata=False)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _read_data_lines(self, file_path):
+        with open(file_path, 'r') as file:
+            return file.read().split('---- END HEADER ----\n', 1)[1]
+
+    def test_append_block_matches_row_format(self):
+        self.storage._write_block_rows = 7
+        for data in (np.random.rand(50, 3) * 1e3, np.random.randint(-1000, 1000, size=(50, 4))):
+            file_path, _ = self.storage.new_file(filename='block.dat')
+            self.assertEqual(self.storage.append_file(data, file_path), data.shape)
+            row_fmt_str = self.storage._get_row_format(data[0])
+            expected = ''.join(row_fmt_str.format(*row) for row in data)
+            self.assertEqual(self._read_data_lines(file_path), expected)
+
+    def test_stream_buffers_and_flushes(self):
+        data = np.random.rand(10, 3)
+        with self.storage.new_stream(filename='stream.dat', flush_rows=4,
+                                     flush_interval=3600) as stream:
+            stream.write(data[0])
+            self.assertEqual(self._read_data_lines(stream.file_path), '')
+            stream.write(data[1:4])
+            self.assertEqual(len(self._read_data_lines(stream.file_path).splitlines()), 4)
+            stream.write(data[4:])
+        self.assertTrue(stream.closed)
+        np.testing.assert_allclose(self.storage.load_data(stream.file_path)[0], data, rtol=1e-14)
+
+    def test_stream_flushes_without_further_writes(self):
+        with self.storage.new_stream(filename='stream.dat', flush_rows=100,
+                                     flush_interval=0.05) as stream:
+            stream.write(np.arange(3))
+            deadline = time.monotonic() + 5
+            while not self._read_data_lines(stream.file_path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(self._read_data_lines(stream.file_path).splitlines()), 1)
+
+    def test_header_errors_match_configparser(self):
+        for metadata in ({'a': 1, 'A': 2}, {'ok': '1%%2', 'bad': '5%(b)s %x'}):
+            config = ConfigParser(comment_prefixes=None, delimiters=('=',))
+            with self.assertRaises(Exception) as expected:
+                config['Metadata'] = metadata_to_str_dict(metadata)
+            with self.assertRaises(type(expected.exception)) as raised:
+                format_header(datetime.now(), metadata=metadata)
+            self.assertEqual(str(raised.exception), str(expected.exception))
+
+    def test_save_load_roundtrip(self):
+        data = np.random.rand(20, 2)
+        file_path, _, _ = self.storage.save_data(data, metadata={'answer': 42})
+        loaded, metadata, general = self.storage.load_data(file_path)
+        np.testing.assert_allclose(loaded, data, rtol=1e-14)
+        self.assertEqual(metadata, {'answer': 42})
+        self.assertEqual(general['column_dtypes'], (float, float))
+
+    def test_chunked_load_matches_genfromtxt(self):
+        mixed = np.array([[1, 2.5, 'x'], [3, 4.5, 'yy'], [5, 6.5, 'zzz']], dtype=object)
+        for storage_cls in (TextDataStorage, CsvDataStorage):
+            storage = storage_cls(root_dir=self._tmp_dir.name, include_global_metadata=False)
+            for data in (np.random.rand(100, 3), np.random.randint(-99, 99, size=(100, 2)), mixed):
+                column_headers = ('a', 'b', 'c')[:data.shape[1]]
+                file_path, _, _ = storage.save_data(data, column_headers=column_headers)
+                expected = storage.load_data(file_path)[0]
+                for block_rows in (1, 7, 1000):
+                    loaded = storage.load_data_chunked(file_path, block_rows=block_rows)[0]
+                    np.testing.assert_array_equal(loaded, expected)
+                    self.assertEqual(loaded.dtype, expected.dtype)
+                blocks = list(storage.iter_data_blocks(file_path, block_rows=40))
+                self.assertEqual(sum(len(block) for block in blocks), len(data))
+                self.assertTrue(all(len(block) <= 40 for block in blocks))
+
+
+class TestMetadataParsing(unittest.TestCase):
+
+    def test_literal_values(self):
+        values = [42, -1.5e-9, 1 + 2j, 'a=b', b'xyz', True, None, [1, 2.5, 'c'], (1, 2), {'a': [1]},
+                  {1, 2}, datetime(2021, 5, 6, 11, 11, 11), np.float32(1.5), np.int64(-3)]
+        for value in values:
+            parsed = parse_metadata_value(repr(value))
+            self.assertEqual(parsed, value)
+            self.assertIs(type(parsed), type(value))
+        self.assertTrue(np.isnan(parse_metadata_value('nan')))
+
+    def test_array_values(self):
+        for value in (np.arange(12).reshape(3, 4), np.array([1.5, 2], dtype=np.float32),
+                      np.array(['ab', 'c']), np.array([1 + 1j])):
+            parsed = parse_metadata_value(repr(value))
+            np.testing.assert_array_equal(parsed, value)
+            self.assertEqual(parsed.dtype, value.dtype)
+
+    def test_no_eval(self):
+        for value_str in ('__import__("os").getcwd()', 'print(1)', 'open("x")', '[1, 2][0]'):
+            with self.assertRaises(ValueError):
+                parse_metadata_value(value_str)
+
+    def test_eval_fallback_opt_in(self):
+        str_dict = {'literal': '[1, 2]', 'expression': '[1, 2][0]'}
+        self.assertEqual(str_dict_to_metadata(str_dict), {'literal': [1, 2],
+                                                          'expression': '[1, 2][0]'})
+        with self.assertLogs('qudi.util.datastorage', level='WARNING'):
+            metadata = str_dict_to_metadata(str_dict, allow_eval=True)
+        self.assertEqual(metadata, {'literal': [1, 2], 'expression': 1})
+
+    def test_header_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = TextDataStorage(root_dir=tmp_dir, include_global_metadata=False)
+            file_path, _, _ = storage.save_data(np.ones((2, 2)), metadata={'a': 1})
+            general, metadata, header_lines = get_info_from_file(file_path)
+            metadata['a'] = 2
+            self.assertEqual(get_info_from_file(file_path)[1], {'a': 1})
+            # Overwriting the file must invalidate the cached header
+            storage.save_data(np.ones((2, 2)),
+                              metadata={'a': 'changed'},
+                              filename=os.path.basename(file_path))
+            self.assertEqual(get_info_from_file(file_path)[1], {'a': 'changed'})
+
+
+class TestGlobalMetadata(unittest.TestCase):
+
+    def tearDown(self):
+        DataStorageBase.remove_global_metadata(['test_a', 'test_b'])
+
+    def test_snapshots(self):
+        DataStorageBase.add_global_metadata('test_a', [1, 2])
+        snapshot = DataStorageBase.get_global_metadata_snapshot()
+        TextDataStorage.add_global_metadata({'test_b': 2})
+        # Old snapshots are never modified
+        self.assertNotIn('test_b', snapshot)
+        self.assertEqual(snapshot['test_a'], [1, 2])
+        new_snapshot = CsvDataStorage.get_global_metadata_snapshot()
+        self.assertEqual(new_snapshot.version, snapshot.version + 1)
+        self.assertEqual(new_snapshot['test_b'], 2)
+        with self.assertRaises(TypeError):
+            new_snapshot['test_b'] = 3
+        with self.assertRaises(KeyError):
+            DataStorageBase.add_global_metadata('test_b', 3)
+        DataStorageBase.remove_global_metadata('test_a')
+        self.assertNotIn('test_a', DataStorageBase.get_global_metadata())
+        self.assertIn('test_a', new_snapshot)
+
+    def test_save_data_batch(self):
+        DataStorageBase.add_global_metadata('test_a', np.arange(5))
+        items = [(np.random.rand(5, 2), {'test_b': index}, f'point_{index:d}') for index in
+                 range(10)]
+        items.append((np.random.rand(5, 2),))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = TextDataStorage(root_dir=os.path.join(tmp_dir, 'sweep'))
+            for workers in (None, 4):
+                results = storage.save_data_batch(items, workers=workers)
+                self.assertEqual(len({timestamp for _, timestamp, _ in results}), 1)
+                for (data, *item), (file_path, _, _) in zip(items, results):
+                    loaded, metadata, _ = storage.load_data(file_path)
+                    np.testing.assert_allclose(loaded, data, rtol=1e-14)
+                    np.testing.assert_array_equal(metadata.pop('test_a'), np.arange(5))
+                    self.assertEqual(metadata, item[0] if item else dict())
+                self.assertTrue(results[-1][0].endswith('_10.dat'))
+            with self.assertRaises(ValueError):
+                storage.save_data_batch([(items[0][0], None, 'x'), (items[1][0], None, 'x')])
+
+
+class TestAsyncSaving(unittest.TestCase):
+
+    def test_queue_order_errors_and_shutdown(self):
+        queue = AsyncSaveQueue(max_workers=1, max_pending=4)
+        executed = list()
+
+        def job(value):
+            time.sleep(0.01)
+            executed.append(value)
+            return value
+
+        futures = [queue.submit(job, ii) for ii in range(10)]
+        failed = queue.submit(lambda: 1 / 0)
+        last = queue.submit(job, 10)
+        queue.shutdown(wait=True)
+        self.assertTrue(all(f.done() for f in futures + [failed, last]))
+        self.assertEqual(executed, list(range(11)))
+        self.assertEqual([f.result() for f in futures], list(range(10)))
+        with self.assertRaises(ZeroDivisionError):
+            failed.result()
+        self.assertEqual(queue.pending, 0)
+
+    def test_save_data_async(self):
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        data = np.random.rand(20, 2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = TextDataStorage(root_dir=tmp_dir, include_global_metadata=False)
+            metadata = {'power': 1}
+            figure, ax = plt.subplots()
+            ax.plot(data[:, 0], data[:, 1])
+            future = storage.save_data_async(data, metadata=metadata, thumbnail=figure)
+            # Arguments are copied at submit time
+            metadata['power'] = 2
+            data[:] = 0
+            file_path, _, shape = future.result(timeout=60)
+            self.assertTrue(DataStorageBase.wait_for_async_saves(timeout=60))
+            self.assertEqual(shape, (20, 2))
+            loaded, metadata, _ = storage.load_data(file_path)
+            self.assertEqual(metadata, {'power': 1})
+            self.assertTrue(np.all(loaded != 0))
+            self.assertTrue(os.path.isfile(os.path.splitext(file_path)[0] + '.png'))
+            self.assertFalse(plt.fignum_exists(figure.number))
+            # Errors propagate through the returned future
+            future = storage.save_data_async(data, column_dtypes='invalid')
+            with self.assertRaises(TypeError):
+                future.result(timeout=60)
+
+
+class TestThumbnailRendering(unittest.TestCase):
+
+    def test_render_in_process_pool(self):
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        renderer = ThumbnailRenderer(max_workers=1, max_pending=2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            try:
+                futures = list()
+                for image_format in (ImageFormat.PNG, ImageFormat.PDF):
+                    figure, ax = plt.subplots()
+                    ax.plot(np.arange(10))
+                    file_path = os.path.join(tmp_dir, 'thumbnail' + image_format.value)
+                    futures.append(renderer.submit_figure(figure, file_path, image_format))
+                    # Figures are closed at submit time
+                    self.assertFalse(plt.fignum_exists(figure.number))
+                for future in futures:
+                    self.assertTrue(os.path.getsize(future.result(timeout=60)) > 0)
+            finally:
+                renderer.shutdown(wait=True)
+
+            storage = TextDataStorage(root_dir=tmp_dir, include_global_metadata=False)
+            figure, ax = plt.subplots()
+            ax.plot(np.arange(10))
+            file_path = storage.save_thumbnail_async(figure, os.path.join(tmp_dir, 'async'))
+            self.assertTrue(DataStorageBase.wait_for_thumbnails(timeout=60))
+            self.assertEqual(file_path, os.path.join(tmp_dir, 'async.png'))
+            self.assertTrue(os.path.isfile(file_path))
+
+
+class TestNpyDataStorage(unittest.TestCase):
+
+    def test_single_file(self):
+        data = np.random.rand(20, 3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = NpyDataStorage(root_dir=tmp_dir,
+                                     single_file=True,
+                                     include_global_metadata=False)
+            file_path, timestamp, _ = storage.save_data(data, metadata={'power': 1.5})
+            self.assertEqual(os.listdir(tmp_dir), [os.path.basename(file_path)])
+            self.assertEqual(NpyDataStorage.load_metadata(file_path)[0], {'power': 1.5})
+            loaded, metadata, general = NpyDataStorage.load_data(file_path, mmap_mode='r')
+            self.assertIsInstance(loaded, np.memmap)
+            np.testing.assert_array_equal(loaded, data)
+            self.assertEqual(general['timestamp'], timestamp)
+            # Appendable single files
+            file_path, _ = storage.new_file(row_shape=(3,), metadata={'power': 2})
+            storage.append_file(data, file_path)
+            storage.append_file(data[0], file_path)
+            loaded, metadata, _ = NpyDataStorage.load_data(file_path)
+            np.testing.assert_array_equal(loaded, np.vstack([data, data[:1]]))
+            self.assertEqual(metadata, {'power': 2})
+
+
+class TestNpzDataStorage(unittest.TestCase):
+
+    def test_save_load_roundtrip(self):
+        data = np.random.poisson(2, size=(100, 3))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for compression in (None, 'zlib', 'lzma', 'bz2'):
+                storage = NpzDataStorage(root_dir=tmp_dir,
+                                         compression=compression,
+                                         include_global_metadata=False)
+                file_path, timestamp, _ = storage.save_data(data,
+                                                            metadata={'power': 1.5},
+                                                            nametag=str(compression))
+                loaded, metadata, general = storage.load_data(file_path)
+                np.testing.assert_array_equal(loaded, data)
+                self.assertEqual(metadata, {'power': 1.5})
+                self.assertEqual(general['timestamp'], timestamp)
+                self.assertEqual(NpzDataStorage.get_data_info(file_path), (data.shape, data.dtype))
+                # Archive must stay readable by plain numpy
+                with np.load(file_path) as archive:
+                    np.testing.assert_array_equal(archive['data'], data)
+            self.assertEqual(len(os.listdir(tmp_dir)), 4)
+
+    def test_compression_level_validation(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for compression, level in ((None, 5), ('lzma', 5), ('bz2', 0), ('zlib', 10),
+                                       ('zlib', 1.5)):
+                with self.assertRaises(ValueError):
+                    NpzDataStorage(root_dir=tmp_dir,
+                                   compression=compression,
+                                   compression_level=level)
+            data = np.arange(10)
+            for compression, level in (('zlib', 0), ('bz2', 9)):
+                storage = NpzDataStorage(root_dir=tmp_dir,
+                                         compression=compression,
+                                         compression_level=level,
+                                         include_global_metadata=False)
+                file_path, _, _ = storage.save_data(data, nametag=compression)
+                np.testing.assert_array_equal(storage.load_data(file_path)[0], data)
+
+
+class TestHdf5DataStorage(unittest.TestCase):
+
+    def test_save_append_and_partial_load(self):
+        data = np.random.rand(50, 3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = Hdf5DataStorage(root_dir=tmp_dir,
+                                      dataset_name='counts',
+                                      chunk_rows=16,
+                                      include_global_metadata=False)
+            file_path, timestamp, _ = storage.save_data(data, metadata={'power': 1.5})
+            loaded, metadata, general = Hdf5DataStorage.load_data(file_path)
+            np.testing.assert_array_equal(loaded, data)
+            self.assertEqual(metadata, {'power': 1.5})
+            self.assertEqual(general['timestamp'], timestamp)
+            self.assertEqual(Hdf5DataStorage.load_metadata(file_path)[0], {'power': 1.5})
+            # Append single and multiple rows
+            file_path, _ = storage.new_file(nametag='append')
+            self.assertEqual(storage.append_file(data[:10], file_path), (10, (3,)))
+            self.assertEqual(storage.append_file(data[10], file_path), (1, (3,)))
+            self.assertEqual(storage.append_file(data[11:], file_path), (39, (3,)))
+            with self.assertRaises(ValueError):
+                storage.append_file(np.ones((2, 4)), file_path)
+            np.testing.assert_array_equal(Hdf5DataStorage.load_data(file_path)[0], data)
+            # Partial load
+            loaded = Hdf5DataStorage.load_data(file_path, index=np.s_[20:30, 1])[0]
+            np.testing.assert_array_equal(loaded, data[20:30, 1])
+
+    def test_string_data(self):
+        data = np.array([['a', 'bc'], ['def', 'ä']])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = Hdf5DataStorage(root_dir=tmp_dir, include_global_metadata=False)
+            file_path, _, _ = storage.save_data(data)
+            storage.append_file(np.array(['gh', 'i']), file_path)
+            loaded = Hdf5DataStorage.load_data(file_path)[0]
+            np.testing.assert_array_equal(loaded, np.vstack([data, [['gh', 'i']]]))
+            with self.assertRaises(TypeError):
+                storage.save_data(np.array([1, 'a', None], dtype=object), nametag='object')
+            self.assertEqual(len(os.listdir(tmp_dir)), 1)
+
+
+class TestChunkedArrayDataStorage(unittest.TestCase):
+
+    def test_write_and_read_blocks(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = ChunkedArrayDataStorage(root_dir=tmp_dir,
+                                              chunk_shape=(4, 3, 2),
+                                              include_global_metadata=False)
+            file_path, timestamp = storage.new_file(shape=(10, 7, 5),
+                                                    fill_value=-1,
+                                                    metadata={'axes': ['x', 'y', 'z']})
+            expected = np.full((10, 7, 5), -1.)
+            # Blocks not aligned to the chunk grid only partially cover chunks at the edges
+            for offset, shape in (((0, 0, 0), (4, 3, 2)), ((3, 2, 1), (5, 4, 3)),
+                                  ((9, 6, 4), (1, 1, 1))):
+                block = np.random.rand(*shape)
+                storage.write_block(block, file_path, offset=offset)
+                expected[tuple(slice(o, o + n) for o, n in zip(offset, shape))] = block
+                np.testing.assert_array_equal(ChunkedArrayDataStorage.load_data(file_path)[0],
+                                              expected)
+            chunk_shape, written = ChunkedArrayDataStorage.get_written_chunks(file_path)
+            self.assertEqual(chunk_shape, (4, 3, 2))
+            self.assertEqual(written,
+                             {(2, 2, 2)} | set(itertools.product((0, 1), repeat=3)))
+            # Partial reads with slices, steps and integer indices
+            for index in (np.s_[2:9, 1, ::2], np.s_[-1], np.s_[::3, 5:, 4], np.s_[4:4]):
+                loaded = ChunkedArrayDataStorage.load_data(file_path, index=index)[0]
+                np.testing.assert_array_equal(loaded, expected[index])
+            with self.assertRaises(IndexError):
+                storage.write_block(np.ones((2, 2, 2)), file_path, offset=(9, 0, 0))
+            _, metadata, general = ChunkedArrayDataStorage.load_data(file_path)
+            self.assertEqual(metadata, {'axes': ['x', 'y', 'z']})
+            self.assertEqual(general['timestamp'], timestamp)
+
+    def test_open_stores_are_bounded(self):
+        data = np.arange(12).reshape(3, 4)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = ChunkedArrayDataStorage(root_dir=tmp_dir, include_global_metadata=False)
+            paths = [storage.save_data(data, nametag=str(ii))[0]
+                     for ii in range(storage._max_open_stores + 4)]
+            self.assertEqual(len(storage._open_stores), storage._max_open_stores)
+            self.assertNotIn(paths[0], storage._open_stores)
+            storage.write_block(np.zeros((1, 4), dtype=int), paths[0], offset=(1, 0))
+            self.assertIn(paths[0], storage._open_stores)
+            storage.close_file(paths[0])
+            self.assertNotIn(paths[0], storage._open_stores)
+            expected = data.copy()
+            expected[1] = 0
+            np.testing.assert_array_equal(ChunkedArrayDataStorage.load_data(paths[0])[0], expected)
+
+
+class TestDataCatalog(unittest.TestCase):
+
+    def test_scan_and_query(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = TextDataStorage(root_dir=tmp_dir, include_global_metadata=False)
+            now = datetime.now()
+            for ii in range(4):
+                storage.save_data(np.ones((2, 2)),
+                                  metadata={'power': ii, 'sample': 'ab'[ii % 2]},
+                                  nametag='odmr',
+                                  timestamp=now - timedelta(hours=ii))
+            with DataCatalog(os.path.join(tmp_dir, 'catalog.sqlite')) as catalog:
+                self.assertEqual(catalog.scan(tmp_dir, workers=1), 4)
+                self.assertEqual(catalog.scan(tmp_dir, workers=1), 0)
+                entries = catalog.query(nametag='odmr', metadata={'power': ('>=', 1),
+                                                                  'sample': 'a'})
+                self.assertEqual([e.timestamp for e in entries], [now - timedelta(hours=2)])
+                # Newly created files are added by the storage object itself
+                DataStorageBase.set_data_catalog(catalog)
+                try:
+                    file_path, _, _ = storage.save_data(np.ones(2), metadata={'power': 1.5})
+                finally:
+                    DataStorageBase.set_data_catalog(None)
+                self.assertEqual(len(catalog.query(start=now - timedelta(minutes=1))), 2)
+                self.assertEqual(catalog.get_metadata(file_path), {'power': 1.5})
+
+
+    def test_scan_sibling_directories(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = dict()
+            for dir_name in ('run_1', 'runX1', 'run', 'Run'):
+                storage = TextDataStorage(root_dir=os.path.join(tmp_dir, dir_name),
+                                          include_global_metadata=False)
+                if dir_name == 'run':
+                    os.makedirs(storage.root_dir)
+                else:
+                    paths[dir_name] = storage.save_data(np.ones(2), nametag=dir_name)[0]
+            with DataCatalog(os.path.join(tmp_dir, 'catalog.sqlite')) as catalog:
+                self.assertEqual(catalog.scan(tmp_dir, workers=1), 3)
+                catalog.scan(os.path.join(tmp_dir, 'run_1'), workers=1, remove_missing=True)
+                catalog.scan(os.path.join(tmp_dir, 'run'), workers=1, remove_missing=True)
+                self.assertEqual(sorted(e.path for e in catalog.query()), sorted(paths.values()))
+                entries = catalog.query(root_dir=os.path.join(tmp_dir, 'run_1'))
+                self.assertEqual([e.path for e in entries], [paths['run_1']])
+                self.assertEqual(catalog.query(root_dir=os.path.join(tmp_dir, 'run')), [])
+
+if __name__ == '__main__':
+    unittest.main()
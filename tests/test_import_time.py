@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains regression tests making sure that heavy dependencies are not imported by
+lightweight qudi utility modules at import time.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import sys
+import unittest
+import subprocess
+
+
+def get_imported_modules(code):
+    """Runs the given code in a fresh interpreter with "-X importtime" and returns a dict of all
+    imported module names with their cumulative import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True,
+                            text=True,
+                            check=True)
+    modules = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        try:
+            modules[name.strip()] = int(cumulative)
+        except ValueError:
+            pass  # table header
+    return modules
+
+
+class TestImportTime(unittest.TestCase):
+    _heavy_modules = ('matplotlib', 'lmfit', 'scipy', 'h5py', 'pyqtgraph')
+
+    def assert_not_imported(self, code):
+        modules = get_imported_modules(code)
+        imported = {name.split('.', 1)[0] for name in modules}.intersection(self._heavy_modules)
+        self.assertFalse(imported, f'"{code}" imports heavy dependencies: {sorted(imported)}')
+
+    def test_datastorage(self):
+        self.assert_not_imported('import qudi.util.datastorage')
+
+    def test_datafitting(self):
+        self.assert_not_imported('import qudi.util.datafitting')
+
+    def test_fit_model_names(self):
+        self.assert_not_imported('from qudi.util.datafitting import get_fit_model_names\n'
+                                 'assert "Gaussian" in get_fit_model_names()')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi module manager.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import sys
+import time
+import types
+import unittest
+import tempfile
+import threading
+from unittest import mock
+from PySide6 import QtCore
+
+from qudi.core.module import Base, LogicBase
+from qudi.core.connector import Connector
+from qudi.core.configoption import ConfigOption
+from qudi.core.statusvariable import StatusVar
+from qudi.core.statusstore import YamlStatusStore
+from qudi.core.modulemanager import ModuleManager
+from qudi.core.threadmanager import ThreadManager
+
+
+class _SlowHardware(Base):
+    _delay = ConfigOption(name='delay', default=0.3)
+    _fail = ConfigOption(name='fail', default=False)
+
+    def on_activate(self):
+        self.activated_in_main_thread = threading.current_thread() is threading.main_thread()
+        time.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError('Simulated hardware failure')
+
+    def on_deactivate(self):
+        pass
+
+
+class _SlowThreadedHardware(_SlowHardware):
+    _threaded = True
+
+
+class _TimerHardware(Base):
+    """Creates a QTimer without parent in on_activate.
+    """
+
+    def on_activate(self):
+        self.ticks = 0
+        self.timer = QtCore.QTimer()
+        self.timer.setInterval(10)
+        self.timer.timeout.connect(self._tick)
+        self.timer.start()
+
+    def on_deactivate(self):
+        self.timer.stop()
+
+    def _tick(self):
+        self.ticks += 1
+
+
+class _DependentLogic(LogicBase):
+    _first = Connector(name='first', interface='Base')
+    _second = Connector(name='second', interface='Base')
+    value = StatusVar(default=0)
+
+    def on_activate(self):
+        self.connected = (self._first(), self._second())
+
+    def on_deactivate(self):
+        pass
+
+
+class _QudiMain:
+    def __init__(self):
+        self.thread_manager = ThreadManager.instance() or ThreadManager()
+        self.remote_modules_server = None
+
+
+class TestParallelActivation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        cls._qudi_main = _QudiMain()
+        cls.manager = ModuleManager.instance() or ModuleManager(qudi_main=cls._qudi_main)
+        # Make the dummy modules importable by the module manager
+        module = types.ModuleType('qudi.hardware._test_parallel_activation')
+        module._SlowHardware = _SlowHardware
+        module._SlowThreadedHardware = _SlowThreadedHardware
+        module._TimerHardware = _TimerHardware
+        module._DependentLogic = _DependentLogic
+        sys.modules[module.__name__] = module
+        sys.modules['qudi.logic._test_parallel_activation'] = module
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.modules.pop('qudi.hardware._test_parallel_activation', None)
+        sys.modules.pop('qudi.logic._test_parallel_activation', None)
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        for target in ('qudi.util.paths.get_appdata_dir', 'qudi.core.statusstore.get_appdata_dir'):
+            patcher = mock.patch(target, return_value=self._tmp_dir.name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.manager.clear()
+        self._tmp_dir.cleanup()
+
+    def _add_hardware(self, name, cls='_SlowThreadedHardware', **options):
+        self.manager.add_module(name, 'hardware', {
+            'module.Class': f'_test_parallel_activation.{cls}', 'options': options
+        })
+
+    def _add_logic(self, name, first, second):
+        self.manager.add_module(name, 'logic', {
+            'module.Class': '_test_parallel_activation._DependentLogic',
+            'connect': {'first': first, 'second': second}
+        })
+
+    def test_concurrent_activation(self):
+        self._add_hardware('hw_b')
+        self._add_hardware('hw_a')
+        self._add_logic('logic', 'hw_a', 'hw_b')
+        start = time.perf_counter()
+        results = self.manager.activate_modules(['logic'], max_workers=2)
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.assertEqual(list(results.items()), [('hw_a', None), ('hw_b', None), ('logic', None)])
+        self.assertTrue(all(self.manager.module_states[name] == 'idle' for name in results))
+        for name in ('hw_a', 'hw_b'):
+            instance = self.manager[name].instance
+            self.assertFalse(instance.activated_in_main_thread)
+            self.assertIsNot(instance.thread(), self._app.thread())
+        logic = self.manager['logic'].instance
+        self.assertEqual(logic.connected, (self.manager['hw_a'].instance,
+                                           self.manager['hw_b'].instance))
+
+    def test_non_threaded_activation_in_main_thread(self):
+        self._add_hardware('hw_a', cls='_SlowHardware', delay=0)
+        self._add_hardware('hw_timer', cls='_TimerHardware')
+        self._add_logic('logic', 'hw_a', 'hw_timer')
+        results = self.manager.activate_modules(['logic'], max_workers=2)
+        self.assertEqual(list(results.items()),
+                         [('hw_a', None), ('hw_timer', None), ('logic', None)])
+        self.assertTrue(self.manager['hw_a'].instance.activated_in_main_thread)
+        # A QTimer created without parent in on_activate must keep working
+        instance = self.manager['hw_timer'].instance
+        self.assertIs(instance.timer.thread(), self._app.thread())
+        deadline = time.monotonic() + 5
+        while instance.ticks < 3 and time.monotonic() < deadline:
+            self._app.processEvents()
+            time.sleep(0.01)
+        self.assertGreaterEqual(instance.ticks, 3)
+
+    def test_errors_and_timeout(self):
+        self._add_hardware('hw_a', fail=True, delay=0)
+        self._add_hardware('hw_b', delay=1)
+        self._add_hardware('hw_c', delay=0)
+        self._add_logic('logic_1', 'hw_a', 'hw_c')
+        self._add_logic('logic_2', 'hw_b', 'hw_c')
+        results = self.manager.activate_modules(['logic_2', 'logic_1'], timeout={'hw_b': 0.2})
+        self.assertEqual(list(results), ['hw_a', 'hw_b', 'hw_c', 'logic_1', 'logic_2'])
+        self.assertIsInstance(results['hw_a'], RuntimeError)
+        self.assertIsInstance(results['hw_b'], TimeoutError)
+        self.assertIsNone(results['hw_c'])
+        self.assertIn('hw_a', str(results['logic_1']))
+        self.assertIn('hw_b', str(results['logic_2']))
+        self.assertEqual(self.manager.module_states['logic_1'], 'not loaded')
+        # Activation exceeding the timeout is finished in the background
+        deadline = time.monotonic() + 5
+        with self.assertLogs('qudi.core.modulemanager', level='INFO') as logs:
+            while time.monotonic() < deadline and not any(
+                    'finished activation after timeout' in line for line in logs.output):
+                self._app.processEvents()
+                time.sleep(0.01)
+        self.assertEqual(self.manager.module_states['hw_b'], 'idle')
+
+    def test_prefetch_discarded_with_app_data(self):
+        self._add_hardware('hw_a', cls='_SlowHardware', fail=True, delay=0)
+        self._add_hardware('hw_b', cls='_SlowHardware', delay=0)
+        self._add_logic('logic', 'hw_a', 'hw_b')
+        YamlStatusStore().dump('_DependentLogic', 'logic', 'logic', {'value': 42})
+        self.manager.prefetch_status_variables()
+        with self.assertRaises(RuntimeError):
+            self.manager.activate_module('logic')
+        self.manager.clear_module_app_data('logic')
+        self.manager['hw_a'].instance._fail = False
+        self.manager.activate_module('logic')
+        self.assertEqual(self.manager['logic'].instance.value, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi disk-backed ring buffer.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+import threading
+import numpy as np
+
+from qudi.util.ringbuffer import DiskRingBuffer
+from qudi.util.datastorage import NpyDataStorage
+
+
+class TestDiskRingBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._tmp_dir.name, 'buffer.qring')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_wrap_around(self):
+        with DiskRingBuffer.create(self.file_path, 100, dtype=np.int64, row_shape=(2,)) as buffer:
+            size = os.path.getsize(self.file_path)
+            for ii in range(0, 250, 25):
+                buffer.append(np.arange(ii, ii + 25).repeat(2).reshape(-1, 2))
+            self.assertEqual(buffer.valid_range, (150, 250))
+            np.testing.assert_array_equal(buffer.read()[:, 0], np.arange(150, 250))
+            np.testing.assert_array_equal(buffer.read(start=240, stop=245)[:, 1],
+                                          np.arange(240, 245))
+            np.testing.assert_array_equal(buffer.read_last(3)[:, 0], [247, 248, 249])
+            self.assertEqual(os.path.getsize(self.file_path), size)
+        # Write cursor persists
+        with DiskRingBuffer(self.file_path) as buffer:
+            self.assertEqual(buffer.valid_range, (150, 250))
+            self.assertEqual(len(buffer), 100)
+
+    def test_concurrent_reader(self):
+        writer = DiskRingBuffer.create(self.file_path, 997, dtype=np.int64)
+        reader = DiskRingBuffer(self.file_path)
+        stop = threading.Event()
+
+        def write():
+            index = 0
+            while not stop.is_set() and index < 2_000_000:
+                rows = np.random.randint(1, 500)
+                writer.append(np.arange(index, index + rows))
+                index += rows
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        try:
+            for _ in range(2000):
+                first, stop_index = reader.valid_range
+                data = reader.read(start=first)
+                # Rows must be consecutive absolute indices, overwritten rows are dropped
+                if data.size > 0:
+                    np.testing.assert_array_equal(np.diff(data), 1)
+                    self.assertGreaterEqual(data[0], first)
+        finally:
+            stop.set()
+            thread.join()
+        writer.close()
+        reader.close()
+
+    def test_export(self):
+        storage = NpyDataStorage(root_dir=self._tmp_dir.name, include_global_metadata=False)
+        with DiskRingBuffer.create(self.file_path, 10) as buffer:
+            buffer.append(np.arange(15.))
+            file_path, _, _ = buffer.export(storage, start=12, metadata={'rate': 1e3})
+        data, metadata, _ = NpyDataStorage.load_data(file_path)
+        np.testing.assert_array_equal(data, [12., 13., 14.])
+        self.assertEqual(metadata, {'rate': 1e3, 'ring_buffer_first_row': 12})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the status variable storage backends in qudi.core.statusstore.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+import unittest
+import tempfile
+import sqlite3
+import weakref
+import numpy as np
+from datetime import datetime
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from PySide6 import QtCore
+
+from qudi.util.datastorage import ImageFormat
+from qudi.core.module import LogicBase
+from qudi.core.statusstore import YamlStatusStore, create_status_store, get_status_store
+from qudi.core.statusstore import set_status_store
+from qudi.core.statusstore import StatusAutosaver, SqliteStatusStore, migrate_status_files
+from qudi.core.statusvariable import StatusVar, get_changed_status_variables
+from qudi.core.statusvariable import clear_changed_status_variables, mark_status_variables_changed
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+@unittest.skipIf(msgpack is None, 'msgpack not installed')
+class TestBinaryStatusStore(unittest.TestCase):
+    _module = ('TestLogic', 'logic', 'test_logic')
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch('qudi.util.paths.get_appdata_dir', return_value=self._tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = create_status_store('binary')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_roundtrip(self):
+        variables = {'array': np.random.rand(100, 3),
+                     'structured': np.zeros(3, dtype=[('a', '<f4'), ('b', '<i8')]),
+                     'tuple': (1, (2.5, 'x')),
+                     'set': {1, 2},
+                     'complex': 1 + 2j,
+                     'enum': ImageFormat.PNG,
+                     'timestamp': datetime(2021, 5, 6, 11, 11, 11),
+                     'scalar': np.float32(1.5),
+                     'big_int': 2 ** 80,
+                     'nested': {(1, 2): [None, True, b'raw']}}
+        self.store.dump(*self._module, variables)
+        self.assertEqual(os.listdir(self._tmp_dir.name),
+                         ['status-TestLogic_logic_test_logic.qstatus'])
+        loaded = self.store.load(*self._module)
+        np.testing.assert_array_equal(loaded.pop('array'), variables.pop('array'))
+        np.testing.assert_array_equal(loaded.pop('structured'), variables.pop('structured'))
+        self.assertEqual(loaded, variables)
+
+    def test_legacy_yaml(self):
+        self.assertEqual(self.store.load(*self._module), dict())
+        YamlStatusStore().dump(*self._module, {'value': 42})
+        self.assertEqual(self.store.load(*self._module), {'value': 42})
+        self.store.dump(*self._module, {'value': 43})
+        self.assertEqual(self.store.load(*self._module), {'value': 43})
+        # Newer YAML file takes precedence
+        time.sleep(0.01)
+        YamlStatusStore().dump(*self._module, {'value': 44})
+        self.assertEqual(self.store.load(*self._module), {'value': 44})
+        self.assertTrue(self.store.exists(*self._module))
+        self.store.remove(*self._module)
+        self.assertFalse(self.store.exists(*self._module))
+        self.assertEqual(os.listdir(self._tmp_dir.name), list())
+
+    def test_unsupported_type(self):
+        # Falls back to YAML which can not represent arbitrary objects either
+        with self.assertLogs('qudi.core.statusstore', level='WARNING'):
+            with self.assertRaises(Exception):
+                self.store.dump(*self._module, {'value': object()})
+        self.assertEqual(os.listdir(self._tmp_dir.name), list())
+
+
+class TestSqliteStatusStore(unittest.TestCase):
+    _module = ('TestLogic', 'logic', 'test_logic')
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        for target in ('qudi.util.paths.get_appdata_dir', 'qudi.core.statusstore.get_appdata_dir'):
+            patcher = mock.patch(target, return_value=self._tmp_dir.name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.store = SqliteStatusStore()
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp_dir.cleanup()
+
+    def test_roundtrip(self):
+        variables = {'array': np.random.rand(100, 3),
+                     'tuple': (1, (2.5, 'x')),
+                     'enum': ImageFormat.PNG,
+                     'nested': {'a': [None, True, b'raw']}}
+        self.assertFalse(self.store.exists(*self._module))
+        self.assertEqual(self.store.load(*self._module), dict())
+        self.store.dump(*self._module, variables)
+        self.store.dump('OtherLogic', 'logic', 'other', {'value': 1})
+        self.assertTrue(self.store.exists(*self._module))
+        if msgpack is not None:
+            with sqlite3.connect(self.store.db_path) as connection:
+                formats = connection.execute('SELECT DISTINCT format FROM status_variables')
+                self.assertEqual(formats.fetchall(), [('binary',)])
+        loaded = self.store.load(*self._module)
+        np.testing.assert_array_equal(loaded.pop('array'), variables.pop('array'))
+        self.assertEqual(loaded, variables)
+        # Variables no longer present are removed
+        self.store.dump(*self._module, {'value': 2})
+        with ThreadPoolExecutor() as executor:
+            futures = self.store.prefetch([self._module, ('OtherLogic', 'logic', 'other'),
+                                           ('Missing', 'gui', 'missing')], executor)
+            self.assertEqual([future.result() for future in futures],
+                             [{'value': 2}, {'value': 1}, dict()])
+        self.store.remove(*self._module)
+        self.assertEqual(list(self.store.load_all()), [('OtherLogic', 'logic', 'other')])
+
+    def test_failed_dump(self):
+        self.store.dump(*self._module, {'value': 1})
+        with self.assertRaises(Exception):
+            self.store.dump(*self._module, {'value': 2, 'invalid': object()})
+        self.assertEqual(self.store.load(*self._module), {'value': 1})
+
+    def test_replaced_store_is_closed(self):
+        previous = get_status_store()
+        set_status_store(self.store)
+        try:
+            self.assertIs(get_status_store(), self.store)
+            set_status_store(self.store)
+            self.store.load(*self._module)
+        finally:
+            set_status_store(previous)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            self.store.load(*self._module)
+
+    def test_migration(self):
+        YamlStatusStore().dump(*self._module, {'value': 1, 'array': np.arange(100)})
+        YamlStatusStore().dump('My_Gui', 'gui', 'my_gui', {'geometry': [1, 2, 3, 4]})
+        self.assertEqual(migrate_status_files(self.store, remove_files=True), 2)
+        self.assertFalse([name for name in os.listdir(self._tmp_dir.name) if
+                          not name.startswith('status_variables.sqlite')])
+        self.assertEqual(self.store.load('My_Gui', 'gui', 'my_gui'), {'geometry': [1, 2, 3, 4]})
+        np.testing.assert_array_equal(self.store.load(*self._module)['array'], np.arange(100))
+
+
+class _DummyModule:
+    value = StatusVar(default=0)
+    __private = StatusVar(name='private', default=None)
+
+    def __init__(self):
+        self.state = 'idle'
+        self.dumps = 0
+
+    def module_state(self):
+        return self.state
+
+    def _autosave_status_variables(self, timeout=None):
+        if not clear_changed_status_variables(self):
+            return False
+        self.dumps += 1
+        return True
+
+    def set_private(self, value):
+        self.__private = value
+
+
+class TestStatusAutosaver(unittest.TestCase):
+
+    def test_change_tracking(self):
+        module = _DummyModule()
+        self.assertIsInstance(module.value, StatusVar)
+        self.assertEqual(get_changed_status_variables(module), frozenset())
+        module.value = 1
+        module.set_private([1])
+        self.assertEqual(module.value, 1)
+        self.assertEqual(get_changed_status_variables(module),
+                         {'value', '_DummyModule__private'})
+        self.assertEqual(len(clear_changed_status_variables(module)), 2)
+        self.assertEqual(get_changed_status_variables(module), frozenset())
+        mark_status_variables_changed(module)
+        self.assertEqual(get_changed_status_variables(module),
+                         {'value', '_DummyModule__private'})
+        # Values are stored per instance
+        self.assertIsInstance(_DummyModule().value, StatusVar)
+
+    def test_save_changed(self):
+        modules = [_DummyModule() for _ in range(3)]
+        autosaver = StatusAutosaver(lambda: modules, interval=3600)
+        self.assertEqual(autosaver.save_changed(), 0)
+        modules[0].value = 1
+        modules[1].value = 2
+        modules[1].state = 'deactivated'
+        self.assertEqual(autosaver.save_changed(), 1)
+        self.assertEqual([mod.dumps for mod in modules], [1, 0, 0])
+        self.assertEqual(autosaver.save_changed(), 0)
+        with self.assertRaises(ValueError):
+            StatusAutosaver(lambda: modules, interval=0)
+
+    def test_background_thread(self):
+        module = _DummyModule()
+        autosaver = StatusAutosaver(lambda: [module], interval=0.01)
+        autosaver.start()
+        try:
+            self.assertTrue(autosaver.is_running)
+            module.value = 42
+            deadline = time.monotonic() + 5
+            while module.dumps == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            autosaver.stop()
+        self.assertFalse(autosaver.is_running)
+        self.assertEqual(module.dumps, 1)
+
+
+class _DummyLogic(LogicBase):
+    value = StatusVar(default=0)
+
+    def on_activate(self):
+        pass
+
+    def on_deactivate(self):
+        pass
+
+
+class _ThreadedDummyLogic(_DummyLogic):
+    array = StatusVar(default=None)
+
+    @array.representer
+    def _represent_array(self, value):
+        self.representer_threads.append(QtCore.QThread.currentThread())
+        return value
+
+
+class TestAutosaveSnapshot(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch('qudi.util.paths.get_appdata_dir', return_value=self._tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._qudi_main = mock.Mock()
+        self.module = _ThreadedDummyLogic(qudi_main_weakref=weakref.ref(self._qudi_main),
+                                          name='dummy')
+        self.module.representer_threads = list()
+        self.thread = QtCore.QThread()
+        self.module.moveToThread(self.thread)
+        self.thread.start()
+
+    def tearDown(self):
+        self.thread.quit()
+        self.thread.wait()
+        self._tmp_dir.cleanup()
+
+    def test_snapshot_in_module_thread(self):
+        autosaver = StatusAutosaver(lambda: [self.module], interval=5)
+        # Inactive modules are skipped
+        self.module.value = 1
+        self.assertEqual(autosaver.save_changed(), 0)
+        QtCore.QMetaObject.invokeMethod(self.module.module_state,
+                                        'activate',
+                                        QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+        self.module.array = np.arange(5)
+        self.assertEqual(autosaver.save_changed(), 1)
+        self.assertEqual(self.module.representer_threads, [self.thread])
+        loaded = YamlStatusStore().load('_ThreadedDummyLogic', 'logic', 'dummy')
+        np.testing.assert_array_equal(loaded['array'], np.arange(5))
+        self.assertEqual(autosaver.save_changed(), 0)
+        QtCore.QMetaObject.invokeMethod(self.module.module_state,
+                                        'deactivate',
+                                        QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+        self.assertEqual(len(self.module.representer_threads), 2)
+        self.assertEqual(self.module.representer_threads[-1], self.thread)
+
+
+class TestPrefetchedStatusVariables(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch('qudi.util.paths.get_appdata_dir', return_value=self._tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._qudi_main = mock.Mock()
+        self.module = _DummyLogic(qudi_main_weakref=weakref.ref(self._qudi_main), name='dummy')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_prefetch_used_once(self):
+        YamlStatusStore().dump('_DummyLogic', 'logic', 'dummy', {'value': 1})
+        with ThreadPoolExecutor() as executor:
+            self.module._set_prefetched_status_variables(executor.submit(dict, value=2))
+        self.module.module_state.activate()
+        self.assertEqual(self.module.value, 2)
+        self.assertEqual(get_changed_status_variables(self.module), frozenset())
+        self.module.module_state.deactivate()
+        self.assertEqual(YamlStatusStore().load('_DummyLogic', 'logic', 'dummy'), {'value': 2})
+        YamlStatusStore().dump('_DummyLogic', 'logic', 'dummy', {'value': 3})
+        self.module.module_state.activate()
+        self.assertEqual(self.module.value, 3)
+        self.module.module_state.deactivate()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi YAML load/dump utilities.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import unittest
+import tempfile
+import threading
+import numpy as np
+
+from qudi.util.yaml import yaml_load, yaml_dump, yaml_remove, yaml_clear_cache
+
+
+class TestYaml(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._tmp_dir.name, 'test.cfg')
+
+    def tearDown(self):
+        yaml_clear_cache()
+        self._tmp_dir.cleanup()
+
+    def test_repeated_dump_load(self):
+        data = {'a': 1, 'b': [1.5, 'x'], 'array': np.arange(100), 'small': np.arange(3)}
+        for _ in range(3):
+            yaml_dump(self.file_path, data)
+            self.assertEqual(len(os.listdir(self._tmp_dir.name)), 2)
+            loaded = yaml_load(self.file_path)
+            np.testing.assert_array_equal(loaded.pop('array'), data['array'])
+            np.testing.assert_array_equal(loaded.pop('small'), data['small'])
+            self.assertEqual(loaded, {'a': 1, 'b': [1.5, 'x']})
+
+    def test_extndarray_files(self):
+        # Legacy external array files are replaced
+        legacy_path = os.path.join(self._tmp_dir.name, 'test-000000.npy')
+        np.save(legacy_path, np.zeros(100))
+        data = {'a': np.random.rand(100), 'b': np.random.rand(10, 10), 'c': np.random.rand(100)}
+        yaml_dump(self.file_path, data)
+        sidecars = sorted(set(os.listdir(self._tmp_dir.name)) - {'test.cfg'})
+        self.assertEqual(len(sidecars), 3)
+        self.assertNotIn('test-000000.npy', sidecars)
+        # Unchanged arrays are not written again, changed ones are replaced
+        mtimes = {name: os.stat(os.path.join(self._tmp_dir.name, name)).st_mtime_ns for name in
+                  sidecars}
+        data['c'] = data['c'] + 1
+        yaml_dump(self.file_path, data)
+        new_sidecars = sorted(set(os.listdir(self._tmp_dir.name)) - {'test.cfg'})
+        self.assertEqual(len(set(sidecars) & set(new_sidecars)), 2)
+        for name in set(sidecars) & set(new_sidecars):
+            self.assertEqual(os.stat(os.path.join(self._tmp_dir.name, name)).st_mtime_ns,
+                             mtimes[name])
+        # Memory-mapped copy-on-write loading
+        loaded = yaml_load(self.file_path, mmap_arrays=True)
+        self.assertIsInstance(loaded['a'], np.memmap)
+        loaded['a'][:] = 0
+        for key, array in yaml_load(self.file_path).items():
+            self.assertNotIsInstance(array, np.memmap)
+            np.testing.assert_array_equal(array, data[key])
+        del loaded
+        yaml_remove(self.file_path)
+        self.assertEqual(os.listdir(self._tmp_dir.name), list())
+
+    def test_mmap_round_trip(self):
+        data = {'a': np.random.rand(100), 'b': np.random.rand(10, 10), 'small': np.arange(3)}
+        yaml_dump(self.file_path, data)
+        sidecars = sorted(set(os.listdir(self._tmp_dir.name)) - {'test.cfg'})
+        mtimes = {name: os.stat(os.path.join(self._tmp_dir.name, name)).st_mtime_ns for name in
+                  sidecars}
+        # Dump memory-mapped arrays straight back, one of them modified (copy-on-write)
+        loaded = yaml_load(self.file_path, mmap_arrays=True)
+        self.assertIsInstance(loaded['a'], np.memmap)
+        loaded['b'][0, 0] = -1
+        data['b'][0, 0] = -1
+        yaml_dump(self.file_path, loaded)
+        del loaded
+        # Unchanged mapped array reuses its existing external file
+        new_sidecars = sorted(set(os.listdir(self._tmp_dir.name)) - {'test.cfg'})
+        self.assertEqual(len(new_sidecars), 2)
+        unchanged = set(sidecars) & set(new_sidecars)
+        self.assertEqual(len(unchanged), 1)
+        for name in unchanged:
+            self.assertEqual(os.stat(os.path.join(self._tmp_dir.name, name)).st_mtime_ns,
+                             mtimes[name])
+        for key, array in yaml_load(self.file_path).items():
+            np.testing.assert_array_equal(array, data[key])
+
+    def test_threads(self):
+        errors = list()
+
+        def worker(index):
+            try:
+                file_path = os.path.join(self._tmp_dir.name, f'thread_{index:d}.cfg')
+                for value in range(20):
+                    yaml_dump(file_path, {'value': value, 'index': index})
+                    assert yaml_load(file_path) == {'value': value, 'index': index}
+            except Exception as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, list())
+
+    def test_load_cache(self):
+        yaml_dump(self.file_path, {'a': [1, 2]})
+        first = yaml_load(self.file_path, use_cache=True)
+        first['a'].append(3)
+        second = yaml_load(self.file_path, use_cache=True)
+        self.assertEqual(second, {'a': [1, 2]})
+        self.assertIsNot(second['a'], yaml_load(self.file_path, use_cache=True)['a'])
+        # Changes of the file invalidate the cached data
+        yaml_dump(self.file_path, {'a': [1, 2, 3, 4]})
+        self.assertEqual(yaml_load(self.file_path, use_cache=True), {'a': [1, 2, 3, 4]})
+        with open(self.file_path, 'w') as file:
+            file.write('a: [5, 6, 7, 8]\n')
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        self.assertEqual(yaml_load(self.file_path, use_cache=True), {'a': [5, 6, 7, 8]})
+        self.assertEqual(yaml_load(os.path.join(self._tmp_dir.name, 'missing.cfg'),
+                                   ignore_missing=True,
+                                   use_cache=True),
+                         dict())
+
+
+if __name__ == '__main__':
+    unittest.main()